@@ -0,0 +1,179 @@
+import inspect
+import os
+import threading
+import time
+from backend.mcp_client import list_tools
+
+BEHAVIOR_FILE = "backend/context_store/behavior.txt"
+# Seconds before the MCP tool list is fetched again.
+TOOLS_TTL = 600
+
+def create_function_declaration(func):
+    """
+    Create a FunctionDeclaration from a Python function with proper parameter extraction.
+    """
+    from google.genai.types import FunctionDeclaration
+
+    sig = inspect.signature(func)
+    parameters = {}
+    required = []
+
+    for name, param in sig.parameters.items():
+        param_info = {"type": "string"}
+
+        if param.annotation != param.empty:
+            if param.annotation == str:
+                param_info["type"] = "string"
+            elif param.annotation == int:
+                param_info["type"] = "integer"
+            elif param.annotation == float:
+                param_info["type"] = "number"
+            elif param.annotation == bool:
+                param_info["type"] = "boolean"
+            elif param.annotation == dict:
+                param_info["type"] = "object"
+
+        parameters[name] = param_info
+
+        if param.default == param.empty:
+            required.append(name)
+
+    return FunctionDeclaration(
+        name=func.__name__,
+        description=func.__doc__ or f"Function {func.__name__}",
+        parameters={
+            "type": "object",
+            "properties": parameters,
+            "required": required
+        }
+    )
+
+class AgentConfig:
+    """
+    Process-wide cache of what every agent is configured with: the MCP tool
+    declarations, local function declarations, the `Tool` objects combining
+    them and prompt files.
+
+    Files are re-read only when their mtime or size changes. The MCP tool
+    list is shared by every session and fetched again after `tools_ttl`
+    seconds; `Tool` objects are rebuilt only if the list actually changed.
+    """
+    def __init__(self, fetch_tools=list_tools, tools_ttl: float = TOOLS_TTL, clock=time.monotonic):
+        """
+        Args:
+            fetch_tools: Callable (session_id) -> list of tool declarations, defaults to `list_tools`.
+            tools_ttl (float): Seconds before the tool list is fetched again.
+            clock: Monotonic clock, overridable for tests and benchmarks.
+        """
+        self.fetch_tools = fetch_tools
+        self.tools_ttl = tools_ttl
+        self.clock = clock
+        self._files: dict = {}
+        self._declarations: dict = {}
+        self._tool_objects: dict = {}
+        self._tools = None
+        self._tools_lock = threading.Lock()
+        self.file_reads = 0
+        self.tool_fetches = 0
+        self.tools_version = 0
+
+    def read_text(self, path: str) -> str:
+        """
+        Return the contents of a text file, re-reading it only when it changed on disk.
+        """
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._files.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        with open(path, "r") as fin:
+            text = fin.read()
+        self._files[path] = (version, text)
+        self.file_reads += 1
+        return text
+
+    def behavior(self) -> str:
+        return self.read_text(BEHAVIOR_FILE)
+
+    def _load_tools(self, session_id: str) -> tuple:
+        cached = self._tools
+        if cached is not None and cached[0] > self.clock():
+            return cached
+        with self._tools_lock:
+            cached = self._tools
+            if cached is not None and cached[0] > self.clock():
+                return cached
+            declarations = self.fetch_tools(session_id)
+            self.tool_fetches += 1
+            if isinstance(declarations, str):
+                # An error string; keep serving the previous list if there is one.
+                if cached is None:
+                    raise RuntimeError(declarations)
+                return cached
+            if cached is None or cached[1] != declarations:
+                self.tools_version += 1
+                self._tool_objects.clear()
+            else:
+                declarations = cached[1]
+            self._tools = (self.clock() + self.tools_ttl, declarations)
+            return self._tools
+
+    def mcp_tools(self, session_id: str) -> list:
+        """
+        Return the MCP tool declarations, as returned by `list_tools`.
+        Args:
+            session_id (str): The session ID to list tools with if the cached list is stale.
+        """
+        return self._load_tools(session_id)[1]
+
+    @staticmethod
+    def _function_key(func) -> tuple:
+        # Bound methods share the declaration of their function.
+        return (getattr(func, "__func__", func), inspect.ismethod(func))
+
+    def function_declaration(self, func):
+        """
+        Memoized `create_function_declaration`.
+        """
+        key = self._function_key(func)
+        declaration = self._declarations.get(key)
+        if declaration is None:
+            declaration = self._declarations[key] = create_function_declaration(func)
+        return declaration
+
+    def tool(self, session_id: str, functions: list | tuple = ()):
+        """
+        Return a `Tool` holding every MCP tool declaration followed by the
+        declarations of local `functions`. Agents with the same local
+        functions share one object.
+        """
+        declarations = self._load_tools(session_id)[1]
+        key = tuple(self._function_key(func) for func in functions)
+        tool = self._tool_objects.get(key)
+        if tool is None:
+            from google.genai.types import Tool
+
+            tool = self._tool_objects[key] = Tool(
+                function_declarations=declarations + [self.function_declaration(func) for func in functions]
+            )
+        return tool
+
+    def invalidate(self):
+        """
+        Forget everything, e.g. after the MCP server was redeployed.
+        """
+        with self._tools_lock:
+            self._tools = None
+            self._tool_objects.clear()
+        self._files.clear()
+        self._declarations.clear()
+
+    def stats(self) -> dict:
+        return {
+            "file_reads": self.file_reads,
+            "tool_fetches": self.tool_fetches,
+            "tools_version": self.tools_version,
+            "declarations": len(self._declarations),
+        }
+
+agent_config = AgentConfig()
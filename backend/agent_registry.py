@@ -0,0 +1,192 @@
+import threading
+import time
+from collections import OrderedDict
+
+class _Entry:
+    __slots__ = ("agent", "last_used")
+
+    def __init__(self, agent, last_used: float):
+        self.agent = agent
+        self.last_used = last_used
+
+class AgentRegistry:
+    """
+    Process-wide map of MCP session id -> agent.
+
+    Holds at most `capacity` agents. The least recently used agent is evicted
+    when the registry is full, and agents idle for longer than `idle_timeout`
+    seconds are evicted on the next access. An agent whose `lock` is held is
+    mid-turn and is never evicted this way; the next candidate is taken
+    instead, and the registry may briefly exceed `capacity`. Evicted agents
+    are flushed through `agent.update_fs()` so their chat state is persisted,
+    then `on_evict` is called with their session id to release per-session
+    resources.
+    """
+    def __init__(self, factory, capacity: int = 256, idle_timeout: float = 1800, clock=time.monotonic, on_evict=None):
+        """
+        Args:
+            factory: Callable creating an agent from a session id.
+            capacity (int): Maximum number of live agents.
+            idle_timeout (float): Seconds after which an unused agent is evicted.
+            clock: Monotonic clock, overridable for tests and benchmarks.
+            on_evict: Optional callable run with the session id of every evicted agent.
+        """
+        self.factory = factory
+        self.capacity = capacity
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+        self.on_evict = on_evict
+        self._entries: OrderedDict = OrderedDict()
+        self._creating: dict = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._entries
+
+    def get(self, session_id: str):
+        """
+        Return the live agent for `session_id`, or None.
+        """
+        with self._lock:
+            evicted = self._collect_idle()
+            entry = self._touch(session_id)
+        self._flush(evicted)
+        return entry.agent if entry else None
+
+    def get_or_create(self, session_id: str):
+        """
+        Return the agent for `session_id`, creating it on first use.
+        Concurrent first requests for the same session create a single agent.
+        """
+        with self._lock:
+            evicted = self._collect_idle()
+            entry = self._touch(session_id)
+            if entry is None:
+                create_lock = self._creating.setdefault(session_id, threading.Lock())
+        self._flush(evicted)
+        if entry is not None:
+            return entry.agent
+
+        with create_lock:
+            with self._lock:
+                entry = self._touch(session_id)
+            if entry is not None:
+                return entry.agent
+
+            try:
+                agent = self.factory(session_id)
+            except Exception:
+                with self._lock:
+                    self._creating.pop(session_id, None)
+                raise
+
+            with self._lock:
+                self._entries[session_id] = _Entry(agent, self.clock())
+                self._creating.pop(session_id, None)
+                self.created += 1
+                evicted = self._collect_overflow(session_id)
+        self._flush(evicted)
+        return agent
+
+    def evict(self, session_id: str) -> bool:
+        """
+        Remove and flush one session's agent, unless it is mid-turn.
+        Returns:
+            bool: Whether the agent was evicted.
+        """
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None or self._busy(entry.agent):
+                return False
+            del self._entries[session_id]
+            self.evicted += 1
+        self._flush([(session_id, entry.agent)])
+        return True
+
+    def clear(self):
+        """
+        Remove and flush every agent, e.g. on shutdown.
+        """
+        with self._lock:
+            agents = [(session_id, entry.agent) for session_id, entry in self._entries.items()]
+            self._entries.clear()
+            self.evicted += len(agents)
+        self._flush(agents)
+
+    def sweep(self) -> int:
+        """
+        Evict every agent idle for longer than `idle_timeout`.
+        Returns:
+            int: The number of agents evicted.
+        """
+        with self._lock:
+            evicted = self._collect_idle()
+        self._flush(evicted)
+        return len(evicted)
+
+    def stats(self) -> dict:
+        return {
+            "live": len(self._entries),
+            "capacity": self.capacity,
+            "created": self.created,
+            "evicted": self.evicted,
+        }
+
+    def _touch(self, session_id: str):
+        entry = self._entries.get(session_id)
+        if entry is not None:
+            entry.last_used = self.clock()
+            self._entries.move_to_end(session_id)
+        return entry
+
+    @staticmethod
+    def _busy(agent) -> bool:
+        lock = getattr(agent, "lock", None)
+        return lock is not None and lock.locked()
+
+    def _collect_overflow(self, keep: str) -> list:
+        # Least recently used first, skipping busy agents and the one just created.
+        overflow = len(self._entries) - self.capacity
+        candidates = []
+        for session_id, entry in self._entries.items():
+            if len(candidates) >= overflow:
+                break
+            if session_id != keep and not self._busy(entry.agent):
+                candidates.append(session_id)
+        evicted = [(session_id, self._entries.pop(session_id).agent) for session_id in candidates]
+        self.evicted += len(evicted)
+        return evicted
+
+    def _collect_idle(self) -> list:
+        # Entries are kept in last-used order, so idle ones sit at the front.
+        deadline = self.clock() - self.idle_timeout
+        candidates = []
+        for session_id, entry in self._entries.items():
+            if entry.last_used > deadline:
+                break
+            if not self._busy(entry.agent):
+                candidates.append(session_id)
+        evicted = [(session_id, self._entries.pop(session_id).agent) for session_id in candidates]
+        self.evicted += len(evicted)
+        return evicted
+
+    def _flush(self, agents: list):
+        for session_id, agent in agents:
+            try:
+                agent.update_fs()
+            except Exception as e:
+                print(f"Error flushing session {session_id}: {e}")
+            if self.on_evict is not None:
+                with self._lock:
+                    # A new agent for the session, created during the flush, keeps its resources.
+                    if session_id in self._entries or session_id in self._creating:
+                        continue
+                try:
+                    self.on_evict(session_id)
+                except Exception as e:
+                    print(f"Error releasing session {session_id}: {e}")
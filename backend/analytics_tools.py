@@ -0,0 +1,249 @@
+import json
+import re
+from datetime import date
+import pandas as pd
+from backend.financial_data import BankTransactions
+from backend.mf_portfolio import MfPortfolio, navs_from_net_worth
+from backend.mcp_client import call_tool_response
+from backend.mcp_responses import LoginRequired, ToolError, parse_response
+from backend.tool_reducers import reduce_net_worth
+
+EMI_PATTERN = r"\bEMI\b|LOAN"
+SALARY_PATTERN = r"SALARY"
+PERIOD_PATTERN = re.compile(r"^last_(\d+)_months$")
+
+# Payloads that are turned into richer structures than their decoded JSON.
+PARSERS = {
+    "fetch_bank_transactions": BankTransactions.from_payload,
+    "fetch_mf_transactions": MfPortfolio.from_payload,
+}
+
+class ToolDataError(Exception):
+    pass
+
+def _month_start(day: pd.Timestamp) -> pd.Timestamp:
+    return day.normalize().replace(day=1)
+
+def resolve_period(period: str, latest: pd.Timestamp) -> tuple:
+    """
+    Turn a period name into an inclusive (start, end) date range. Relative
+    periods count back from `latest`, the most recent transaction, because
+    statements lag behind today's date.
+    Args:
+        period (str): "this_month", "last_month", "last_<n>_months", "YYYY-MM" or "all".
+        latest (pd.Timestamp): The most recent transaction date.
+    """
+    period = (period or "all").strip().lower()
+    if period == "all":
+        return None, None
+    if period == "this_month":
+        return _month_start(latest), latest
+    if period == "last_month":
+        start = _month_start(latest) - pd.DateOffset(months=1)
+        return start, _month_start(latest) - pd.Timedelta(days=1)
+    match = PERIOD_PATTERN.match(period)
+    if match:
+        return _month_start(latest) - pd.DateOffset(months=int(match.group(1)) - 1), latest
+    start = pd.Timestamp(period + "-01")
+    return start, start + pd.DateOffset(months=1) - pd.Timedelta(days=1)
+
+class AnalyticsTools:
+    """
+    Deterministic analytics over one session's MCP data, offered to Gemini as
+    local tools so it can ask for small precomputed answers instead of
+    pulling whole tool payloads into the chat.
+
+    Decoded payloads come from `call_tool_response`, so they are shared with `tool_cache`.
+    Each payload is parsed once per distinct result, and each analytics call
+    is memoized until one of its source payloads changes.
+    """
+    TOOL_NAMES = ("spend_by_category", "top_merchants", "emi_burden", "credit_utilization", "net_worth_breakdown", "mf_portfolio")
+    # MCP tools each analytics tool is computed from.
+    SOURCES = {
+        "spend_by_category": ("fetch_bank_transactions",),
+        "top_merchants": ("fetch_bank_transactions",),
+        "emi_burden": ("fetch_bank_transactions",),
+        "credit_utilization": ("fetch_credit_report",),
+        "net_worth_breakdown": ("fetch_net_worth",),
+        "mf_portfolio": ("fetch_mf_transactions", "fetch_net_worth"),
+    }
+
+    def __init__(self, session_id: str, fetch=call_tool_response):
+        """
+        Args:
+            session_id (str): The session ID for the MCP server.
+            fetch: Callable (tool_name, session_id) -> ToolResult or raw text, defaults to `call_tool_response`.
+        """
+        self.session_id = session_id
+        self.fetch = fetch
+        self._parsed: dict = {}
+        self._results: dict = {}
+        self._version = 0
+
+    def declarations(self) -> list:
+        """
+        The tool functions, for `create_function_declaration`.
+        """
+        return [getattr(self, name) for name in self.TOOL_NAMES]
+
+    def call(self, tool_name: str, args: dict | None = None) -> str:
+        """
+        Run a tool by name and return its result as compact JSON.
+        """
+        if tool_name not in self.TOOL_NAMES:
+            raise ValueError(f"Unknown analytics tool {tool_name}")
+        return json.dumps(getattr(self, tool_name)(**dict(args or {})), separators=(",", ":"))
+
+    def _load(self, tool_name: str):
+        """
+        Return the parsed payload of an MCP tool, reparsing only when its result changed.
+        """
+        response = self.fetch(tool_name, self.session_id)
+        if isinstance(response, str):
+            response = parse_response(tool_name, response)
+        if isinstance(response, (ToolError, LoginRequired)) or not isinstance(response.data, dict):
+            raise ToolDataError(response.text)
+        cached = self._parsed.get(tool_name)
+        if cached is None or cached[0] != response.text:
+            self._version += 1
+            parse = PARSERS.get(tool_name)
+            cached = (response.text, parse(response.data) if parse else response.data, self._version)
+            self._parsed[tool_name] = cached
+        return cached[1]
+
+    def bank(self) -> BankTransactions:
+        return self._load("fetch_bank_transactions")
+
+    def _memoized(self, key: tuple, sources: tuple, compute) -> dict:
+        try:
+            for name in sources:
+                self._load(name)
+            versions = tuple(self._parsed[name][2] for name in sources)
+            cached = self._results.get(key)
+            if cached is not None and cached[0] == versions:
+                return cached[1]
+            result = compute()
+        except ToolDataError as e:
+            return {"error": str(e)}
+        except (KeyError, TypeError, ValueError) as e:
+            return {"error": f"Could not compute {key[0]}: {e}"}
+        self._results[key] = (versions, result)
+        return result
+
+    def spend_by_category(self, period: str = "last_month") -> dict:
+        """
+        Total spend per category (Essentials, Upskill/Education, Impulse, Savings,
+        Lifestyle & Leisure, Debt Repayment, Other) from the user's bank transactions.
+        period is one of "this_month", "last_month", "last_<n>_months" (e.g. "last_3_months"),
+        "YYYY-MM" or "all". Relative periods count back from the latest transaction.
+        """
+        def compute():
+            bank = self.bank()
+            if not len(bank):
+                return {"period": period, "total": 0, "categories": {}}
+            start, end = resolve_period(period, bank.frame.index.max())
+            categories = bank.spend_by_category(start, end)
+            return {
+                "period": period,
+                "from": None if start is None else str(start.date()),
+                "to": None if end is None else str(end.date()),
+                "total": round(float(categories.sum()), 2),
+                "categories": {name: round(float(value), 2) for name, value in categories.items() if value},
+            }
+        return self._memoized(("spend_by_category", period), self.SOURCES["spend_by_category"], compute)
+
+    def top_merchants(self, n: int = 5) -> dict:
+        """
+        The n merchants or payees the user spent the most with, from their bank transactions.
+        """
+        def compute():
+            merchants = self.bank().spend_by_merchant(int(n))
+            return {"merchants": [{"name": name, "spend": round(float(value), 2)} for name, value in merchants.items()]}
+        return self._memoized(("top_merchants", int(n)), self.SOURCES["top_merchants"], compute)
+
+    def emi_burden(self) -> dict:
+        """
+        Average monthly loan EMIs against average monthly salary income, from the
+        user's bank transactions. emi_to_income is the share of income going to EMIs.
+        """
+        def compute():
+            bank = self.bank()
+            months = max(1, len(bank.spend_by_month()))
+            emis = bank.matching(EMI_PATTERN)
+            income = bank.matching(SALARY_PATTERN).frame
+            income = income[income["type"] == 1]["amount"].sum()
+            monthly_emi = emis.total_spend() / months
+            monthly_income = float(income) / months
+            return {
+                "months": months,
+                "monthly_emi": round(monthly_emi, 2),
+                "monthly_income": round(monthly_income, 2),
+                "emi_to_income": round(monthly_emi / monthly_income, 4) if monthly_income else None,
+                "loans": {name: round(float(value) / months, 2) for name, value in emis.spend_by_merchant().items()},
+            }
+        return self._memoized(("emi_burden",), self.SOURCES["emi_burden"], compute)
+
+    def credit_utilization(self) -> dict:
+        """
+        Credit card balances against credit limits, per card and overall, from the
+        user's credit report.
+        """
+        def compute():
+            report = self._load("fetch_credit_report")
+            cards = []
+            for credit_report in report.get("creditReports", []):
+                details = credit_report.get("creditReportData", {}).get("creditAccount", {}).get("creditAccountDetails", [])
+                for account in details:
+                    limit = float(account.get("creditLimitAmount") or 0)
+                    if account.get("portfolioType") != "R" or not limit:
+                        continue
+                    balance = float(account.get("currentBalance") or 0)
+                    cards.append({
+                        "lender": account.get("subscriberName"),
+                        "balance": balance,
+                        "limit": limit,
+                        "utilization": round(balance / limit, 4),
+                    })
+            balance = sum(card["balance"] for card in cards)
+            limit = sum(card["limit"] for card in cards)
+            return {
+                "balance": balance,
+                "limit": limit,
+                "utilization": round(balance / limit, 4) if limit else None,
+                "cards": cards,
+            }
+        return self._memoized(("credit_utilization",), self.SOURCES["credit_utilization"], compute)
+
+    def net_worth_breakdown(self) -> dict:
+        """
+        The user's net worth with each asset and liability amount and its share
+        of total assets.
+        """
+        def compute():
+            net_worth = reduce_net_worth(self._load("fetch_net_worth"))
+            assets = net_worth.get("assets", {})
+            total_assets = sum(assets.values())
+            return {
+                "net_worth": net_worth["net_worth"],
+                "total_assets": total_assets,
+                "assets": {
+                    name: {"amount": value, "share": round(value / total_assets, 4) if total_assets else None}
+                    for name, value in sorted(assets.items(), key=lambda item: -item[1])
+                },
+                "liabilities": net_worth.get("liabilities", {}),
+            }
+        return self._memoized(("net_worth_breakdown",), self.SOURCES["net_worth_breakdown"], compute)
+
+    def mf_portfolio(self, as_of: str = "") -> dict:
+        """
+        The user's mutual fund holdings from their MF transactions: per scheme and in total,
+        units held, amount invested and redeemed, current value, absolute return and XIRR
+        (annualized, in percent). Current values use the NAVs in the user's net worth.
+        as_of is the valuation date as "YYYY-MM-DD"; empty means today.
+        """
+        def compute():
+            portfolio = self._load("fetch_mf_transactions")
+            navs = navs_from_net_worth(self._load("fetch_net_worth"))
+            return portfolio.summary(navs, as_of or None)
+        # The default valuation date moves with the calendar.
+        return self._memoized(("mf_portfolio", as_of or str(date.today())), self.SOURCES["mf_portfolio"], compute)
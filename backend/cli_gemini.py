@@ -1,16 +1,20 @@
-import json
 import os
 from backend.gemini_client import agent
-from pathlib import Path
+from backend.history_store import local_history_store
+from backend.log_config import configure_logging
 
-history_file = Path("backend/context_store/chat_history.json")
+history_store = local_history_store()
 
 def main():
+    configure_logging()
     session_id = os.getenv("MCP_SESSION_ID")
     if not session_id:
         session_id = input("🔐 Enter your MCP session ID (first time login): ").strip()
 
     gemini_agent = agent(session_id)
+    # The chat starts from the agent's windowed Firestore history; only the
+    # turns after it are new to the local mirror.
+    mirrored = len(gemini_agent.chat.get_history())
 
     print("\n💬 Welcome to your Financial Assistant\n")
     print("Type a question like:")
@@ -34,10 +38,7 @@ def main():
     
     gemini_agent.update_fs()
     history = gemini_agent.chat.get_history()
-    json_history = [item.to_json_dict() for item in history]
-    
-    with open(history_file, "w") as f:
-        json.dump(json_history, f, indent=2)
+    history_store.append([item.to_json_dict() for item in history[mirrored:]])
         
 if __name__ == "__main__":
     main()  
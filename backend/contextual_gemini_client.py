@@ -1,17 +1,20 @@
 from backend.context_store.context_manager import contextTools
-from backend.mcp_client import list_tools, call_tool
-from google import genai
-from google.genai.types import Tool, FunctionDeclaration
+from backend.tool_cache import tool_cache
+from backend.tool_reducers import tool_reducer
+from backend.response_cache import response_cache
+from backend.history_store import local_history_store
+from backend.history_manager import HistoryManager
+from backend.agent_config import agent_config
+from backend.genai_client import get_client
+from backend.mcp_client import call_tool, call_tool_response, call_tools_parallel
+from backend.mcp_responses import LoginRequired, ToolError
 from pathlib import Path
-import inspect
 import json
+import logging
 import os
+import time
 
-with open("gemini_api.txt", "r") as fin:
-    api_key = fin.read().strip()
-    
-client = genai.Client(api_key=api_key)
-agent_behavior = open("backend/context_store/behavior.txt", "r").read()
+logger = logging.getLogger(__name__)
 
 CONTEXT_DIR = Path("backend/context_store/memory")
     
@@ -62,6 +65,32 @@ def save_context(user_id: str, ctx: dict):
         
     return "Context updated."
 
+def load_summary(user_id: str) -> dict | None:
+    """
+    Load the rolling summary of the user's local chat history.
+    Args:
+        user_id (str): The user ID for which to load the summary.
+    Returns:
+        dict | None: The stored summary, or None if there is none yet.
+    """
+    path = os.path.join(CONTEXT_DIR, user_id, 'summary.json')
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
+
+def save_summary(user_id: str, summary: dict):
+    """
+    Save the rolling summary next to the user's context.
+    Args:
+        user_id (str): The user ID for which to save the summary.
+        summary (dict): The summary, as kept by HistoryManager.
+    """
+    path = os.path.join(CONTEXT_DIR, user_id, 'summary.json')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(summary, f, indent=2)
+
 def update_context(user_id: str, updates: dict):
     """
     Update the context with new data.
@@ -81,98 +110,81 @@ def update_context(user_id: str, updates: dict):
     
     return ctx
 
-history_file = Path("backend/context_store/chat_history.json")
-if history_file.exists():
-    with open(history_file, "r") as f:
-        chat_history = json.load(f)
-else:
-    chat_history = []
-    
-def create_function_declaration(func):
-    """
-    Create a FunctionDeclaration from a Python function with proper parameter extraction.
-    """
-    sig = inspect.signature(func)
-    parameters = {}
-    required = []
-    
-    for name, param in sig.parameters.items():
-        param_info = {"type": "string"}
-        
-        if param.annotation != param.empty:
-            if param.annotation == str:
-                param_info["type"] = "string"
-            elif param.annotation == int:
-                param_info["type"] = "integer"
-            elif param.annotation == float:
-                param_info["type"] = "number"
-            elif param.annotation == bool:
-                param_info["type"] = "boolean"
-            elif param.annotation == dict:
-                param_info["type"] = "object"
-        
-        parameters[name] = param_info
-        
-        if param.default == param.empty:
-            required.append(name)
-    
-    return FunctionDeclaration(
-        name=func.__name__,
-        description=func.__doc__ or f"Function {func.__name__}",
-        parameters={
-            "type": "object",
-            "properties": parameters,
-            "required": required
-        }
-    )
 
 class agent:
     def __init__(self, session_id: str):
         self.session_id = session_id
-        dummy_call = call_tool("whoami", self.session_id)
-        res_dict: dict = eval(dummy_call)
-        if res_dict.get("status") == "login_required":
-            login_url = res_dict["login_url"]
+        # A (re-)login may point the session at different data; drop its cached tool results.
+        tool_cache.invalidate(self.session_id)
+        whoami = call_tool_response("whoami", self.session_id)
+        if isinstance(whoami, ToolError):
+            raise RuntimeError(whoami.text)
+        if isinstance(whoami, LoginRequired):
+            login_url = whoami.login_url
             print("Please open the following login URL in your browser:")
             print(login_url)
 
             input("Press Enter after you've completed the login...")
         else:
-            self.user_id = res_dict.get("phoneNumber")
+            self.user_id = whoami.phone_number
         
-        mcp_tools = list_tools(session_id)
-        auto_callable_tools = [
-            create_function_declaration(send_notification),
-            create_function_declaration(update_context)
-        ]
-        all_tools = [Tool(function_declarations=mcp_tools + auto_callable_tools)]
+        # The history and its summary are kept per user next to the local
+        # context, so only turns that left the window since the last agent
+        # are folded into the summary.
+        user_id = getattr(self, "user_id", None)
+        summary = load_summary(user_id) if user_id else None
+        self.history = HistoryManager(local_history_store(user_id), summary)
+        history = self.history.build()
+        if user_id and self.history.summary != summary:
+            save_summary(user_id, self.history.summary)
+
+        # Loaded with the first agent: pandas and the Gemini SDK dominate import time.
+        from backend.analytics_tools import AnalyticsTools
+        from google.genai import types
+
+        mcp_tools = agent_config.mcp_tools(session_id)
+        self.analytics = AnalyticsTools(session_id)
+        auto_callable_tools = [send_notification, update_context] + self.analytics.declarations()
+        all_tools = [agent_config.tool(session_id, auto_callable_tools)]
         
-        self.chat = client.chats.create(
+        self.chat = get_client().chats.create(
             model="gemini-2.0-flash",
-            config=genai.types.GenerateContentConfig(
+            config=types.GenerateContentConfig(
                 temperature=0,
                 tools=all_tools,
                 system_instruction=[
-                    agent_behavior,
+                    agent_config.behavior(),
                     """
                     IMPORTANT TOOL USAGE INSTRUCTIONS:
                     - For MCP tools (from external services), only return the function call without executing
                     - For local tools (send_notification, update_context), execute them directly
+                    - Prefer the analytics tools (spend_by_category, top_merchants, emi_burden, credit_utilization, net_worth_breakdown, mf_portfolio) over raw MCP tools when they answer the question
                     - MCP tools will be handled by the backend system
                     - Update the context without user prompt in a proper format (json) whenever you feel necessary
-                    """
+                    """,
+                    "Summary of the earlier conversation with the user:\n" + (self.history.summary_text or "(none)"),
                 ],
             ),
-            history=chat_history,
+            history=history,
         )
         
         self.mcp_tool_names = {tool["name"] for tool in mcp_tools}
 
     def call_gemini(self, prompt: str) -> str:
         user_id = self.user_id
+        cached = response_cache.get(user_id, self.session_id, prompt, refresh=call_tools_parallel)
+        if cached is not None:
+            from google.genai import types
+            self.chat.record_history(types.UserContent(prompt), [types.ModelContent(cached)], True)
+            logger.info("turn served from response cache")
+            return cached
+
+        turn_start = time.perf_counter()
         response = self.chat.send_message(prompt)
+        llm_done = time.perf_counter()
 
         messages = response.candidates[0].content.parts
+        tool_calls = []
         tool_outputs = []
         text_parts = []
 
@@ -186,27 +198,35 @@ class agent:
                     continue
 
                 print(f"Calling tool: {tool_name} with args: {tool_args}")
-
-                if tool_name in self.mcp_tool_names:
-                    result = call_tool(tool_name, self.session_id)
-                    tool_outputs.append((tool_name, result))
-                else:
-                    try:
-                        if tool_name == "send_notification":
-                            result = send_notification(tool_args.get("message", ""))
-                            tool_outputs.append((tool_name, result or "Notification sent"))
-                        elif tool_name == "update_context":
-                            result = update_context(self.user_id, tool_args.get("updates", {}))
-                            tool_outputs.append((tool_name, result or "Context updated"))
-                        else:
-                            print(f"Warning: Unknown local tool {tool_name}")
-                    except Exception as e:
-                        print(f"Error executing {tool_name}: {e}")
-                        tool_outputs.append((tool_name, f"Error: {str(e)}"))
+                tool_calls.append((tool_name, tool_args))
             
             elif hasattr(part, "text") and part.text:
                 text_parts.append(part.text)
 
+        # MCP tools run concurrently; local tools run inline. Results keep call order.
+        mcp_names = [name for name, _ in tool_calls if name in self.mcp_tool_names]
+        mcp_results = iter(call_tools_parallel(mcp_names, self.session_id))
+
+        for tool_name, tool_args in tool_calls:
+            if tool_name in self.mcp_tool_names:
+                tool_outputs.append((tool_name, next(mcp_results)))
+            else:
+                try:
+                    if tool_name == "send_notification":
+                        result = send_notification(tool_args.get("message", ""))
+                        tool_outputs.append((tool_name, result or "Notification sent"))
+                    elif tool_name == "update_context":
+                        result = update_context(self.user_id, tool_args.get("updates", {}))
+                        tool_outputs.append((tool_name, result or "Context updated"))
+                    elif tool_name in self.analytics.TOOL_NAMES:
+                        tool_outputs.append((tool_name, self.analytics.call(tool_name, tool_args)))
+                    else:
+                        print(f"Warning: Unknown local tool {tool_name}")
+                except Exception as e:
+                    print(f"Error executing {tool_name}: {e}")
+                    tool_outputs.append((tool_name, f"Error: {str(e)}"))
+        tools_done = time.perf_counter()
+
         combined_text = "".join(text_parts)
 
         if tool_outputs:
@@ -215,15 +235,35 @@ class agent:
                 followup_parts.append(combined_text)
             
             tool_results = "\n\n".join(
-                f"Result of `{name}`:\n{output}" for name, output in tool_outputs
+                f"Result of `{name}`:\n{tool_reducer.reduce(name, output)}" for name, output in tool_outputs
             )
             followup_parts.append(tool_results)
             
             followup = "\n\n".join(followup_parts)
             final_response = self.chat.send_message(followup)
-            return final_response.text
-                
-        return combined_text if combined_text else "No response generated."
+            reply = final_response.text
+            # Only answers computed purely from MCP data are cached; local
+            # tools with side effects (notifications, context) are not replayed.
+            sources = []
+            for name, _ in tool_calls:
+                if name in self.mcp_tool_names:
+                    sources.append(name)
+                elif name in self.analytics.TOOL_NAMES:
+                    sources.extend(self.analytics.SOURCES[name])
+                else:
+                    sources = []
+                    break
+            response_cache.put(user_id, self.session_id, prompt, sources, reply)
+        else:
+            reply = combined_text if combined_text else "No response generated."
+
+        turn_done = time.perf_counter()
+        logger.info(
+            "turn timings: llm=%.3fs tools=%.3fs (%d calls) followup=%.3fs total=%.3fs",
+            llm_done - turn_start, tools_done - llm_done, len(tool_calls),
+            turn_done - tools_done, turn_done - turn_start,
+        )
+        return reply
 
     def call_gemini_for_dashboard(self, dashboard: str) -> str:
         response = self.chat.send_message(f"Generate data to fetch {dashboard} information and display it in a format that can be used in a streamlit dashboard.")
@@ -0,0 +1,216 @@
+import threading
+from collections import OrderedDict
+from datetime import date
+from backend.mcp_client import call_tools_parallel
+from backend.tool_cache import result_digest, tool_cache
+
+# MCP tools the dashboard is computed from.
+SOURCES = ("fetch_net_worth", "fetch_bank_transactions", "fetch_credit_report", "fetch_mf_transactions")
+# Months of spend history shown in the trend chart.
+MONTHS = 6
+# Bank narrations of credit card bill payments.
+CARD_PAYMENT_PATTERN = r"CREDIT CARD|\bCRED\b|CREDCC|CARD PAYMENT"
+# (category, share of the latest month's spend above which it defines the behavior, label)
+BEHAVIOR_RULES = (
+    ("Impulse", 0.3, "Impulse Buyer"),
+    ("Lifestyle & Leisure", 0.35, "Lifestyle Spender"),
+    ("Debt Repayment", 0.4, "Debt Focused"),
+    ("Savings", 0.3, "Saver"),
+)
+TOP_INVESTMENTS = 3
+
+def classify_behavior(spends: dict) -> str:
+    """
+    One-word summary of a month's spend per category.
+    """
+    total = sum(spends.values())
+    if not total:
+        return "No Spends"
+    for category, share, label in BEHAVIOR_RULES:
+        if spends.get(category, 0) / total > share:
+            return label
+    return "Balanced"
+
+def _rounded(values) -> list:
+    return [round(float(value), 2) for value in values]
+
+class Dashboard:
+    """
+    Dashboard data for one session, computed from its MCP tool results
+    without a model call, and kept until one of them changes.
+
+    Every section is built from the parsed payloads in AnalyticsTools, so
+    each payload is decoded and parsed once per data version. A section whose
+    source failed carries an "error" and the others are still returned.
+    """
+    def __init__(self, session_id: str, responses: dict, as_of: date | None = None):
+        """
+        Args:
+            session_id (str): The session ID for the MCP server.
+            responses (dict): Tool name -> ToolResult for every tool in SOURCES.
+            as_of (date | None): The day investments are valued on, defaults to today.
+        """
+        # Loaded with the first dashboard: pandas dominates import time.
+        from backend.analytics_tools import AnalyticsTools, ToolDataError
+
+        self.responses = responses
+        self.as_of = as_of or date.today()
+        self.analytics = AnalyticsTools(session_id, fetch=lambda tool_name, _: self.responses[tool_name])
+        # What a section that cannot be computed raises.
+        self.errors = (ToolDataError, KeyError, TypeError, ValueError)
+
+    def build(self) -> dict:
+        spends = self.spends()
+        latest = spends.get("latest", {}).get("categories", {})
+        return {
+            "net_worth": self.net_worth(),
+            "spends": spends,
+            "behavior": classify_behavior(latest),
+            "credit": self.credit(),
+            "investments": self.investments(),
+        }
+
+    def net_worth(self) -> dict:
+        breakdown = self.analytics.net_worth_breakdown()
+        if "error" in breakdown:
+            return breakdown
+        return {
+            "total": breakdown["net_worth"],
+            "assets": {name: asset["amount"] for name, asset in breakdown["assets"].items()},
+            "liabilities": breakdown["liabilities"],
+        }
+
+    def spends(self) -> dict:
+        """
+        Spend per category for the last MONTHS months, as one row per month,
+        and the latest month's spend per category.
+        """
+        try:
+            table = self.analytics.bank().spend_by_month_and_category().tail(MONTHS)
+        except self.errors as e:
+            return {"error": str(e)}
+        from backend.narration_classifier import CATEGORIES
+
+        categories = list(CATEGORIES)
+        if not len(table):
+            return {"months": [], "categories": categories, "values": [], "latest": {"month": None, "categories": {}}}
+        table = table[categories]
+        return {
+            "months": [str(month) for month in table.index],
+            "categories": categories,
+            "values": [_rounded(row) for row in table.to_numpy()],
+            "latest": {
+                "month": str(table.index[-1]),
+                "categories": dict(zip(categories, _rounded(table.iloc[-1]))),
+            },
+        }
+
+    def credit(self) -> dict:
+        """
+        Card bills paid per month from the bank statement, and balances
+        against limits from the credit report.
+        """
+        credit = {}
+        try:
+            payments = self.analytics.bank().matching(CARD_PAYMENT_PATTERN).spend_by_month().tail(MONTHS)
+            credit["months"] = [str(month) for month in payments.index]
+            credit["payments"] = _rounded(payments)
+        except self.errors as e:
+            credit["error"] = str(e)
+        utilization = self.analytics.credit_utilization()
+        if "error" in utilization:
+            credit.setdefault("error", utilization["error"])
+        else:
+            credit.update(utilization)
+        return credit
+
+    def investments(self) -> dict:
+        """
+        The mutual funds with the best and worst XIRR, valued on `as_of` with current NAVs.
+        """
+        portfolio = self.analytics.mf_portfolio(as_of=self.as_of.isoformat())
+        if "error" in portfolio:
+            return portfolio
+        # Only a scheme bought on `as_of` itself has no XIRR yet.
+        ranked = sorted(
+            (scheme for scheme in portfolio["schemes"] if scheme["xirr_pct"] is not None),
+            key=lambda scheme: scheme["xirr_pct"],
+            reverse=True,
+        )
+        rows = [[scheme["scheme"], scheme["xirr_pct"]] for scheme in ranked]
+        return {
+            "best": rows[:TOP_INVESTMENTS],
+            "worst": rows[::-1][:TOP_INVESTMENTS],
+            "total": portfolio["total"],
+        }
+
+class DashboardCache:
+    """
+    The latest dashboard of each session, keyed on the data versions of its
+    SOURCES and the date, so it is rebuilt only when a tool result changed or
+    investments must be revalued on a new day. Tool results
+    themselves come through `fetch_many`, i.e. from `tool_cache` while fresh.
+    """
+    def __init__(self, fetch_many=call_tools_parallel, tool_results=tool_cache, max_sessions: int = 256):
+        """
+        Args:
+            fetch_many: Callable (names, session_id) -> list of ToolResult, defaults to `call_tools_parallel`.
+            tool_results (ToolResultCache): Where the data versions of fresh results are looked up.
+            max_sessions (int): Number of sessions whose dashboard is kept.
+        """
+        self.fetch_many = fetch_many
+        self.tool_results = tool_results
+        self.max_sessions = max_sessions
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _version(self, session_id: str, tool_name: str, response) -> str:
+        version = self.tool_results.version(session_id, tool_name) if self.tool_results is not None else None
+        return version or result_digest(response.text)
+
+    def get(self, session_id: str) -> dict:
+        """
+        Return the dashboard of a session, rebuilding it only if its data changed.
+        Args:
+            session_id (str): The session ID for the MCP server.
+        """
+        responses = dict(zip(SOURCES, self.fetch_many(list(SOURCES), session_id)))
+        # Investments are valued today, so a new day is a new version too.
+        today = date.today()
+        versions = tuple(self._version(session_id, name, responses[name]) for name in SOURCES) + (today.isoformat(),)
+        with self._lock:
+            cached = self._entries.get(session_id)
+            if cached is not None and cached[0] == versions:
+                self._entries.move_to_end(session_id)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+
+        dashboard = {"version": result_digest("|".join(versions)), **Dashboard(session_id, responses, as_of=today).build()}
+        with self._lock:
+            self._entries[session_id] = (versions, dashboard)
+            self._entries.move_to_end(session_id)
+            while len(self._entries) > self.max_sessions:
+                self._entries.popitem(last=False)
+        return dashboard
+
+    def invalidate(self, session_id: str | None = None) -> int:
+        with self._lock:
+            if session_id is None:
+                count = len(self._entries)
+                self._entries.clear()
+                return count
+            return int(self._entries.pop(session_id, None) is not None)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "sessions": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+dashboards = DashboardCache()
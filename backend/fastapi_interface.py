@@ -1,16 +1,47 @@
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from backend import uncontextual_gemini_client as gemini_client
+from backend.agent_config import agent_config
+from backend.agent_registry import AgentRegistry
+from backend.dashboard import dashboards
+from backend.log_config import configure_logging
+from backend.mcp_client import async_sessions
+from backend.response_cache import response_cache
+from backend.tool_cache import tool_cache
+from backend.tool_reducers import tool_reducer
 
-app = FastAPI()
+# uvicorn configures only its own loggers.
+configure_logging()
+
+agents = AgentRegistry(
+    gemini_client.agent,
+    capacity=int(os.getenv("FIFI_MAX_SESSIONS", "256")),
+    idle_timeout=float(os.getenv("FIFI_SESSION_IDLE_TIMEOUT", "1800")),
+    # Agents are evicted only between turns, so no tool call of theirs is
+    # still using the session's MCP connection when it is discarded.
+    on_evict=async_sessions.discard,
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Persist every live chat before the worker exits.
+    await asyncio.to_thread(agents.clear)
+    await async_sessions.close()
+
+app = FastAPI(lifespan=lifespan)
 
 class UserRequest(BaseModel):
     session_id: str
 class UserMessage(BaseModel):
+    session_id: str
     msg: str
 
-clients = {}
-
 # @app.post("/update_session_id/")
 # def update_session_id(request: UserRequest):
 #     try:
@@ -26,22 +57,72 @@ clients = {}
 #         raise HTTPException(status_code=500, detail=str(e))
     
 @app.post("/init_gemini/")
-def init_gemini(request: UserRequest):
+async def init_gemini(request: UserRequest):
     try:
-        if "gemini_client" not in clients:
-            client = gemini_client.agent(session_id=request.session_id)
-            clients["gemini_client"] = client
-        agent = clients["gemini_client"]
+        # Agent creation does blocking MCP and Firestore I/O, keep it off the event loop.
+        agent: gemini_client.agent = await asyncio.to_thread(agents.get_or_create, request.session_id)
         # You can't return the client object directly; instead, confirm creation or perform an action
         return agent.login_status
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/send_message/")
-def send_message(request: UserMessage):
+async def send_message(request: UserMessage):
     try:
-        agent: gemini_client.agent = clients["gemini_client"]
-        reply = agent.call_gemini(request.msg)
+        agent: gemini_client.agent = await asyncio.to_thread(agents.get_or_create, request.session_id)
+        async with agent.lock:
+            reply = await agent.call_gemini(request.msg)
         return {"text": reply}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/send_message_stream/")
+async def send_message_stream(request: UserMessage):
+    """
+    Server-sent events version of /send_message/. Emits `tool` events while
+    MCP tools run, `token` events as Gemini streams text, then `done`.
+    """
+    try:
+        agent: gemini_client.agent = await asyncio.to_thread(agents.get_or_create, request.session_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def events():
+        try:
+            async with agent.lock:
+                async for event in agent.stream_gemini(request.msg):
+                    event_type = event.pop("type")
+                    yield f"event: {event_type}\ndata: {json.dumps(event)}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/dashboard/{session_id}")
+async def dashboard(session_id: str):
+    """
+    Net worth, monthly spends by category, credit usage and best/worst
+    investments, computed from the session's MCP data without Gemini.
+    """
+    try:
+        return await asyncio.to_thread(dashboards.get, session_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/cache_stats/")
+async def cache_stats():
+    """
+    Hit rates of the answer, tool result and dashboard caches, bytes saved by
+    the tool reducers, and how often agent configuration was actually rebuilt.
+    """
+    return {
+        "responses": response_cache.stats(),
+        "tools": tool_cache.stats(),
+        "reducers": tool_reducer.stats(),
+        "agent_config": agent_config.stats(),
+        "dashboards": dashboards.stats(),
+    }
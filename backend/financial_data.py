@@ -0,0 +1,299 @@
+import re
+import numpy as np
+import pandas as pd
+from backend.mcp_responses import ToolResult, loads
+from backend.narration_classifier import classifier
+
+BANK_TXN_TYPES = {1: "CREDIT", 2: "DEBIT", 3: "OPENING", 4: "INTEREST", 5: "TDS", 6: "INSTALLMENT", 7: "CLOSING", 8: "OTHERS"}
+# Money leaving the account: card/UPI/transfer debits and EMIs/SIPs.
+SPEND_TYPES = (2, 6)
+MF_ORDER_TYPES = {1: "BUY", 2: "SELL"}
+STOCK_TXN_TYPES = {1: "BUY", 2: "SELL", 3: "BONUS", 4: "SPLIT"}
+
+# Merchant/counterparty in the common narration layouts, e.g.
+# "UPI-ZOMATO-ZOMATO@YBL-FOOD ORDER", "ACH D-HDFCMF-SIP/FLEXICAP/WG-45001",
+# "NEFT DR-IDIB000S176-PRATEEK PATNAIK-...", "SALARY CREDIT - BIGTECH CORP - JULY 2024".
+MERCHANT_PATTERN = re.compile(
+    r"^(?:UPI(?: RET)?|ACH [DC]|IMPS|NEFT(?: [DC]R)?|RTGS(?: [DC]R)?|BILLPAY|SALARY CREDIT|PAYMENT TO|"
+    r"LOAN DISBURSAL|AUTO DEBIT)\s*-?\s*"
+    # IFSC codes and reference numbers are not names.
+    r"(?:(?:[A-Z]{4}0[A-Z0-9]{6}|\d{6,})\s*-\s*)?(?P<merchant>[^-@]+)"
+    r"|^(?P<atm>CASH WDL|NWD|ATM)\b"
+    r"|^(?:\d{6,}\s*-\s*)?(?P<other>[^-@]+)"
+)
+MASKED_SUFFIX = re.compile(r"\s+(?:A/C\s*)?X+\d*$")
+
+def _load(payload) -> dict:
+    if isinstance(payload, ToolResult):
+        return payload.data
+    return loads(payload) if isinstance(payload, (str, bytes)) else payload
+
+def extract_merchant(narration: str) -> str:
+    """
+    Best-effort merchant or counterparty name of a bank narration.
+    """
+    match = MERCHANT_PATTERN.match(narration.strip().upper())
+    if match is None:
+        return "UNKNOWN"
+    if match.group("atm"):
+        return "ATM"
+    merchant = (match.group("merchant") or match.group("other") or "").strip()
+    return MASKED_SUFFIX.sub("", merchant) or "UNKNOWN"
+
+def _columns(rows: list, width: int) -> list:
+    # One list per column; much cheaper than zip(*rows) for large payloads.
+    return [[row[i] for row in rows] for i in range(width)]
+
+def _float_column(values: list) -> np.ndarray:
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+
+def _date_index(values: list) -> pd.DatetimeIndex:
+    return pd.DatetimeIndex(np.asarray(values, dtype="datetime64[D]").astype("datetime64[ns]"), name="date")
+
+def _categorical_sums(codes: np.ndarray, categories, amounts: np.ndarray) -> pd.Series:
+    sums = np.bincount(codes, weights=amounts, minlength=len(categories))
+    series = pd.Series(sums, index=categories)
+    return series[series != 0].sort_values(ascending=False)
+
+class BankTransactions:
+    """
+    Columnar view of `fetch_bank_transactions`.
+
+    One row per transaction, indexed by date, with columns `amount` and
+    `balance` (float64), `type` (int8 code, see BANK_TXN_TYPES), and
+    `narration`, `merchant`, `mode` and `bank` as categoricals. Narrations
+    are interned: each distinct narration is stored once and everything
+    derived from it (merchant names, pattern matches) is computed once per
+    distinct value, not once per row.
+    """
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+        self._pattern_hits: dict = {}
+        self._categories = None
+        # Raw column arrays for the hot paths; pandas indexing costs more than the sums themselves.
+        self._dates = frame.index.to_numpy()
+        self._amounts = frame["amount"].to_numpy()
+        self._types = frame["type"].to_numpy()
+        self._codes = frame["narration"].cat.codes.to_numpy()
+
+    @classmethod
+    def from_payload(cls, payload) -> "BankTransactions":
+        """
+        Args:
+            payload (str | dict | ToolResult): The `fetch_bank_transactions` result.
+        """
+        payload = _load(payload)
+        banks, rows = [], []
+        for account in payload.get("bankTransactions", []):
+            txns = account.get("txns", [])
+            rows += txns
+            banks += [account.get("bank", "unknown")] * len(txns)
+        return cls.from_rows(rows, banks)
+
+    @classmethod
+    def from_rows(cls, rows: list, banks: list | None = None) -> "BankTransactions":
+        """
+        Build from `[amount, narration, date, type, mode, balance]` rows.
+        """
+        columns = _columns(rows, 6)
+        narration = pd.Categorical(columns[1])
+        # Merchants are extracted once per distinct narration and mapped to rows by code.
+        names = np.array([extract_merchant(value) for value in narration.categories], dtype=object)
+        merchants, merchant_of_narration = np.unique(names, return_inverse=True)
+        merchant = pd.Categorical.from_codes(
+            merchant_of_narration.astype(np.int32)[narration.codes], categories=pd.Index(merchants, dtype=object)
+        )
+        frame = pd.DataFrame(
+            {
+                "amount": _float_column(columns[0]),
+                "narration": narration,
+                "merchant": merchant,
+                "type": np.asarray(columns[3], dtype=np.int8),
+                "mode": pd.Categorical(columns[4]),
+                "balance": _float_column(columns[5]),
+                "bank": pd.Categorical(banks if banks is not None else ["unknown"] * len(rows)),
+            },
+            index=_date_index(columns[2]),
+        )
+        return cls(frame.sort_index(kind="stable"))
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def narrations(self) -> pd.Index:
+        """
+        The interned narration dictionary.
+        """
+        return self.frame["narration"].cat.categories
+
+    @property
+    def merchants(self) -> pd.Index:
+        return self.frame["merchant"].cat.categories
+
+    def between(self, start=None, end=None) -> "BankTransactions":
+        """
+        Transactions dated in [start, end], both inclusive; either may be None.
+        """
+        return BankTransactions(self.frame.loc[start:end])
+
+    def matching(self, pattern: str) -> "BankTransactions":
+        """
+        Transactions whose narration matches a case-insensitive regex. The regex
+        runs over the narration dictionary only.
+        """
+        return BankTransactions(self.frame[self._narration_hits(pattern)[self._codes]])
+
+    def _narration_hits(self, pattern: str) -> np.ndarray:
+        hits = self._pattern_hits.get(pattern)
+        if hits is None:
+            categories = self.narrations
+            hits = np.asarray(categories.str.contains(pattern, case=False, regex=True), dtype=bool) if len(categories) else np.zeros(0, dtype=bool)
+            self._pattern_hits[pattern] = hits
+        return hits
+
+    def _range(self, start=None, end=None) -> tuple:
+        # Row slice of the transactions dated in [start, end]; rows are sorted by date.
+        lo = 0 if start is None else np.searchsorted(self._dates, np.datetime64(start).astype(self._dates.dtype), side="left")
+        hi = len(self._dates) if end is None else np.searchsorted(self._dates, np.datetime64(end).astype(self._dates.dtype), side="right")
+        return lo, hi
+
+    def spend(self, start=None, end=None, pattern: str | None = None, narration_mask: np.ndarray | None = None) -> float:
+        """
+        Total spend dated in [start, end], optionally only narrations matching
+        `pattern` and/or selected by `narration_mask`, a boolean array over the
+        narration dictionary. Works on the raw column arrays, without building
+        intermediate frames.
+        """
+        lo, hi = self._range(start, end)
+        types = self._types[lo:hi]
+        mask = (types == SPEND_TYPES[0]) | (types == SPEND_TYPES[1])
+        if pattern is not None:
+            mask &= self._narration_hits(pattern)[self._codes[lo:hi]]
+        if narration_mask is not None:
+            mask &= narration_mask[self._codes[lo:hi]]
+        return float(self._amounts[lo:hi][mask].sum())
+
+    @property
+    def _spend_mask(self) -> np.ndarray:
+        return (self._types == SPEND_TYPES[0]) | (self._types == SPEND_TYPES[1])
+
+    def spends(self) -> pd.DataFrame:
+        return self.frame[self._spend_mask]
+
+    def total_spend(self) -> float:
+        return float(self._amounts[self._spend_mask].sum())
+
+    def _spend_by_codes(self, column: str) -> pd.Series:
+        mask = self._spend_mask
+        values = self.frame[column].cat
+        return _categorical_sums(values.codes.to_numpy()[mask], values.categories, self._amounts[mask])
+
+    def spend_by_month(self) -> pd.Series:
+        mask = self._spend_mask
+        labels, codes = np.unique(self._dates[mask].astype("datetime64[M]"), return_inverse=True)
+        sums = np.bincount(codes, weights=self._amounts[mask], minlength=len(labels))
+        return pd.Series(sums, index=pd.PeriodIndex(labels, freq="M", name="month"))
+
+    def spend_by_type(self) -> pd.Series:
+        mask = self._spend_mask
+        sums = np.bincount(self._types[mask], weights=self._amounts[mask], minlength=max(BANK_TXN_TYPES) + 1)
+        series = pd.Series(sums[1:], index=[BANK_TXN_TYPES[code] for code in range(1, len(sums))])
+        return series[series != 0]
+
+    def spend_by_category(self, start=None, end=None) -> pd.Series:
+        """
+        Spend dated in [start, end] per narration category (see backend.narration_classifier).
+        """
+        lo, hi = self._range(start, end)
+        types = self._types[lo:hi]
+        mask = (types == SPEND_TYPES[0]) | (types == SPEND_TYPES[1])
+        codes = self._category_codes()[self._codes[lo:hi][mask]]
+        sums = np.bincount(codes, weights=self._amounts[lo:hi][mask], minlength=len(classifier.labels))
+        return pd.Series(sums, index=list(classifier.labels))
+
+    def spend_by_month_and_category(self, start=None, end=None) -> pd.DataFrame:
+        """
+        Spend dated in [start, end] per month (rows) and narration category
+        (columns), summed in a single pass.
+        """
+        lo, hi = self._range(start, end)
+        types = self._types[lo:hi]
+        mask = (types == SPEND_TYPES[0]) | (types == SPEND_TYPES[1])
+        months, month_codes = np.unique(self._dates[lo:hi][mask].astype("datetime64[M]"), return_inverse=True)
+        width = len(classifier.labels)
+        cells = month_codes * width + self._category_codes()[self._codes[lo:hi][mask]]
+        sums = np.bincount(cells, weights=self._amounts[lo:hi][mask], minlength=len(months) * width)
+        return pd.DataFrame(
+            sums.reshape(len(months), width),
+            index=pd.PeriodIndex(months, freq="M", name="month"),
+            columns=list(classifier.labels),
+        )
+
+    def _category_codes(self) -> np.ndarray:
+        if self._categories is None:
+            # Classified once per distinct narration.
+            self._categories = classifier.classify_codes(self.narrations)
+        return self._categories
+
+    def spend_by_mode(self) -> pd.Series:
+        return self._spend_by_codes("mode")
+
+    def spend_by_merchant(self, n: int | None = None) -> pd.Series:
+        series = self._spend_by_codes("merchant")
+        return series if n is None else series.head(n)
+
+def parse_mf_transactions(payload) -> pd.DataFrame:
+    """
+    Columnar `fetch_mf_transactions`: one row per order, indexed by date, with
+    `isin`, `scheme` and `folio` categoricals, `order` (int8, see MF_ORDER_TYPES)
+    and float64 `price`, `units` and `amount`.
+    """
+    payload = _load(payload)
+    meta, rows = [], []
+    for scheme in payload.get("mfTransactions", []):
+        txns = scheme.get("txns", [])
+        rows += txns
+        meta += [(scheme.get("isin"), scheme.get("schemeName"), scheme.get("folioId"))] * len(txns)
+    columns = _columns(rows, 5)
+    isin, scheme, folio = _columns(meta, 3)
+    frame = pd.DataFrame(
+        {
+            "isin": pd.Categorical(isin),
+            "scheme": pd.Categorical(scheme),
+            "folio": pd.Categorical(folio),
+            "order": np.asarray(columns[0], dtype=np.int8),
+            "price": _float_column(columns[2]),
+            "units": _float_column(columns[3]),
+            "amount": _float_column(columns[4]),
+        },
+        index=_date_index(columns[1]),
+    )
+    return frame.sort_index(kind="stable")
+
+def parse_stock_transactions(payload) -> pd.DataFrame:
+    """
+    Columnar `fetch_stock_transactions`: one row per transaction, indexed by
+    date, with an `isin` categorical, `type` (int8, see STOCK_TXN_TYPES),
+    `quantity` and `nav` (float64, NaN where the NAV is not reported).
+    """
+    payload = _load(payload)
+    isins, rows = [], []
+    for stock in payload.get("stockTransactions", []):
+        txns = stock.get("txns", [])
+        rows += [list(txn) + [None] * (4 - len(txn)) for txn in txns]
+        isins += [stock.get("isin")] * len(txns)
+    columns = _columns(rows, 4)
+    frame = pd.DataFrame(
+        {
+            "isin": pd.Categorical(isins),
+            "type": np.asarray(columns[0], dtype=np.int8),
+            "quantity": _float_column(columns[2]),
+            "nav": _float_column(columns[3]),
+        },
+        index=_date_index(columns[1]),
+    )
+    return frame.sort_index(kind="stable")
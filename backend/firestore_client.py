@@ -1,39 +1,107 @@
-import firebase_admin
-from firebase_admin import credentials, firestore
+import threading
+from backend.history_store import FirestoreHistoryStore
 
 # Path to your downloaded service account key JSON
 # cred = credentials.Certificate("agentic-ai-day-465019-firebase-adminsdk-fbsvc-0c99c403de.json")
 
+DATABASE_ID = "fifi-users-info"
+
+_db = None
+_db_lock = threading.Lock()
+
+def get_db():
+    """
+    Return the process-wide Firestore client, initializing the Firebase app on first use.
+    Every `Client` shares this client and its gRPC channel.
+    """
+    global _db
+    if _db is None:
+        with _db_lock:
+            if _db is None:
+                import firebase_admin
+                from firebase_admin import firestore
+
+                try:
+                    app = firebase_admin.get_app()
+                except ValueError:
+                    app = firebase_admin.initialize_app()
+                _db = firestore.client(app=app, database_id=DATABASE_ID)
+    return _db
+
+def set_db(db):
+    """
+    Replace the process-wide Firestore client, e.g. with an in-memory stand-in.
+    """
+    global _db
+    with _db_lock:
+        _db = db
+
 class Client:
-    def __init__(self, user_id: int):
-        firebase_admin.initialize_app()
-        self.db = firestore.client(database_id="fifi-users-info")
+    """
+    Lightweight per-user handle on the shared Firestore client.
+    """
+    __slots__ = ("db", "user_id", "history", "_doc")
+
+    def __init__(self, user_id: int, db=None):
+        """
+        Args:
+            user_id (int): The user whose `users/<id>` document this client reads and writes.
+            db: Optional Firestore client, defaults to the shared `get_db()` client.
+        """
+        self.db = db if db is not None else get_db()
         self.user_id = str(user_id)
+        self.history = FirestoreHistoryStore(self)
+        self._doc = None
 
-    def store_session_id(self, session_id):
-        doc_ref = self.db.collection("users").document(self.user_id)
-        doc_ref.set({"session_id": session_id})    
+    @property
+    def doc_ref(self):
+        return self.db.collection("users").document(self.user_id)
 
-    def store_chat_history(self, history: list):
-        doc_ref = self.db.collection("users").document(self.user_id)
-        doc_ref.set({"chat_history": history}, merge=True)
+    def load(self, refresh: bool = False) -> dict:
+        """
+        Fetch the user document once and serve every field from the loaded copy.
+        Args:
+            refresh (bool): Re-read the document even if it is already loaded.
+        Returns:
+            dict: The document fields, empty if the document does not exist.
+        """
+        if self._doc is None or refresh:
+            doc = self.doc_ref.get()
+            self._doc = doc.to_dict() if doc.exists else {}
+        return self._doc
+
+    def _remember(self, fields: dict):
+        if self._doc is not None:
+            self._doc.update(fields)
+
+    def _forget(self, *fields: str):
+        if self._doc is not None:
+            for field in fields:
+                self._doc.pop(field, None)
+
+    def store_session_id(self, session_id):
+        self.doc_ref.set({"session_id": session_id})
+        self._doc = {"session_id": session_id}
 
     def store_chat_context(self, context: dict):
-        doc_ref = self.db.collection("users").document(self.user_id)
-        doc_ref.set({"chat_context": context}, merge=True)
-    
+        self.doc_ref.set({"chat_context": context}, merge=True)
+        self._remember({"chat_context": context})
+
+    def store_chat_state(self, new_turns: list, context: dict, summary: dict | None = None):
+        """
+        Append the turns after the history watermark and write the context in one round trip.
+        Args:
+            new_turns (list): Turns not yet persisted, as `Content.to_json_dict()` dicts.
+            context (dict): The user's chat context.
+            summary (dict | None): The rolling summary of older turns, stored next to the context.
+        """
+        fields = {"chat_context": context}
+        if summary is not None:
+            fields["chat_summary"] = summary
+        self.history.append(new_turns, fields=fields)
+
     def get_chat_history(self):
-        doc_ref = self.db.collection("users").document(self.user_id)
-        doc = doc_ref.get()
-        if doc.exists:
-            return doc.to_dict().get("chat_history", [])
-        else:
-            return []
-            
+        return self.history.load()
+
     def get_chat_context(self):
-        doc_ref = self.db.collection("users").document(self.user_id)
-        doc = doc_ref.get()
-        if doc.exists:
-            return doc.to_dict().get("chat_context", {})
-        else:
-            return {}
+        return self.load().get("chat_context", {})
@@ -0,0 +1,162 @@
+import copy
+import threading
+
+class _DeleteField:
+    """
+    Counterpart of `firestore.DELETE_FIELD`: a merged field set to it is removed.
+    """
+    def __deepcopy__(self, memo):
+        return self
+
+class MemorySnapshot:
+    def __init__(self, doc_id: str, data: dict | None):
+        self.id = doc_id
+        self._data = data
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self):
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+class MemoryDocumentRef:
+    def __init__(self, db, path: tuple):
+        self._db = db
+        self.path = path
+        self.id = path[-1]
+
+    def get(self, transaction=None) -> MemorySnapshot:
+        self._db.round_trips += 1
+        self._db.reads += 1
+        return MemorySnapshot(self.id, self._db._docs.get(self.path))
+
+    def set(self, data: dict, merge: bool = False):
+        self._db.round_trips += 1
+        self._db._write(self.path, data, merge)
+
+    def collection(self, name: str):
+        return MemoryCollectionRef(self._db, self.path + (name,))
+
+class MemoryQuery:
+    def __init__(self, collection, field: str | None = None, start: dict | None = None, count: int | None = None):
+        self._collection = collection
+        self._field = field
+        self._start = start
+        self._count = count
+
+    def order_by(self, field: str):
+        return MemoryQuery(self._collection, field, self._start, self._count)
+
+    def start_at(self, values: dict):
+        return MemoryQuery(self._collection, self._field, values, self._count)
+
+    def limit(self, count: int):
+        return MemoryQuery(self._collection, self._field, self._start, count)
+
+    def stream(self):
+        db = self._collection._db
+        db.round_trips += 1
+        depth = len(self._collection.path) + 1
+        docs = [
+            (path[-1], data) for path, data in db._docs.items()
+            if len(path) == depth and path[:-1] == self._collection.path
+        ]
+        if self._field:
+            docs = [doc for doc in docs if self._field in doc[1]]
+            docs.sort(key=lambda doc: doc[1][self._field])
+            if self._start is not None:
+                docs = [doc for doc in docs if doc[1][self._field] >= self._start[self._field]]
+        else:
+            docs.sort(key=lambda doc: doc[0])
+        if self._count is not None:
+            docs = docs[:self._count]
+        db.reads += len(docs)
+        for doc_id, data in docs:
+            yield MemorySnapshot(doc_id, data)
+
+class MemoryCollectionRef:
+    def __init__(self, db, path: tuple):
+        self._db = db
+        self.path = path
+
+    def document(self, doc_id: str) -> MemoryDocumentRef:
+        return MemoryDocumentRef(self._db, self.path + (str(doc_id),))
+
+    def order_by(self, field: str) -> MemoryQuery:
+        return MemoryQuery(self).order_by(field)
+
+    def limit(self, count: int) -> MemoryQuery:
+        return MemoryQuery(self).limit(count)
+
+    def stream(self):
+        return MemoryQuery(self).stream()
+
+class MemoryWriteBatch:
+    def __init__(self, db):
+        self._db = db
+        self._writes = []
+
+    def set(self, ref: MemoryDocumentRef, data: dict, merge: bool = False):
+        self._writes.append((ref.path, data, merge))
+
+    def commit(self):
+        self._db.round_trips += 1
+        for path, data, merge in self._writes:
+            self._db._write(path, data, merge)
+        self._writes = []
+
+class MemoryTransaction(MemoryWriteBatch):
+    """
+    Writes are buffered like a batch and committed when the transactional
+    function returns.
+    """
+
+class MemoryFirestore:
+    """
+    In-memory stand-in for a `firestore.client()`, covering the subset of the
+    API the backend uses. Counts document reads, writes and round trips so
+    tests and benchmarks can check how often the backend talks to Firestore.
+    """
+    DELETE_FIELD = _DeleteField()
+
+    def __init__(self):
+        self._docs: dict = {}
+        self._lock = threading.RLock()
+        self.reads = 0
+        self.writes = 0
+        self.round_trips = 0
+
+    def collection(self, name: str) -> MemoryCollectionRef:
+        return MemoryCollectionRef(self, (name,))
+
+    def batch(self) -> MemoryWriteBatch:
+        return MemoryWriteBatch(self)
+
+    def transaction(self) -> MemoryTransaction:
+        return MemoryTransaction(self)
+
+    def transactional(self, fn):
+        """
+        Counterpart of `firestore.transactional`. Transactions run one at a
+        time, so they never conflict and are never retried.
+        """
+        def run(transaction: MemoryTransaction, *args, **kwargs):
+            with self._lock:
+                result = fn(transaction, *args, **kwargs)
+                transaction.commit()
+            return result
+        return run
+
+    def _write(self, path: tuple, data: dict, merge: bool):
+        self.writes += 1
+        data = copy.deepcopy(data)
+        deleted = [key for key, value in data.items() if value is self.DELETE_FIELD]
+        for key in deleted:
+            del data[key]
+        if merge and path in self._docs:
+            self._docs[path].update(data)
+            for key in deleted:
+                self._docs[path].pop(key, None)
+        else:
+            self._docs[path] = data
@@ -1,65 +1,64 @@
-from backend.mcp_client import list_tools, call_tool
-from google.generativeai.types import content_types
-from pathlib import Path
+from backend.tool_cache import tool_cache
+from backend.tool_reducers import tool_reducer
+from backend.agent_config import agent_config
+from backend.genai_client import get_client
+from backend.mcp_client import call_tool, call_tool_response, call_tools_parallel
+from backend.mcp_responses import LoginRequired, ToolError
 import json
-import os
-from google import genai
-from google.genai.types import Tool
+import logging
+import time
 from backend import firestore_client
+from backend.history_manager import HistoryManager
 
-with open("gemini_api.txt", "r") as fin:
-    api_key = fin.read().strip()
-    
-# genai.configure(api_key=os.environ["GOOGLE_API_KEY"])
-client = genai.Client(api_key=api_key)
-
-# history_file = Path("backend/context_store/chat_history.json")
-# if history_file.exists():
-#     with open(history_file, "r") as f:
-#         chat_history = json.load(f)
-# else:
-#     chat_history = []
-    
-agent_behavior = open("backend/context_store/behavior.txt", "r").read()
+logger = logging.getLogger(__name__)
 
 class agent:
     def __init__(self, session_id: str):
         self.session_id = session_id
-        dummy_call = call_tool("whoami", self.session_id)
-        res_dict: dict = eval(dummy_call)
+        # A (re-)login may point the session at different data; drop its cached tool results.
+        tool_cache.invalidate(self.session_id)
+        whoami = call_tool_response("whoami", self.session_id)
+        if isinstance(whoami, ToolError):
+            raise RuntimeError(whoami.text)
         self.phone_number = 1414141414
-        if res_dict.get("status") == "login_required":
-            login_url = res_dict["login_url"]
+        if isinstance(whoami, LoginRequired):
+            login_url = whoami.login_url
             print("Please open the following login URL in your browser:")
             print(login_url)
 
             input("Press Enter after you've completed the login...")
         else:
-            self.phone_number = res_dict.get("phoneNumber")
+            self.phone_number = whoami.phone_number
             print(self.phone_number)
         self.fs_client = firestore_client.Client(self.phone_number)
-        self.chat = client.chats.create(
+        self.history = HistoryManager(self.fs_client.history, self.fs_client.load().get("chat_summary"))
+        history = self.history.build()
+        # The Gemini SDK is loaded with the first agent, not at import.
+        from google.genai import types
+        self.chat = get_client().chats.create(
                     model="gemini-2.0-flash",
-                    config=genai.types.GenerateContentConfig(
+                    config=types.GenerateContentConfig(
                     temperature=0,
-                    tools=[Tool(function_declarations=list_tools(session_id)),],
-                    system_instruction=self.get_updated_behavior(self.fs_client),
+                    tools=[agent_config.tool(session_id)],
+                    system_instruction=self.get_updated_behavior(self.fs_client, self.history.summary_text),
                     ),
-                    history=self.fs_client.get_chat_history(),
+                    history=history,
                 )
 
     @staticmethod
-    def get_updated_behavior(fs_client: firestore_client.Client) -> str:
-        with open("backend/context_store/behavior.txt", "r") as fin:
-            fifi_behavior =  fin.read().strip()
+    def get_updated_behavior(fs_client: firestore_client.Client, summary: str = "") -> str:
+        fifi_behavior = agent_config.behavior().strip()
         context = "This is the updated context about user: " + str(fs_client.get_chat_context())
+        if summary:
+            context += "\nSummary of the earlier conversation with the user:\n" + summary
         return fifi_behavior + "\n" + context
     def call_gemini(self, prompt: str) -> str:
-
+        turn_start = time.perf_counter()
         response = self.chat.send_message(prompt)
+        llm_done = time.perf_counter()
 
         messages = response.candidates[0].content.parts
-        tool_outputs = []
+        tool_names = []
 
         for part in messages:
             if hasattr(part, "function_call") and part.function_call:
@@ -71,17 +70,27 @@ class agent:
 
                 print(f"Calling tool: {tool_name}")
 
-                result = call_tool(tool_name, self.session_id)
-                tool_outputs.append((tool_name, result))
+                tool_names.append(tool_name)
+
+        tool_outputs = list(zip(tool_names, call_tools_parallel(tool_names, self.session_id)))
+        tools_done = time.perf_counter()
 
         if tool_outputs:
             followup = "\n\n".join(
-                f"Result of `{name}`:\n{output}" for name, output in tool_outputs
+                f"Result of `{name}`:\n{tool_reducer.reduce(name, output)}" for name, output in tool_outputs
             )
             final_response = self.chat.send_message(followup)
-            return final_response.text
-                
-        return response.text
+            reply = final_response.text
+        else:
+            reply = response.text
+
+        turn_done = time.perf_counter()
+        logger.info(
+            "turn timings: llm=%.3fs tools=%.3fs (%d calls) followup=%.3fs total=%.3fs",
+            llm_done - turn_start, tools_done - llm_done, len(tool_names),
+            turn_done - tools_done, turn_done - turn_start,
+        )
+        return reply
 
     def call_gemini_for_dashboard(self, dashboard: str) -> str:
         response = self.chat.send_message(f"Generate data to fetch {dashboard} information and display it in a format that can be used in a streamlit dashboard.")
@@ -98,6 +107,10 @@ class agent:
         return response.text
     def update_fs(self):
         history = self.chat.get_history()
-        self.fs_client.store_chat_history([item.to_json_dict() for item in history])
         context = json.load(open("tmp/mock_ctx.json"))
-        self.fs_client.store_chat_context(context)
\ No newline at end of file
+        # Only the turns this agent has not persisted yet are written.
+        new_turns = self.history.new_turns(history)
+        self.fs_client.store_chat_state(
+            [item.to_json_dict() for item in new_turns], context, summary=self.history.summary
+        )
+        self.history.mark_persisted(new_turns)
\ No newline at end of file
@@ -0,0 +1,20 @@
+import threading
+
+API_KEY_FILE = "gemini_api.txt"
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """
+    Return the process-wide Gemini client. The `google.genai` SDK is imported
+    and the API key read on first use, so importing an agent module stays cheap.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from google import genai
+                with open(API_KEY_FILE, "r") as fin:
+                    _client = genai.Client(api_key=fin.read().strip())
+    return _client
@@ -0,0 +1,169 @@
+import json
+import os
+
+MAX_TURNS = int(os.getenv("FIFI_HISTORY_MAX_TURNS", "20"))
+TOKEN_BUDGET = int(os.getenv("FIFI_HISTORY_TOKEN_BUDGET", "8000"))
+SUMMARY_MAX_CHARS = 2000
+LINE_MAX_CHARS = 160
+
+def estimate_tokens(turn: dict) -> int:
+    """
+    Rough token count of a history turn (~4 characters per token).
+    """
+    chars = 0
+    for part in turn.get("parts", []):
+        if part.get("text"):
+            chars += len(part["text"])
+        else:
+            chars += len(json.dumps(part))
+    return chars // 4 + 1
+
+def _is_user_text(turn: dict) -> bool:
+    return turn.get("role") == "user" and any(part.get("text") for part in turn.get("parts", []))
+
+def _summary_line(turn: dict) -> str | None:
+    role = turn.get("role", "user")
+    for part in turn.get("parts", []):
+        if part.get("function_call"):
+            return f"{role} called {part['function_call'].get('name')}"
+        if part.get("text"):
+            text = " ".join(part["text"].split())
+            # Tool results are sent back as user text; the data itself is re-fetchable.
+            if text.startswith("Result of `"):
+                return None
+            if len(text) > LINE_MAX_CHARS:
+                text = text[:LINE_MAX_CHARS] + "…"
+            return f"{role}: {text}"
+    return None
+
+def extractive_summary(summary: str, turns: list) -> str:
+    """
+    Fold turns into a running summary without calling a model: one short
+    line per message, keeping the newest lines within SUMMARY_MAX_CHARS.
+    Args:
+        summary (str): The summary so far.
+        turns (list): Turns leaving the verbatim window, oldest first.
+    Returns:
+        str: The updated summary.
+    """
+    lines = summary.splitlines() if summary else []
+    lines += [line for line in map(_summary_line, turns) if line]
+    size = 0
+    kept = []
+    for line in reversed(lines):
+        size += len(line) + 1
+        if size > SUMMARY_MAX_CHARS:
+            break
+        kept.append(line)
+    return "\n".join(reversed(kept))
+
+def make_gemini_summarizer(client, model: str = "gemini-2.0-flash"):
+    """
+    Build a summarizer that asks Gemini to fold new turns into the summary.
+    Args:
+        client (genai.Client): The Gemini client.
+        model (str): The model to summarize with.
+    """
+    def summarize(summary: str, turns: list) -> str:
+        lines = "\n".join(line for line in map(_summary_line, turns) if line)
+        response = client.models.generate_content(
+            model=model,
+            contents=(
+                "Update this running summary of a conversation between a user and FiFi, "
+                "a financial assistant, with the new messages. Keep facts, goals and "
+                f"decisions; stay under {SUMMARY_MAX_CHARS} characters.\n\n"
+                f"Summary so far:\n{summary or '(empty)'}\n\nNew messages:\n{lines}"
+            ),
+        )
+        return response.text.strip()
+    return summarize
+
+class HistoryManager:
+    """
+    Keeps the last turns of a chat verbatim, within `max_turns` and
+    `token_budget`, and folds everything older into a rolling summary.
+
+    The summary is stored as {"text": ..., "through": n}, where `through` is
+    the number of leading turns already folded in, so it is extended with
+    only the turns that left the window since the last build.
+    """
+    def __init__(
+        self,
+        store,
+        summary: dict | None = None,
+        max_turns: int = MAX_TURNS,
+        token_budget: int = TOKEN_BUDGET,
+        summarizer=extractive_summary,
+    ):
+        """
+        Args:
+            store: A history store (see backend.history_store).
+            summary (dict | None): The stored summary, if any.
+            max_turns (int): Maximum number of turns sent verbatim.
+            token_budget (int): Maximum estimated tokens of verbatim turns.
+            summarizer: Callable (summary, turns) -> summary.
+        """
+        self.store = store
+        self.summary = dict(summary or {"text": "", "through": 0})
+        self.max_turns = max_turns
+        self.token_budget = token_budget
+        self.summarizer = summarizer
+        # Index of the first stored turn included in the chat.
+        self.offset = 0
+        # Turns of the chat already persisted. Not derived from the store's
+        # watermark, which also counts turns other agents of the user append.
+        self.persisted = 0
+
+    def window_start(self, turns: list) -> int:
+        """
+        Index into `turns` where the verbatim window starts. The window always
+        starts at a user message so tool calls and their results stay together.
+        """
+        start = len(turns)
+        tokens = 0
+        for i in range(len(turns) - 1, max(-1, len(turns) - 1 - self.max_turns), -1):
+            tokens += estimate_tokens(turns[i])
+            if tokens > self.token_budget and start < len(turns):
+                break
+            if _is_user_text(turns[i]):
+                start = i
+        return start
+
+    def build(self) -> list:
+        """
+        Return the verbatim turns to start the chat with, updating the summary
+        with any turns that fell out of the window.
+        """
+        watermark = self.store.watermark
+        tail = self.store.recent(self.max_turns)
+        self.offset = watermark - len(tail) + self.window_start(tail)
+
+        through = self.summary.get("through", 0)
+        if through < self.offset:
+            folded = []
+            for turn in self.store.iter_turns(through):
+                if len(folded) == self.offset - through:
+                    break
+                folded.append(turn)
+            self.summary = {
+                "text": self.summarizer(self.summary.get("text", ""), folded),
+                "through": self.offset,
+            }
+        self.persisted = watermark - self.offset
+        return tail[len(tail) - self.persisted:]
+
+    @property
+    def summary_text(self) -> str:
+        return self.summary.get("text", "")
+
+    def new_turns(self, chat_history: list) -> list:
+        """
+        The turns of `chat_history` (which starts at `offset`) not yet persisted.
+        """
+        return chat_history[self.persisted:]
+
+    def mark_persisted(self, turns: list):
+        """
+        Record that `turns`, as returned by `new_turns`, were appended to the store.
+        """
+        self.persisted += len(turns)
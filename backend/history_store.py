@@ -0,0 +1,202 @@
+import json
+import os
+from pathlib import Path
+
+LOCAL_HISTORY_FILE = Path("backend/context_store/chat_history.jsonl")
+LEGACY_LOCAL_HISTORY_FILE = Path("backend/context_store/chat_history.json")
+# Per-user local state, next to each user's context.json.
+LOCAL_USER_DIR = Path("backend/context_store/memory")
+PAGE_SIZE = 100
+# Firestore allows at most 500 writes per batch; one is kept for the user document.
+MAX_BATCH_TURNS = 499
+
+class FirestoreHistoryStore:
+    """
+    Append-only chat history for one user, stored as one document per turn in
+    `users/<id>/turns/<seq>`.
+
+    The user document keeps `history_watermark`, the number of persisted
+    turns, so each save writes only the turns after it and takes the next
+    sequence numbers from it. Users saved before
+    the subcollection existed are read from their legacy `chat_history` field
+    until their first append, which moves it into turn documents and deletes it.
+    """
+    def __init__(self, fs_client):
+        """
+        Args:
+            fs_client (firestore_client.Client): The user's Firestore handle.
+        """
+        self.fs_client = fs_client
+
+    @property
+    def turns_ref(self):
+        return self.fs_client.doc_ref.collection("turns")
+
+    @property
+    def watermark(self) -> int:
+        doc = self.fs_client.load()
+        if "history_watermark" in doc:
+            return doc["history_watermark"]
+        return len(doc.get("chat_history", []))
+
+    def _is_legacy(self) -> bool:
+        return "history_watermark" not in self.fs_client.load()
+
+    def append(self, turns: list, fields: dict | None = None) -> int:
+        """
+        Persist turns after the watermark, together with any extra user-document fields.
+
+        The watermark is read and advanced in the same transaction as the
+        turn writes, so concurrent agents of one user never reuse a sequence
+        number. Firestore caps a transaction at 500 writes; longer appends
+        take one transaction per `MAX_BATCH_TURNS` turns.
+        Args:
+            turns (list): New turns, as `Content.to_json_dict()` dicts.
+            fields (dict | None): Extra fields merged into the user document in the last commit.
+        Returns:
+            int: The new watermark.
+        """
+        db = self.fs_client.db
+        transactional = getattr(db, "transactional", None)
+        delete_field = getattr(db, "DELETE_FIELD", None)
+        if transactional is None:
+            from google.cloud.firestore import DELETE_FIELD as delete_field, transactional
+
+        doc_ref = self.fs_client.doc_ref
+        turns_ref = self.turns_ref
+
+        @transactional
+        def write(transaction, pending: list) -> tuple:
+            doc = doc_ref.get(transaction=transaction)
+            doc = doc.to_dict() if doc.exists else {}
+            header = {}
+            # A legacy user's turns live in the chat_history field; rewrite them
+            # as turn documents and drop the field from the user document.
+            if "history_watermark" in doc:
+                start = doc["history_watermark"]
+            else:
+                start = 0
+                pending = doc.get("chat_history", []) + pending
+                if "chat_history" in doc:
+                    header["chat_history"] = delete_field
+            chunk, rest = pending[:MAX_BATCH_TURNS], pending[MAX_BATCH_TURNS:]
+            for seq, turn in enumerate(chunk, start):
+                transaction.set(turns_ref.document(f"{seq:09d}"), {"seq": seq, "turn": turn})
+            if not rest:
+                header.update(fields or {})
+            header["history_watermark"] = start + len(chunk)
+            transaction.set(doc_ref, header, merge=True)
+            return header["history_watermark"], rest
+
+        end, pending = write(db.transaction(), list(turns))
+        while pending:
+            end, pending = write(db.transaction(), pending)
+
+        self.fs_client._remember({**(fields or {}), "history_watermark": end})
+        self.fs_client._forget("chat_history")
+        return end
+
+    def iter_turns(self, start: int = 0, page_size: int = PAGE_SIZE):
+        """
+        Yield turns from `start` onwards, fetching `page_size` documents per query.
+        """
+        if self._is_legacy():
+            yield from self.fs_client.load().get("chat_history", [])[start:]
+            return
+
+        end = self.watermark
+        while start < end:
+            query = self.turns_ref.order_by("seq").start_at({"seq": start}).limit(page_size)
+            page = [doc.to_dict() for doc in query.stream()]
+            if not page:
+                return
+            for doc in page:
+                yield doc["turn"]
+            start = page[-1]["seq"] + 1
+
+    def recent(self, n: int) -> list:
+        """
+        Return the last `n` turns without reading older pages.
+        """
+        return list(self.iter_turns(max(0, self.watermark - n)))
+
+    def load(self) -> list:
+        return list(self.iter_turns())
+
+class JsonlHistoryStore:
+    """
+    Append-only chat history for local mode: one JSON turn per line.
+
+    An existing `legacy_path` JSON array is read until the first append,
+    which rewrites it as JSONL.
+    """
+    def __init__(self, path, legacy_path=None):
+        """
+        Args:
+            path: The JSONL segment file.
+            legacy_path: Optional JSON array file written by older versions.
+        """
+        self.path = Path(path)
+        self.legacy_path = Path(legacy_path) if legacy_path else None
+        self._watermark = None
+
+    def _legacy_turns(self) -> list:
+        if self.path.exists() or not self.legacy_path or not self.legacy_path.exists():
+            return []
+        with open(self.legacy_path, "r") as f:
+            return json.load(f)
+
+    @property
+    def watermark(self) -> int:
+        if self._watermark is None:
+            if self.path.exists():
+                with open(self.path, "rb") as f:
+                    self._watermark = sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1 << 20), b""))
+            else:
+                self._watermark = len(self._legacy_turns())
+        return self._watermark
+
+    def append(self, turns: list, fields: dict | None = None) -> int:
+        """
+        Append turns after the watermark. `fields` is accepted for interface parity and ignored.
+        Returns:
+            int: The new watermark.
+        """
+        watermark = self.watermark
+        lines = self._legacy_turns() + list(turns)
+        if lines:
+            os.makedirs(self.path.parent, exist_ok=True)
+            with open(self.path, "a") as f:
+                f.writelines(json.dumps(turn) + "\n" for turn in lines)
+        self._watermark = watermark + len(turns)
+        return self._watermark
+
+    def iter_turns(self, start: int = 0, page_size: int = PAGE_SIZE):
+        """
+        Yield turns from `start` onwards, reading the file lazily.
+        """
+        if not self.path.exists():
+            yield from self._legacy_turns()[start:]
+            return
+        with open(self.path, "r") as f:
+            for i, line in enumerate(f):
+                if i >= start and line.strip():
+                    yield json.loads(line)
+
+    def recent(self, n: int) -> list:
+        return list(self.iter_turns(max(0, self.watermark - n)))
+
+    def load(self) -> list:
+        return list(self.iter_turns())
+
+def local_history_store(user_id: str | None = None) -> JsonlHistoryStore:
+    """
+    The local-mode history shared by the CLIs, or one user's own history
+    when `user_id` is given.
+    Args:
+        user_id (str | None): The user whose `LOCAL_USER_DIR/<user_id>/chat_history.jsonl` to use.
+    """
+    if user_id is None:
+        return JsonlHistoryStore(LOCAL_HISTORY_FILE, legacy_path=LEGACY_LOCAL_HISTORY_FILE)
+    user_dir = LOCAL_USER_DIR / str(user_id)
+    return JsonlHistoryStore(user_dir / "chat_history.jsonl", legacy_path=user_dir / "chat_history.json")
@@ -0,0 +1,14 @@
+import logging
+import os
+
+LOG_LEVEL = os.getenv("FIFI_LOG_LEVEL", "INFO")
+
+def configure_logging(level: str = LOG_LEVEL):
+    """
+    Print the backend's log records (per-turn timings, cache hits) to stderr.
+    Called once by each entry point; other libraries stay at WARNING.
+    Args:
+        level (str): Level of the `backend` loggers, e.g. "DEBUG" to also see tool reductions.
+    """
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    logging.getLogger("backend").setLevel(level.upper())
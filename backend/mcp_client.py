@@ -1,7 +1,93 @@
+import asyncio
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from backend.tool_cache import tool_cache
+from backend.mcp_responses import ToolResult, ToolError, parse_response
+
+if TYPE_CHECKING:
+    from mcp.client.session import ClientSession
 
 MCP_BASE_URL = "http://localhost:8080/mcp/stream"
+MAX_TOOL_WORKERS = 8
+
+class MCPTransport:
+    """
+    Pooled, keep-alive JSON-RPC transport for the MCP server.
+
+    A single `requests.Session` is shared by every call so TCP connections to
+    the MCP server are reused instead of being opened per request.
+    """
+    def __init__(
+        self,
+        base_url: str = MCP_BASE_URL,
+        pool_connections: int = 4,
+        pool_maxsize: int = 32,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 30.0,
+    ):
+        """
+        Args:
+            base_url (str): The MCP streamable HTTP endpoint.
+            pool_connections (int): Number of per-host connection pools to keep.
+            pool_maxsize (int): Maximum number of open connections per host.
+            connect_timeout (float): Seconds to wait for a connection to be established.
+            read_timeout (float): Seconds to wait for the server to send a response.
+        """
+        self.base_url = base_url
+        self.timeout = (connect_timeout, read_timeout)
+        self._ids = itertools.count(1)
+        self._id_lock = threading.Lock()
+
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=True,
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Content-Type": "application/json"})
+
+    def next_id(self) -> int:
+        """
+        Return the next JSON-RPC request id. Ids increase monotonically per transport.
+        """
+        with self._id_lock:
+            return next(self._ids)
+
+    def request(self, method: str, session_id: str, params: dict | None = None) -> dict:
+        """
+        Send a JSON-RPC request and return the decoded response body.
+        Args:
+            method (str): The JSON-RPC method, e.g. "tools/list".
+            session_id (str): The session ID for the MCP server.
+            params (dict | None): Optional JSON-RPC params.
+        """
+        payload = {
+            "jsonrpc": "2.0",
+            "id": self.next_id(),
+            "method": method,
+        }
+        if params is not None:
+            payload["params"] = params
+
+        response = self.session.post(
+            self.base_url,
+            headers={"Mcp-Session-Id": session_id},
+            json=payload,
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def close(self):
+        self.session.close()
+
+transport = MCPTransport()
 
 def list_tools(session_id: str) -> list:
     """
@@ -9,61 +95,260 @@ def list_tools(session_id: str) -> list:
     Args:
         session_id (str): The session ID for the MCP server.
     """
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "tools/list"
-    }
-
-    headers = {
-        "Content-Type": "application/json",
-        "Mcp-Session-Id": session_id
-    }
-
     try:
-        response = requests.post(MCP_BASE_URL, headers=headers, data=json.dumps(payload))
-        response.raise_for_status()
-        data = response.json()
+        data = transport.request("tools/list", session_id)
 
         tools = data.get("result", {}).get("tools", [])
-        
+
         return [{"name": tool["name"], "description": tool["description"]} for tool in tools]
 
     except Exception as e:
         return f"❌ Error contacting MCP server: {e}"
 
-def call_tool(tool_name: str, session_id: str) -> str:   
+def call_tool_response(tool_name: str, session_id: str, arguments: dict | None = None) -> ToolResult:
     """
-    Call a specific tool on the MCP server.
+    Call a specific tool on the MCP server and return its decoded result.
+    The text is decoded once; `tool_cache` keeps the decoded object, so
+    cached results are served without decoding them again.
     Args:
         tool_name (str): The name of the tool to call.
         session_id (str): The session ID for the MCP server.
+        arguments (dict | None): Optional tool arguments.
     """
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "tools/call",
-        "params": {
-            "name": tool_name,
-            "arguments": {}
+    cached = tool_cache.get_response(session_id, tool_name, arguments)
+    if cached is not None:
+        return cached if isinstance(cached, ToolResult) else parse_response(tool_name, cached)
+
+    try:
+        data = transport.request(
+            "tools/call",
+            session_id,
+            params={"name": tool_name, "arguments": arguments or {}},
+        )
+
+        result = data.get("result", {})
+        content = result.get("content", [])
+        if content and "text" in content[0]:
+            response = parse_response(tool_name, content[0]["text"], is_error=bool(result.get("isError")))
+            if not isinstance(response, ToolError):
+                tool_cache.put(session_id, tool_name, arguments, response)
+            return response
+
+        return ToolError(tool_name, f"⚠️ Unexpected response format: {data}")
+
+    except Exception as e:
+        return ToolError(tool_name, f"❌ Error contacting fi-mcp-dev: {e}")
+
+def call_tool(tool_name: str, session_id: str, arguments: dict | None = None) -> str:
+    """
+    Call a specific tool on the MCP server. Results are served from `tool_cache` while fresh.
+    Args:
+        tool_name (str): The name of the tool to call.
+        session_id (str): The session ID for the MCP server.
+        arguments (dict | None): Optional tool arguments.
+    Returns:
+        str: The raw result text, or an error message.
+    """
+    return call_tool_response(tool_name, session_id, arguments).text
+
+_tool_executor = ThreadPoolExecutor(max_workers=MAX_TOOL_WORKERS, thread_name_prefix="mcp-tool")
+
+def call_tools_parallel(names: list, session_id: str) -> list:
+    """
+    Call several tools on a bounded thread pool.
+    Args:
+        names (list): The names of the tools to call.
+        session_id (str): The session ID for the MCP server.
+    Returns:
+        list: The decoded tool results (`ToolResult`), in the same order as `names`.
+    """
+    if len(names) <= 1:
+        return [call_tool_response(name, session_id) for name in names]
+    return list(_tool_executor.map(lambda name: call_tool_response(name, session_id), names))
+
+class AsyncMCPSessionPool:
+    """
+    Keeps one streamable-HTTP MCP session open per MCP session id.
+
+    Each session is owned by a background task so its transport context is
+    entered and exited in the same task; callers share the `ClientSession`
+    and may issue concurrent requests on it.
+    """
+    def __init__(self, base_url: str = MCP_BASE_URL):
+        self.base_url = base_url
+        self._sessions: dict[str, asyncio.Future] = {}
+        self._stops: dict[str, asyncio.Event] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        # Tasks of discarded sessions that are still shutting down.
+        self._closing: set = set()
+        self._loop = None
+
+    async def _run_session(self, session_id: str, ready: asyncio.Future, stop: asyncio.Event):
+        # The MCP SDK is only needed by the async path; keep it out of import time.
+        from mcp.client.streamable_http import streamablehttp_client
+        from mcp.client.session import ClientSession
+
+        headers = {
+            "Content-Type": "application/json",
+            "Mcp-Session-Id": session_id
         }
-    }
+        try:
+            async with streamablehttp_client(self.base_url, headers=headers) as (
+                read_stream,
+                write_stream,
+                _,
+            ):
+                async with ClientSession(read_stream, write_stream) as session:
+                    # No initialize: fi-mcp-dev answers it with a new session id, which
+                    # the client would then send instead of the one the user logged
+                    # into. Like MCPTransport, every request carries `session_id`.
+                    ready.set_result(session)
+                    await stop.wait()
+        except BaseException as e:
+            if not ready.done():
+                ready.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            if self._sessions.get(session_id) is ready:
+                self._forget(session_id)
+
+    def _forget(self, session_id: str):
+        self._sessions.pop(session_id, None)
+        self._stops.pop(session_id, None)
+        self._tasks.pop(session_id, None)
+
+    async def get(self, session_id: str) -> "ClientSession":
+        """
+        Return the open session for `session_id`, connecting on first use.
+        Args:
+            session_id (str): The session ID for the MCP server.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Sessions are bound to the loop that opened them.
+            self._sessions.clear()
+            self._stops.clear()
+            self._tasks.clear()
+            self._closing.clear()
+            self._loop = loop
 
-    headers = {
-        "Content-Type": "application/json",
-        "Mcp-Session-Id": session_id
-    }
+        ready = self._sessions.get(session_id)
+        if ready is None:
+            ready = loop.create_future()
+            stop = asyncio.Event()
+            self._sessions[session_id] = ready
+            self._stops[session_id] = stop
+            self._tasks[session_id] = loop.create_task(self._run_session(session_id, ready, stop))
+        return await asyncio.shield(ready)
 
+    def _discard(self, session_id: str):
+        stop = self._stops.get(session_id)
+        task = self._tasks.get(session_id)
+        self._forget(session_id)
+        if task is not None and not task.done():
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+        if stop is not None:
+            stop.set()
+
+    def discard(self, session_id: str):
+        """
+        Close a session without waiting for it, from any thread; the next `get`
+        opens a new one. Used when the session's agent is evicted.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._discard(session_id)
+        else:
+            loop.call_soon_threadsafe(self._discard, session_id)
+
+    async def close(self, session_id: str | None = None):
+        """
+        Close one session, or every open session when `session_id` is None.
+        """
+        session_ids = [session_id] if session_id else list(self._stops)
+        tasks = []
+        for sid in session_ids:
+            stop = self._stops.get(sid)
+            task = self._tasks.get(sid)
+            if stop is not None:
+                stop.set()
+            if task is not None:
+                tasks.append(task)
+        if session_id is None:
+            tasks += list(self._closing)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+async_sessions = AsyncMCPSessionPool()
+
+async def async_list_tools(session_id: str) -> list:
+    """
+    Async counterpart of `list_tools`.
+    Args:
+        session_id (str): The session ID for the MCP server.
+    """
     try:
-        response = requests.post(MCP_BASE_URL, headers=headers, data=json.dumps(payload))
-        response.raise_for_status()
-        data = response.json()
+        session = await async_sessions.get(session_id)
+        result = await session.list_tools()
 
-        content = data.get("result", {}).get("content", [])
-        if content and "text" in content[0]:
-            return content[0]["text"]
+        return [{"name": tool.name, "description": tool.description} for tool in result.tools]
+
+    except Exception as e:
+        return f"❌ Error contacting MCP server: {e}"
+
+async def async_call_tool_response(tool_name: str, session_id: str, arguments: dict | None = None) -> ToolResult:
+    """
+    Async counterpart of `call_tool_response`.
+    Args:
+        tool_name (str): The name of the tool to call.
+        session_id (str): The session ID for the MCP server.
+        arguments (dict | None): Optional tool arguments.
+    """
+    cached = tool_cache.get_response(session_id, tool_name, arguments)
+    if cached is not None:
+        return cached if isinstance(cached, ToolResult) else parse_response(tool_name, cached)
 
-        return f"⚠️ Unexpected response format: {data}"
+    try:
+        session = await async_sessions.get(session_id)
+        result = await session.call_tool(tool_name, arguments or {})
+
+        content = result.content
+        if content and getattr(content[0], "text", None) is not None:
+            response = parse_response(tool_name, content[0].text, is_error=bool(result.isError))
+            if not isinstance(response, ToolError):
+                tool_cache.put(session_id, tool_name, arguments, response)
+            return response
+
+        return ToolError(tool_name, f"⚠️ Unexpected response format: {result}")
 
     except Exception as e:
-        return f"❌ Error contacting fi-mcp-dev: {e}"
+        return ToolError(tool_name, f"❌ Error contacting fi-mcp-dev: {e}")
+
+async def async_call_tool(tool_name: str, session_id: str, arguments: dict | None = None) -> str:
+    """
+    Async counterpart of `call_tool`.
+    Args:
+        tool_name (str): The name of the tool to call.
+        session_id (str): The session ID for the MCP server.
+        arguments (dict | None): Optional tool arguments.
+    """
+    return (await async_call_tool_response(tool_name, session_id, arguments)).text
+
+async def call_tools_many(names: list, session_id: str) -> list:
+    """
+    Call several tools concurrently over one MCP session.
+    Args:
+        names (list): The names of the tools to call.
+        session_id (str): The session ID for the MCP server.
+    Returns:
+        list: The decoded tool results (`ToolResult`), in the same order as `names`.
+    """
+    return list(await asyncio.gather(*(async_call_tool_response(name, session_id) for name in names)))
@@ -0,0 +1,115 @@
+import json
+from dataclasses import dataclass, field
+from backend.tool_cache import ERROR_PREFIXES
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def loads(text: str | bytes):
+    """
+    Decode JSON with orjson when it is installed, the standard library otherwise.
+    Raises ValueError on invalid JSON either way.
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+@dataclass(slots=True)
+class ToolResult:
+    """
+    One decoded MCP tool result. `text` is the raw `content[0].text`, kept
+    for Gemini and the caches; `data` is its JSON, decoded once, or None if
+    the text is not JSON.
+    """
+    tool_name: str
+    text: str = field(repr=False)
+    data: object = field(default=None, repr=False)
+
+@dataclass(slots=True)
+class ToolError(ToolResult):
+    """
+    An error reported by the MCP server, or by the client while contacting it.
+    """
+
+@dataclass(slots=True)
+class LoginRequired(ToolResult):
+    login_url: str = ""
+    message: str = ""
+
+@dataclass(slots=True)
+class UserInfo(ToolResult):
+    phone_number: str | None = None
+    session_id: str | None = None
+
+@dataclass(slots=True)
+class NetWorth(ToolResult):
+    @property
+    def total(self) -> float | None:
+        """
+        Total net worth in rupees, or None if the payload has none.
+        """
+        value = (self.data or {}).get("netWorthResponse", {}).get("totalNetWorthValue")
+        if not value:
+            return None
+        return float(value.get("units", 0)) + value.get("nanos", 0) / 1e9
+
+@dataclass(slots=True)
+class CreditReport(ToolResult):
+    @property
+    def score(self) -> int | None:
+        """
+        The bureau score of the first report, or None.
+        """
+        for report in (self.data or {}).get("creditReports", []):
+            score = report.get("creditReportData", {}).get("score", {}).get("bureauScore")
+            if score is not None:
+                return int(score)
+        return None
+
+@dataclass(slots=True)
+class EpfDetails(ToolResult):
+    pass
+
+@dataclass(slots=True)
+class MfTransactions(ToolResult):
+    pass
+
+@dataclass(slots=True)
+class BankStatement(ToolResult):
+    pass
+
+@dataclass(slots=True)
+class StockTransactions(ToolResult):
+    pass
+
+RESPONSE_TYPES = {
+    "fetch_net_worth": NetWorth,
+    "fetch_credit_report": CreditReport,
+    "fetch_epf_details": EpfDetails,
+    "fetch_mf_transactions": MfTransactions,
+    "fetch_bank_transactions": BankStatement,
+    "fetch_stock_transactions": StockTransactions,
+}
+
+def parse_response(tool_name: str, text: str, is_error: bool = False) -> ToolResult:
+    """
+    Decode a tool's `content[0].text` into its typed result.
+    Args:
+        tool_name (str): The tool that produced the text.
+        text (str): The raw text.
+        is_error (bool): Whether the server flagged the result as an error.
+    """
+    if is_error or not isinstance(text, str) or text.startswith(ERROR_PREFIXES):
+        return ToolError(tool_name, str(text))
+    try:
+        data = loads(text)
+    except ValueError:
+        return ToolResult(tool_name, text)
+    if isinstance(data, dict):
+        if data.get("status") == "login_required":
+            return LoginRequired(tool_name, text, data, data.get("login_url", ""), data.get("message", ""))
+        if tool_name == "whoami":
+            return UserInfo(tool_name, text, data, data.get("phoneNumber"), data.get("sessionId"))
+    return RESPONSE_TYPES.get(tool_name, ToolResult)(tool_name, text, data)
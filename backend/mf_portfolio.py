@@ -0,0 +1,279 @@
+import numpy as np
+from backend.financial_data import _load, _columns, _float_column
+
+DAYS_PER_YEAR = 365.0
+# Bracket of annual rates searched by `xirr`: -99.99% to +10000%.
+XIRR_BOUNDS = (-0.9999, 100.0)
+XIRR_TOLERANCE = 1e-9
+XIRR_MAX_ITER = 100
+
+def xirr(groups: np.ndarray, amounts: np.ndarray, years: np.ndarray, n_groups: int | None = None,
+         bounds: tuple = XIRR_BOUNDS, tol: float = XIRR_TOLERANCE, max_iter: int = XIRR_MAX_ITER) -> np.ndarray:
+    """
+    XIRR of many cash flow series at once.
+
+    Solves sum(amount / (1 + rate) ** years) = 0 for every group with a
+    safeguarded Newton iteration: each group keeps a bracket around its root,
+    and a bisection step replaces any Newton step that leaves it. All groups
+    iterate together on flat arrays, so the cost per iteration is one pass
+    over the cash flows whatever their number of groups.
+    Args:
+        groups (np.ndarray): Group index of each cash flow, in [0, n_groups).
+        amounts (np.ndarray): Cash flows, negative for money invested.
+        years (np.ndarray): Time of each flow in years since its group's first flow.
+        n_groups (int | None): Number of groups, defaults to groups.max() + 1.
+        bounds (tuple): The (low, high) annual rates searched.
+        tol (float): Convergence tolerance on the rate.
+        max_iter (int): Iteration limit.
+    Returns:
+        np.ndarray: Annual rate per group, NaN where the flows do not change
+            sign or the root is outside `bounds`.
+    """
+    groups = np.asarray(groups, dtype=np.intp)
+    amounts = np.asarray(amounts, dtype=np.float64)
+    years = np.asarray(years, dtype=np.float64)
+    if n_groups is None:
+        n_groups = int(groups.max()) + 1 if len(groups) else 0
+
+    def npv(rate: np.ndarray, flows: tuple, derivative: bool = False):
+        groups, amounts, years = flows
+        # Logs are taken per group and gathered, not per flow.
+        discounted = amounts * np.exp(-years * np.log1p(rate)[groups])
+        value = np.bincount(groups, weights=discounted, minlength=n_groups)
+        if not derivative:
+            return value
+        slope = np.bincount(groups, weights=years * discounted, minlength=n_groups)
+        return value, -slope / (1.0 + rate)
+
+    flows = (groups, amounts, years)
+
+    low = np.full(n_groups, bounds[0])
+    high = np.full(n_groups, bounds[1])
+    npv_low, npv_high = npv(low, flows), npv(high, flows)
+    active = np.sign(npv_low) * np.sign(npv_high) < 0
+
+    # Start from the rate that grows the money-weighted mean time of the
+    # outflows to that of the inflows; it is usually a few steps from the root.
+    paid = np.bincount(groups, weights=np.maximum(-amounts, 0), minlength=n_groups)
+    received = np.bincount(groups, weights=np.maximum(amounts, 0), minlength=n_groups)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        span = (
+            np.bincount(groups, weights=np.maximum(amounts, 0) * years, minlength=n_groups) / received
+            - np.bincount(groups, weights=np.maximum(-amounts, 0) * years, minlength=n_groups) / paid
+        )
+        rate = np.where(span > 0, (received / paid) ** (1 / span) - 1, 0.1)
+    rate = np.where(np.isfinite(rate) & (rate > low) & (rate < high), rate, (low + high) / 2)
+    rate = np.where(active, rate, np.nan)
+
+    flows_active = n_groups
+    for _ in range(max_iter):
+        n_active = np.count_nonzero(active)
+        if not n_active:
+            break
+        if n_active <= flows_active // 2:
+            # Most groups have converged: iterate over the flows of the rest only.
+            keep = active[flows[0]]
+            flows = tuple(column[keep] for column in flows)
+            flows_active = n_active
+        value, slope = npv(np.where(active, rate, 0.0), flows, derivative=True)
+        # Shrink each bracket to the side of `rate` that still holds the sign change.
+        below = np.sign(value) == np.sign(npv_low)
+        low = np.where(active & below, rate, low)
+        npv_low = np.where(active & below, value, npv_low)
+        high = np.where(active & ~below, rate, high)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = rate - value / slope
+        bisect = ~np.isfinite(step) | (step <= low) | (step >= high)
+        step = np.where(bisect, (low + high) / 2, step)
+        # An exact root ends the bracket at itself; keep it rather than the midpoint.
+        step = np.where(value == 0, rate, step)
+        done = (np.abs(step - rate) <= tol * (1.0 + np.abs(rate))) | (value == 0)
+        rate = np.where(active, step, rate)
+        active &= ~done
+    return rate
+
+def navs_from_net_worth(payload: dict) -> dict:
+    """
+    Current NAV per ISIN from the scheme analytics in `fetch_net_worth`.
+    """
+    navs = {}
+    for scheme in payload.get("mfSchemeAnalytics", {}).get("schemeAnalytics", []):
+        detail = scheme.get("schemeDetail", {})
+        nav = detail.get("nav")
+        if detail.get("isinNumber") and nav:
+            navs[detail["isinNumber"]] = float(nav.get("units", 0)) + nav.get("nanos", 0) / 1e9
+    return navs
+
+class MfPortfolio:
+    """
+    `fetch_mf_transactions` as per-ISIN arrays.
+
+    Orders are grouped by scheme: `isins`, `schemes` and `folios` hold one
+    entry per scheme, and the order arrays (`dates`, `orders`, `prices`,
+    `units`, `amounts`) are sorted by scheme, then date, with scheme `i`
+    spanning `offsets[i]:offsets[i + 1]`. Holdings, P&L and XIRR are computed
+    for every scheme at once with NumPy reductions over these arrays.
+    """
+    def __init__(self, isins: list, schemes: list, folios: list, codes: np.ndarray, dates: np.ndarray,
+                 orders: np.ndarray, prices: np.ndarray, units: np.ndarray, amounts: np.ndarray):
+        order = np.lexsort((dates, codes))
+        self.isins = list(isins)
+        self.schemes = list(schemes)
+        self.folios = list(folios)
+        self.codes = codes[order]
+        self.dates = dates[order]
+        self.orders = orders[order]
+        self.prices = prices[order]
+        self.units = units[order]
+        self.amounts = amounts[order]
+        counts = np.bincount(self.codes, minlength=len(self.isins))
+        self.offsets = np.concatenate(([0], np.cumsum(counts)))
+        # +1 for a buy, -1 for a sell.
+        self._sign = np.where(self.orders == 2, -1.0, 1.0)
+
+    @classmethod
+    def from_payload(cls, payload) -> "MfPortfolio":
+        """
+        Args:
+            payload (str | dict | ToolResult): The `fetch_mf_transactions` result.
+        """
+        payload = _load(payload)
+        isins, schemes, folios, codes, rows = [], [], [], [], []
+        for scheme in payload.get("mfTransactions", []):
+            txns = scheme.get("txns", [])
+            if not txns:
+                continue
+            codes += [len(isins)] * len(txns)
+            isins.append(scheme.get("isin"))
+            schemes.append(scheme.get("schemeName"))
+            folios.append(scheme.get("folioId"))
+            rows += txns
+        columns = _columns(rows, 5)
+        return cls(
+            isins, schemes, folios,
+            codes=np.asarray(codes, dtype=np.intp),
+            dates=np.asarray(columns[1], dtype="datetime64[D]"),
+            orders=np.asarray(columns[0], dtype=np.int8),
+            prices=_float_column(columns[2]),
+            units=_float_column(columns[3]),
+            amounts=_float_column(columns[4]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def _per_scheme(self, values: np.ndarray) -> np.ndarray:
+        return np.bincount(self.codes, weights=values, minlength=len(self.isins))
+
+    def current_units(self) -> np.ndarray:
+        """
+        Units held per scheme: bought minus sold.
+        """
+        return self._per_scheme(self._sign * self.units)
+
+    def invested(self) -> np.ndarray:
+        """
+        Amount bought per scheme.
+        """
+        return self._per_scheme(np.where(self._sign > 0, self.amounts, 0.0))
+
+    def redeemed(self) -> np.ndarray:
+        """
+        Amount sold per scheme.
+        """
+        return self._per_scheme(np.where(self._sign < 0, self.amounts, 0.0))
+
+    def last_prices(self) -> np.ndarray:
+        """
+        Price of the latest order per scheme, the NAV used when no current NAV is known.
+        """
+        last = self.offsets[1:] - 1
+        return self.prices[last] if len(self.codes) else np.zeros(0)
+
+    def current_navs(self, navs: dict | None = None) -> np.ndarray:
+        """
+        Current NAV per scheme: `navs[isin]` where given, the latest order price otherwise.
+        """
+        prices = self.last_prices()
+        if navs:
+            prices = np.array([navs.get(isin, price) for isin, price in zip(self.isins, prices)], dtype=np.float64)
+        return prices
+
+    def xirr(self, values: np.ndarray, as_of: np.datetime64) -> np.ndarray:
+        """
+        XIRR per scheme, with each scheme's `values` received on `as_of`,
+        followed by the XIRR of the whole portfolio. All are solved in one batch.
+        Args:
+            values (np.ndarray): Current value per scheme.
+            as_of (np.datetime64): The valuation date.
+        Returns:
+            np.ndarray: len(isins) + 1 annual rates.
+        """
+        n = len(self.isins)
+        flows = -self._sign * self.amounts
+        # The portfolio is group n: every order again, and the total value.
+        groups = np.concatenate((self.codes, np.arange(n), np.full(len(self.codes) + 1, n)))
+        amounts = np.concatenate((flows, values, flows, [values.sum()]))
+        ends = np.full(n + 1, as_of, dtype="datetime64[D]")
+        dates = np.concatenate((self.dates, ends[:n], self.dates, ends[n:]))
+        first = np.append(self.dates[self.offsets[:-1]], self.dates.min())
+        years = (dates - first[groups]).astype(np.float64) / DAYS_PER_YEAR
+        return xirr(groups, amounts, years, n_groups=n + 1)
+
+    def summary(self, navs: dict | None = None, as_of=None) -> dict:
+        """
+        Holdings, P&L and XIRR per scheme and for the whole portfolio.
+        Args:
+            navs (dict | None): Current NAV per ISIN; the latest order price is used for missing ones.
+            as_of: Valuation date, defaults to today: `navs` are current NAVs, so
+                the values they give are today's. The latest order date is used
+                instead if it is later.
+        """
+        if not len(self.codes):
+            return {"as_of": None, "schemes": [], "total": {
+                "invested": 0.0, "redeemed": 0.0, "current_value": 0.0,
+                "absolute_return": 0.0, "absolute_return_pct": None, "xirr_pct": None,
+            }}
+        as_of = np.datetime64(as_of, "D") if as_of is not None else max(np.datetime64("today", "D"), self.dates.max())
+        units = self.current_units()
+        nav = self.current_navs(navs)
+        value = units * nav
+        invested, redeemed = self.invested(), self.redeemed()
+        gain = value + redeemed - invested
+        rates = self.xirr(value, as_of)
+
+        def pct(numerator, denominator):
+            return round(float(numerator / denominator) * 100, 2) if denominator else None
+
+        def rate(value):
+            return round(float(value) * 100, 2) if np.isfinite(value) else None
+
+        schemes = [
+            {
+                "isin": self.isins[i],
+                "scheme": self.schemes[i],
+                "folio": self.folios[i],
+                "orders": int(self.offsets[i + 1] - self.offsets[i]),
+                "units": round(float(units[i]), 3),
+                "nav": round(float(nav[i]), 4),
+                "invested": round(float(invested[i]), 2),
+                "redeemed": round(float(redeemed[i]), 2),
+                "current_value": round(float(value[i]), 2),
+                "absolute_return": round(float(gain[i]), 2),
+                "absolute_return_pct": pct(gain[i], invested[i]),
+                "xirr_pct": rate(rates[i]),
+            }
+            for i in np.argsort(-value, kind="stable")
+        ]
+        return {
+            "as_of": str(as_of),
+            "schemes": schemes,
+            "total": {
+                "invested": round(float(invested.sum()), 2),
+                "redeemed": round(float(redeemed.sum()), 2),
+                "current_value": round(float(value.sum()), 2),
+                "absolute_return": round(float(gain.sum()), 2),
+                "absolute_return_pct": pct(gain.sum(), invested.sum()),
+                "xirr_pct": rate(rates[-1]),
+            },
+        }
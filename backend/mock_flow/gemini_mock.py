@@ -1,17 +1,118 @@
 # gemini_mock.py
 
-TOOL_MAPPING = {
-    "net worth": "fetch_net_worth",
-    "credit score": "fetch_credit_report",
-    "credit report": "fetch_credit_report",
-    "epf": "fetch_epf_details",
-    "mutual funds": "fetch_mf_transactions",
-    "sip": "fetch_mf_transactions",
-}
+import json
+import os
+from pathlib import Path
+
+TOOL_KEYWORDS_FILE = Path(os.getenv("FIFI_TOOL_KEYWORDS", Path(__file__).with_name("tool_keywords.json")))
+# Trie key under which a node stores the (tool, weight) pairs of the phrases ending there.
+_END = ""
+
+def _token_table() -> bytes:
+    # ASCII letters -> lowercase, digits kept, everything else -> space.
+    table = bytearray(b" " * 256)
+    for byte in range(256):
+        char = chr(byte)
+        if "0" <= char <= "9" or "a" <= char <= "z":
+            table[byte] = byte
+        elif "A" <= char <= "Z":
+            table[byte] = ord(char.lower())
+    return bytes(table)
+
+_TOKEN_TABLE = _token_table()
+
+def tokenize(text: str) -> list:
+    """
+    Split text into lowercase alphanumeric words.
+    """
+    return text.encode("ascii", "replace").translate(_TOKEN_TABLE).decode().split()
+
+class KeywordRouter:
+    """
+    Multi-pattern keyword matcher from user queries to MCP tools.
+
+    Keyword phrases and their synonyms are compiled into a trie over words,
+    so matching respects word boundaries ("sip" does not match "gossip") and
+    costs one dict lookup per query word, however many phrases are
+    configured. At each word only the longest phrase is taken, and every
+    tool it points to is scored with its weight.
+    """
+    def __init__(self, tools: dict, synonyms: dict | None = None):
+        """
+        Args:
+            tools (dict): Tool name -> {keyword phrase: weight}.
+            synonyms (dict | None): Canonical phrase -> list of equivalent phrases.
+        """
+        self.tools = list(tools)
+        self.trie: dict = {}
+        self.mapping = {}
+        synonyms = synonyms or {}
+        for tool, keywords in tools.items():
+            for phrase, weight in keywords.items():
+                for variant in [phrase] + list(synonyms.get(phrase, [])):
+                    self._add(variant, tool, float(weight))
+        self._order = {tool: rank for rank, tool in enumerate(self.tools)}
+
+    @classmethod
+    def from_file(cls, path=TOOL_KEYWORDS_FILE) -> "KeywordRouter":
+        with open(path, "r") as fin:
+            config = json.load(fin)
+        return cls(config["tools"], config.get("synonyms"))
+
+    def _add(self, phrase: str, tool: str, weight: float):
+        words = tokenize(phrase)
+        if not words:
+            return
+        node = self.trie
+        for word in words:
+            node = node.setdefault(word, {})
+        node.setdefault(_END, {})[tool] = weight
+        self.mapping[" ".join(words)] = tool
+
+    def match(self, user_input: str) -> list:
+        """
+        Return every tool matched by the query with its score, best first.
+        Ties keep the order of the tools in the config.
+        Args:
+            user_input (str): The user's message.
+        Returns:
+            list: (tool_name, score) tuples.
+        """
+        tokens = tokenize(user_input)
+        scores = {}
+        i, count = 0, len(tokens)
+        while i < count:
+            node = self.trie.get(tokens[i])
+            if node is None:
+                i += 1
+                continue
+            j = i + 1
+            longest = (j, node[_END]) if _END in node else None
+            while j < count:
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+                if _END in node:
+                    longest = (j, node[_END])
+            if longest is None:
+                i += 1
+                continue
+            i, hits = longest
+            for tool, weight in hits.items():
+                scores[tool] = scores.get(tool, 0.0) + weight
+        return sorted(scores.items(), key=lambda item: (-item[1], self._order[item[0]]))
+
+router = KeywordRouter.from_file()
+# Flat phrase -> tool view of the router, including synonyms.
+TOOL_MAPPING = router.mapping
+
+def detect_tools(user_input: str) -> list:
+    """
+    All tools matched by the query, as (tool_name, score) tuples, best first.
+    """
+    return router.match(user_input)
 
 def detect_tool(user_input: str) -> str | None:
-    user_input = user_input.lower()
-    for keyword, tool in TOOL_MAPPING.items():
-        if keyword in user_input:
-            return tool
-    return None
+    matches = router.match(user_input)
+    return matches[0][0] if matches else None
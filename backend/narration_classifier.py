@@ -0,0 +1,163 @@
+import re
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+# The spending categories shown on the dashboard, in priority order: when a
+# narration matches keywords of several categories, the earliest one wins.
+CATEGORIES = (
+    "Debt Repayment",
+    "Savings",
+    "Upskill/Education",
+    "Essentials",
+    "Lifestyle & Leisure",
+    "Impulse",
+)
+OTHER = "Other"
+
+# Merchant names and narration keywords per category. Keywords match whole
+# words of the normalized narration; multi-word keywords match as phrases.
+CATEGORY_KEYWORDS = {
+    "Debt Repayment": [
+        "EMI", "LOAN", "HOMEFIN", "HOME LOAN", "AUTO LOAN", "AUTOLOAN", "PERSONAL LOAN", "BAJAJFIN",
+        "CREDIT CARD", "CARD PAYMENT", "CARD_PAYMENT", "MIN DUE", "CRED", "DREAMPLUG", "SIMPL",
+        "LAZYPAY", "SLICE", "KREDITBEE",
+    ],
+    "Savings": [
+        "SIP", "MF", "MUTUAL", "MUTUAL FUND", "RD", "RD INSTALLMENT", "FD", "FIXED DEPOSIT", "PPF", "NPS",
+        "ZERODHA", "GROWW", "UPSTOX", "KUVERA", "COIN", "LUMPSUM", "SGB", "GOLD FUND", "EQUITY FUNDING",
+        "HDFCMF", "NIPPONMF", "MOTILALMF", "MIRAEASSETMF", "KOTAKMF", "ADITYABIRLAMF", "ICICIPRUMF",
+        "PPFASMF", "PARAGPARIKHMF", "AXISMF", "SBIMF", "PAYTMMONEY",
+    ],
+    "Upskill/Education": [
+        "SCHOOL", "TUITION", "FEES", "COLLEGE", "UNIVERSITY", "COURSE", "COURSERA", "UDEMY", "UPGRAD",
+        "BYJUS", "UNACADEMY", "SIMPLILEARN", "CERTIFICATION", "WORKSHOP", "BOOK", "BOOKS", "KINDLE",
+    ],
+    "Essentials": [
+        "RENT", "GROCERY", "GROCERIES", "GROCER", "BIGBASKET", "BB", "DMART", "BLINKIT", "ZEPTO",
+        "JIOMART", "MINI MART", "SUPERMARKET", "KIRANA", "MILK", "FRUIT", "VEGETABLE", "ELECTRICITY",
+        "BESCOM", "WATER", "GAS", "LPG", "INTERNET", "BROADBAND", "BBNL", "AIRTEL", "JIO", "VODAFONE",
+        "MOBILE", "RECHARGE", "BILL", "BILLDESK", "INSURANCE", "LIC", "LIFE", "SUN LIF", "PHARMACY", "PHARMA",
+        "MEDICAL", "MEDICINE", "APOLLO", "HOSPITAL", "CLINIC", "DENTAL", "DENTIS", "METRO", "DMRC",
+        "FUEL", "PETROL", "IOCL", "HPCL", "BPCL", "FASTAG", "MAINTENANCE",
+    ],
+    "Lifestyle & Leisure": [
+        "SWIGGY", "ZOMATO", "DUNZO", "FOOD", "FOOD ORDER", "DINNER", "LUNCH", "RESTAURANT", "CAFE",
+        "COFFEE", "STARBUCKS", "DOMINOS", "PIZZA", "UBER", "OLA", "RAPIDO", "RIDE", "TRAVEL", "HOTEL",
+        "MAKEMYTRIP", "GOIBIBO", "IRCTC", "FLIGHT", "INDIGO", "MOVIE", "PVR", "INOX", "BOOKMYSHOW",
+        "NETFLIX", "HOTSTAR", "SONYLIV", "PRIME VIDEO", "SPOTIFY", "FANCODE", "SPORTS", "GYM",
+        "CULTFIT", "SALON", "SPA",
+    ],
+    "Impulse": [
+        "AMAZON", "FLIPKART", "MYNTRA", "AJIO", "NYKAA", "MEESHO", "SHOPPING", "DECATHLON", "TATACLIQ",
+        "CROMA", "GADGET", "WALLET TOPUP", "GAMING", "DREAM11", "MPL",
+    ],
+}
+
+def _normalize_table() -> bytes:
+    # Letters -> uppercase, digits -> "#", "&" kept, everything else -> space.
+    table = bytearray(b" " * 256)
+    for byte in range(256):
+        char = chr(byte)
+        if "0" <= char <= "9":
+            table[byte] = ord("#")
+        elif "A" <= char <= "Z" or char in "#&":
+            table[byte] = byte
+        elif "a" <= char <= "z":
+            table[byte] = ord(char.upper())
+    return bytes(table)
+
+_NORMALIZE_TABLE = _normalize_table()
+
+def _translate(narration) -> bytes:
+    return str(narration).encode("ascii", "replace").translate(_NORMALIZE_TABLE)
+
+def normalize(narration: str) -> str:
+    """
+    Uppercase, mask digits and turn separators into single spaces, so
+    narrations differing only by reference numbers share one cache entry.
+    """
+    return " ".join(_translate(narration).decode().split())
+
+class NarrationClassifier:
+    """
+    Rule-plus-dictionary classifier mapping bank narrations to spending categories.
+
+    Every keyword is compiled into one alternation regex, longest keywords
+    first, so a narration is scanned once whatever the size of the keyword
+    dictionary. Results are memoized by normalized narration, and batches are
+    classified once per distinct narration.
+    """
+    def __init__(self, keywords: dict | None = None, categories: tuple = CATEGORIES, cache_size: int = 1 << 16):
+        """
+        Args:
+            keywords (dict | None): Category -> keywords, defaults to CATEGORY_KEYWORDS.
+            categories (tuple): Categories in priority order.
+            cache_size (int): Number of normalized narrations to memoize.
+        """
+        keywords = CATEGORY_KEYWORDS if keywords is None else keywords
+        self.categories = tuple(categories)
+        # Codes index into `labels`; the last code is OTHER.
+        self.labels = self.categories + (OTHER,)
+        self.other_code = len(self.categories)
+
+        self._keyword_code = {}
+        for code, category in enumerate(self.categories):
+            for keyword in keywords.get(category, []):
+                self._keyword_code.setdefault(normalize(keyword), code)
+        alternation = "|".join(
+            re.escape(keyword) for keyword in sorted(self._keyword_code, key=len, reverse=True)
+        )
+        self.pattern = re.compile(rf"(?<![A-Z#])(?:{alternation})(?![A-Z#])") if alternation else None
+        self._classify_normalized = lru_cache(maxsize=cache_size)(self._match)
+
+    def _match(self, normalized: str) -> int:
+        if self.pattern is None:
+            return self.other_code
+        codes = [self._keyword_code[match] for match in self.pattern.findall(normalized)]
+        return min(codes) if codes else self.other_code
+
+    def classify_code(self, narration: str) -> int:
+        return self._classify_normalized(normalize(narration))
+
+    def classify(self, narration: str) -> str:
+        """
+        Return the category of a single narration.
+        """
+        return self.labels[self.classify_code(narration)]
+
+    def classify_codes(self, narrations) -> np.ndarray:
+        """
+        Classify a whole column of narrations.
+        Args:
+            narrations: Any array-like of narrations (list, ndarray, Series, Categorical).
+        Returns:
+            np.ndarray: int8 category codes, indexes into `labels`.
+        """
+        if isinstance(narrations, pd.Categorical):
+            codes, uniques = narrations.codes, narrations.categories
+        else:
+            codes, uniques = pd.factorize(np.asarray(narrations, dtype=object))
+        if not len(uniques):
+            return np.full(len(codes), self.other_code, dtype=np.int8)
+        # Distinct narrations are translated with a byte table (cheap), the
+        # translated forms deduplicated again, and only those are normalized
+        # and classified.
+        translated_codes, translated = pd.factorize(np.array([_translate(text) for text in uniques], dtype=object))
+        translated_labels = np.fromiter(
+            (self._classify_normalized(" ".join(text.decode().split())) for text in translated),
+            dtype=np.int8, count=len(translated),
+        )
+        labels = translated_labels[translated_codes]
+        return np.where(codes >= 0, labels[codes], self.other_code).astype(np.int8)
+
+    def classify_many(self, narrations) -> pd.Categorical:
+        """
+        Like `classify_codes`, returning a categorical of category names.
+        """
+        return pd.Categorical.from_codes(self.classify_codes(narrations), categories=list(self.labels))
+
+    def cache_info(self):
+        return self._classify_normalized.cache_info()
+
+classifier = NarrationClassifier()
@@ -0,0 +1,308 @@
+import hashlib
+import math
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from backend.tool_cache import tool_cache
+
+# Minimum TF-IDF cosine similarity for two prompts to share an answer.
+SIMILARITY_THRESHOLD = 0.85
+# Letters of content words a prompt needs to be cached or matched at all;
+# "why" or "ok" says nothing without the conversation before it.
+MIN_CONTENT_CHARS = 6
+# Seconds an answer may be served for; relative questions ("this weekend") drift with time.
+DEFAULT_TTL = 3600
+NGRAM = 3
+
+# Words that carry no meaning for matching. Questions are mostly "what is
+# my X" / "show me X", so only the X should decide similarity.
+STOPWORDS = frozenset(
+    "a an the i me my mine we our us you your it its is are was were be been am do does did done "
+    "what whats which who how hows why where when can could would should will shall might "
+    "please pls tell show give get see let lets know check find display list and or of to for in on "
+    "at by with from about as so any some much many there here that im ive currently current "
+    "now right just also really kindly want need like".split()
+)
+# Words that change the answer however similar the rest of the prompt is
+# ("this weekend" vs "last weekend"); prompts must agree on all of them.
+GUARD_WORDS = frozenset(
+    "this last next previous past today yesterday tomorrow day days week weeks weekend weekends "
+    "month months year years quarter quarters daily weekly monthly yearly annual annually "
+    "jan january feb february mar march apr april may jun june jul july aug august sep sept september "
+    "oct october nov november dec december not no without never top bottom best worst highest lowest "
+    "most least "
+    # Tense and intent: "what will my net worth be" is not "what's my net
+    # worth", and "which funds are doing badly" is not "how are my funds doing".
+    "will would could should shall might if future projected forecast expected predict "
+    "was were did had ago before after which badly poorly well good bad better worse "
+    "gain gains gaining loss losses losing underperforming overperforming".split()
+)
+# Words that refer back to an earlier turn ("why", "what about that one");
+# the answer depends on the conversation, so such prompts are never cached.
+CONTEXT_WORDS = frozenset(
+    "why that it its they them their those these he she him her one ones other others else "
+    "again instead same above earlier more also then ok okay yes".split()
+)
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    Lowercase, drop apostrophes and punctuation and collapse whitespace, so
+    "What's my net worth?" and "whats my  net worth" share one key.
+    """
+    return " ".join(_WORD_PATTERN.findall(prompt.lower().replace("'", "").replace("’", "")))
+
+def prompt_terms(normalized: str) -> tuple:
+    """
+    Split a normalized prompt into matching terms.
+    Returns:
+        tuple: (Counter of terms, frozenset of guard words). Terms are the
+        content words (plural "s" stripped) plus character n-grams of their
+        concatenation, so "networth" still matches "net worth".
+    """
+    words = normalized.split()
+    content = [word for word in words if word not in STOPWORDS] or words
+    content = [word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word for word in content]
+    joined = "".join(content)
+    terms = Counter(content)
+    terms.update("~" + joined[i:i + NGRAM] for i in range(len(joined) - NGRAM + 1))
+    guards = frozenset(word for word in words if word in GUARD_WORDS or word.isdigit())
+    return terms, guards
+
+def cacheable(normalized: str) -> bool:
+    """
+    Whether a normalized prompt stands on its own: it has enough content
+    words and does not refer back to the conversation.
+    """
+    words = normalized.split()
+    if any(word in CONTEXT_WORDS for word in words):
+        return False
+    return sum(len(word) for word in words if word not in STOPWORDS) >= MIN_CONTENT_CHARS
+
+def data_fingerprint(versions: dict) -> str:
+    return hashlib.blake2b(
+        "\n".join(f"{tool}={version}" for tool, version in sorted(versions.items())).encode(),
+        digest_size=8,
+    ).hexdigest()
+
+class _Entry:
+    __slots__ = ("prompt", "terms", "guards", "tools", "fingerprint", "answer", "expires_at")
+
+    def __init__(self, prompt: str, terms: Counter, guards: frozenset, tools: tuple, fingerprint: str, answer: str, expires_at: float):
+        self.prompt = prompt
+        self.terms = terms
+        self.guards = guards
+        self.tools = tools
+        self.fingerprint = fingerprint
+        self.answer = answer
+        self.expires_at = expires_at
+
+class ResponseCache:
+    """
+    Per-user cache of chat answers that were grounded on MCP tool results.
+
+    An answer is stored with the tools it was computed from and a
+    fingerprint of their data versions (the content digests kept by
+    `tool_cache`). A new prompt is looked up by its normalized text, then by
+    TF-IDF cosine similarity against the user's cached prompts, so near
+    duplicates ("What's my net worth?" / "what is my networth") share one
+    answer. Before a candidate is served its tools are refreshed by the
+    caller and the fingerprint recomputed; if any tool result changed, the
+    entry is dropped.
+    """
+    def __init__(
+        self,
+        tool_results=tool_cache,
+        threshold: float = SIMILARITY_THRESHOLD,
+        ttl: float = DEFAULT_TTL,
+        max_entries_per_user: int = 64,
+        clock=time.monotonic,
+    ):
+        """
+        Args:
+            tool_results: The ToolResultCache the answers' tool results live in.
+            threshold (float): Minimum cosine similarity for a near-duplicate hit.
+            ttl (float): Seconds an answer may be served for.
+            max_entries_per_user (int): Cached answers per user; least recently used are evicted.
+            clock: Monotonic clock, overridable for tests and benchmarks.
+        """
+        self.tool_results = tool_results
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries_per_user = max_entries_per_user
+        self.clock = clock
+        self._users: dict = {}
+        # Document frequencies of terms across every cached prompt, for IDF.
+        self._df: Counter = Counter()
+        self._docs = 0
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def fingerprint(self, session_id: str, tools) -> str | None:
+        """
+        Fingerprint of the current data versions of `tools`, or None if any
+        of them has no fresh cached result.
+        """
+        versions = {}
+        for tool in set(tools):
+            version = self.tool_results.version(session_id, tool)
+            if version is None:
+                return None
+            versions[tool] = version
+        return data_fingerprint(versions)
+
+    def _idf(self, term: str) -> float:
+        return math.log((1 + self._docs) / (1 + self._df[term])) + 1
+
+    def _vector(self, terms: Counter) -> tuple:
+        weights = {term: count * self._idf(term) for term, count in terms.items()}
+        return weights, math.sqrt(sum(w * w for w in weights.values())) or 1.0
+
+    def _similarity(self, query: tuple, terms: Counter) -> float:
+        weights, norm = query
+        other, other_norm = self._vector(terms)
+        return sum(w * other[t] for t, w in weights.items() if t in other) / (norm * other_norm)
+
+    def match(self, user_id, prompt: str):
+        """
+        Find the cached answer closest to `prompt`, without validating it.
+        Args:
+            user_id: The user the answer was cached for.
+            prompt (str): The user's message.
+        Returns:
+            The matching entry, or None. Pass it to `resolve` after refreshing `entry.tools`.
+        """
+        normalized = normalize_prompt(prompt)
+        if not cacheable(normalized):
+            return None
+        now = self.clock()
+        with self._lock:
+            entries = self._users.get(str(user_id))
+            if not entries:
+                return None
+            entry = entries.get(normalized)
+            if entry is not None and entry.expires_at > now:
+                return entry
+            terms, guards = prompt_terms(normalized)
+            query = self._vector(terms)
+            best, best_score = None, self.threshold
+            for candidate in entries.values():
+                if candidate.guards != guards or candidate.expires_at <= now:
+                    continue
+                score = self._similarity(query, candidate.terms)
+                if score >= best_score:
+                    best, best_score = candidate, score
+            return best
+
+    def resolve(self, user_id, session_id: str, prompt: str, entry) -> str | None:
+        """
+        Serve `entry` if its tool results are unchanged, and count the lookup.
+        The caller refreshes `entry.tools` (through `tool_cache`) first.
+        Returns:
+            str | None: The cached answer, or None on a miss.
+        """
+        if entry is not None and entry.fingerprint != self.fingerprint(session_id, entry.tools):
+            self._remove(str(user_id), entry)
+            with self._lock:
+                self.invalidations += 1
+            entry = None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.prompt == normalize_prompt(prompt):
+                self.exact_hits += 1
+            else:
+                self.similar_hits += 1
+            self._users[str(user_id)].move_to_end(entry.prompt)
+            return entry.answer
+
+    def get(self, user_id, session_id: str, prompt: str, refresh=None) -> str | None:
+        """
+        `match` and `resolve` in one call.
+        Args:
+            refresh: Callable (tool_names, session_id) fetching the entry's
+                tools through `tool_cache`, e.g. `call_tools_parallel`.
+        """
+        entry = self.match(user_id, prompt)
+        if entry is not None and refresh is not None:
+            refresh(list(entry.tools), session_id)
+        return self.resolve(user_id, session_id, prompt, entry)
+
+    def put(self, user_id, session_id: str, prompt: str, tools, answer: str) -> bool:
+        """
+        Cache an answer computed from the current results of `tools`.
+        Returns:
+            bool: Whether it was stored. Answers that used no tools, or a tool
+            whose result is not cached (e.g. an error), are not, and neither
+            are answers to prompts that are not `cacheable`.
+        """
+        tools = tuple(sorted(set(tools)))
+        normalized = normalize_prompt(prompt)
+        if not tools or not answer or not cacheable(normalized):
+            return False
+        fingerprint = self.fingerprint(session_id, tools)
+        if fingerprint is None:
+            return False
+        terms, guards = prompt_terms(normalized)
+        entry = _Entry(normalized, terms, guards, tools, fingerprint, answer, self.clock() + self.ttl)
+        user_id = str(user_id)
+        with self._lock:
+            entries = self._users.setdefault(user_id, OrderedDict())
+            old = entries.pop(normalized, None)
+            if old is not None:
+                self._forget_terms(old)
+            entries[normalized] = entry
+            self._df.update(terms.keys())
+            self._docs += 1
+            while len(entries) > self.max_entries_per_user:
+                _, evicted = entries.popitem(last=False)
+                self._forget_terms(evicted)
+        return True
+
+    def _forget_terms(self, entry: _Entry):
+        self._df.subtract(entry.terms.keys())
+        self._docs -= 1
+
+    def _remove(self, user_id: str, entry: _Entry):
+        with self._lock:
+            entries = self._users.get(user_id)
+            if entries is not None and entries.get(entry.prompt) is entry:
+                del entries[entry.prompt]
+                self._forget_terms(entry)
+
+    def invalidate(self, user_id=None) -> int:
+        """
+        Drop cached answers of one user, or of every user when `user_id` is None.
+        Returns:
+            int: The number of entries removed.
+        """
+        with self._lock:
+            user_ids = [str(user_id)] if user_id is not None else list(self._users)
+            removed = 0
+            for uid in user_ids:
+                for entry in self._users.pop(uid, {}).values():
+                    self._forget_terms(entry)
+                    removed += 1
+            self._df = +self._df
+        return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = self.exact_hits + self.similar_hits
+            lookups = hits + self.misses
+            return {
+                "hits": hits,
+                "exact_hits": self.exact_hits,
+                "similar_hits": self.similar_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "entries": self._docs,
+            }
+
+response_cache = ResponseCache()
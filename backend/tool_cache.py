@@ -0,0 +1,178 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+# Seconds a tool result stays fresh. Tools not listed here (e.g. whoami) are never cached.
+DEFAULT_TOOL_TTLS = {
+    "fetch_net_worth": 300,
+    "fetch_credit_report": 3600,
+    "fetch_epf_details": 3600,
+    "fetch_mf_transactions": 900,
+    "fetch_bank_transactions": 300,
+    "fetch_stock_transactions": 900,
+}
+
+ERROR_PREFIXES = ("❌", "⚠️")
+
+def result_digest(result: str) -> str:
+    """
+    Short content hash of a tool result, used as its data version.
+    """
+    return hashlib.blake2b(result.encode(), digest_size=8).hexdigest()
+
+class ToolResultCache:
+    """
+    Per-session TTL + LRU cache for MCP tool results.
+
+    Entries are keyed by (session_id, tool_name, arguments). The cache is
+    bounded both by entry count and by the total size of the cached text;
+    the least recently used entries are evicted first.
+    """
+    def __init__(
+        self,
+        ttls: dict | None = None,
+        max_entries: int = 4096,
+        max_bytes: int = 64 * 1024 * 1024,
+        clock=time.monotonic,
+    ):
+        """
+        Args:
+            ttls (dict | None): Per-tool TTLs in seconds, defaults to DEFAULT_TOOL_TTLS.
+            max_entries (int): Maximum number of cached results.
+            max_bytes (int): Maximum total size of cached results.
+            clock: Monotonic clock, overridable for tests and benchmarks.
+        """
+        self.ttls = dict(DEFAULT_TOOL_TTLS if ttls is None else ttls)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._entries: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(session_id: str, tool_name: str, arguments: dict | None = None) -> tuple:
+        return (session_id, tool_name, json.dumps(arguments or {}, sort_keys=True))
+
+    @staticmethod
+    def is_cacheable(result) -> bool:
+        """
+        Error strings and login prompts must never be served from the cache.
+        """
+        if not isinstance(result, str) or not result:
+            return False
+        if result.startswith(ERROR_PREFIXES):
+            return False
+        return '"login_required"' not in result[:64]
+
+    def _lookup(self, session_id: str, tool_name: str, arguments: dict | None):
+        if tool_name not in self.ttls:
+            return None
+        key = self.make_key(session_id, tool_name, arguments)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= self.clock():
+                self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def get(self, session_id: str, tool_name: str, arguments: dict | None = None):
+        """
+        Return the cached result text, or None on a miss or an expired entry.
+        """
+        entry = self._lookup(session_id, tool_name, arguments)
+        return entry[1] if entry else None
+
+    def get_response(self, session_id: str, tool_name: str, arguments: dict | None = None):
+        """
+        Like `get`, returning the result as it was put: the decoded response
+        object when `mcp_client` stored one, so it is not decoded again.
+        """
+        entry = self._lookup(session_id, tool_name, arguments)
+        return entry[3] if entry else None
+
+    def put(self, session_id: str, tool_name: str, arguments: dict | None, result) -> bool:
+        """
+        Cache a result if the tool has a TTL and the result is not an error.
+        Args:
+            result: The result text, or a decoded response with a `text` attribute.
+        Returns:
+            bool: Whether the result was stored.
+        """
+        response, result = result, getattr(result, "text", result)
+        ttl = self.ttls.get(tool_name)
+        if not ttl or not self.is_cacheable(result):
+            return False
+        size = len(result)
+        if size > self.max_bytes:
+            return False
+        key = self.make_key(session_id, tool_name, arguments)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (self.clock() + ttl, result, result_digest(result), response)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+        return True
+
+    def version(self, session_id: str, tool_name: str, arguments: dict | None = None) -> str | None:
+        """
+        Return the data version (content digest) of a fresh cached result,
+        or None if it is not cached. Does not count as a hit or a miss.
+        """
+        key = self.make_key(session_id, tool_name, arguments)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self.clock():
+                return None
+            return entry[2]
+
+    def _drop(self, key: tuple):
+        result = self._entries.pop(key)[1]
+        self._bytes -= len(result)
+
+    def invalidate(self, session_id: str | None = None, tool_name: str | None = None) -> int:
+        """
+        Drop cached results, e.g. when a session logs in again.
+        Args:
+            session_id (str | None): Only drop this session's results; None drops every session.
+            tool_name (str | None): Only drop this tool's results.
+        Returns:
+            int: The number of entries removed.
+        """
+        with self._lock:
+            keys = [
+                key for key in self._entries
+                if (session_id is None or key[0] == session_id)
+                and (tool_name is None or key[1] == tool_name)
+            ]
+            for key in keys:
+                self._drop(key)
+        return len(keys)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+tool_cache = ToolResultCache()
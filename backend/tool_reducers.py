@@ -0,0 +1,294 @@
+import json
+import logging
+import os
+import threading
+from backend.mcp_responses import ToolResult
+from backend.tool_cache import ERROR_PREFIXES
+
+logger = logging.getLogger(__name__)
+
+# Tools whose results are sent to Gemini unreduced, e.g. FIFI_RAW_TOOLS=fetch_credit_report,fetch_epf_details
+RAW_TOOLS_ENV = "FIFI_RAW_TOOLS"
+
+BANK_TXN_COLUMNS = ["amount", "narration", "date", "type", "mode", "balance"]
+BANK_TXN_TYPES = {1: "CREDIT", 2: "DEBIT", 3: "OPENING", 4: "INTEREST", 5: "TDS", 6: "INSTALLMENT", 7: "CLOSING", 8: "OTHERS"}
+MF_TXN_COLUMNS = ["order", "date", "price", "units", "amount"]
+MF_ORDER_TYPES = {1: "BUY", 2: "SELL"}
+STOCK_TXN_COLUMNS = ["type", "date", "quantity", "nav"]
+STOCK_TXN_TYPES = {1: "BUY", 2: "SELL", 3: "BONUS", 4: "SPLIT"}
+
+def _number(value):
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return value
+
+def _is_money(value) -> bool:
+    return isinstance(value, dict) and "units" in value and set(value) <= {"currencyCode", "units", "nanos"}
+
+def _amount(value):
+    """
+    {"currencyCode": "INR", "units": "1650", "nanos": 500000000} -> 1650.5.
+    Non-INR amounts keep their currency, e.g. "210 USD".
+    """
+    amount = _number(value.get("units", 0))
+    if value.get("nanos"):
+        amount = round(amount + value["nanos"] / 1e9, 2)
+    currency = value.get("currencyCode", "INR")
+    return amount if currency == "INR" else f"{amount} {currency}"
+
+def compact(value):
+    """
+    Generic reduction: collapse money wrappers into amounts and drop empty values.
+    """
+    if _is_money(value):
+        return _amount(value)
+    if isinstance(value, dict):
+        out = {}
+        for key, item in value.items():
+            item = compact(item)
+            if item not in ({}, [], "", None):
+                out[key] = item
+        return out
+    if isinstance(value, list):
+        return [compact(item) for item in value]
+    return value
+
+def _flatten(record: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            flat[prefix + key] = value
+    return flat
+
+def table(records: list) -> dict:
+    """
+    Turn a list of similar dicts into {"columns": [...], "rows": [[...], ...]}
+    so the keys are sent once instead of once per record.
+    """
+    flat = [_flatten(record) for record in records]
+    columns = list(dict.fromkeys(key for record in flat for key in record))
+    return {"columns": columns, "rows": [[record.get(key) for key in columns] for record in flat]}
+
+def _strip_prefix(name: str) -> str:
+    for prefix in ("ASSET_TYPE_", "LIABILITY_TYPE_", "ACC_INSTRUMENT_TYPE_"):
+        if name.startswith(prefix):
+            return name[len(prefix):]
+    return name
+
+def reduce_net_worth(payload: dict) -> dict:
+    """
+    Net worth as flat attribute -> amount tables, plus one row per MF scheme,
+    account and holding.
+    """
+    response = payload["netWorthResponse"]
+    out = {"currency": "INR", "net_worth": _amount(response["totalNetWorthValue"])}
+    assets, liabilities = {}, {}
+    for item in response.get("assetValues", []) + response.get("liabilityValues", []):
+        attribute = item["netWorthAttribute"]
+        target = liabilities if attribute.startswith("LIABILITY_") else assets
+        target[_strip_prefix(attribute)] = _amount(item["value"])
+    out["assets"] = assets
+    if liabilities:
+        out["liabilities"] = liabilities
+
+    schemes = []
+    for scheme in payload.get("mfSchemeAnalytics", {}).get("schemeAnalytics", []):
+        detail = scheme.get("schemeDetail", {})
+        analytics = scheme.get("enrichedAnalytics", {}).get("analytics", {}).get("schemeDetails", {})
+        schemes.append({
+            "name": detail.get("nameData", {}).get("longName"),
+            "isin": detail.get("isinNumber"),
+            "amc": detail.get("amc"),
+            "category": detail.get("categoryName"),
+            "asset_class": detail.get("assetClass"),
+            "plan": detail.get("planType"),
+            "option": detail.get("optionType"),
+            "nav": compact(detail.get("nav")),
+            "units": analytics.get("units"),
+            "invested": compact(analytics.get("investedValue")),
+            "current": compact(analytics.get("currentValue")),
+            "returns": compact(analytics.get("unrealisedReturns")),
+            "xirr": analytics.get("XIRR"),
+        })
+    if schemes:
+        out["mf_schemes"] = table(schemes)
+
+    accounts, holdings = [], []
+    for account_id, account in payload.get("accountDetailsBulkResponse", {}).get("accountDetailsMap", {}).items():
+        details = account.get("accountDetails", {})
+        instrument = _strip_prefix(details.get("accInstrumentType", ""))
+        row = {"id": account_id, "type": instrument, "fip": details.get("fipId"), "account": details.get("maskedAccountNumber")}
+        for key, summary in account.items():
+            if key == "accountDetails" or not isinstance(summary, dict):
+                continue
+            for field, value in summary.items():
+                if field == "holdingsInfo":
+                    holdings += [{"account": account_id, **_flatten(compact(holding))} for holding in value]
+                else:
+                    row[field] = compact(value)
+        accounts.append(row)
+    if accounts:
+        out["accounts"] = table(accounts)
+    if holdings:
+        out["holdings"] = table(holdings)
+    return out
+
+def reduce_bank_transactions(payload: dict) -> dict:
+    """
+    Bank transactions with the column header and type legend sent once.
+    """
+    banks = {}
+    for bank in payload["bankTransactions"]:
+        rows = banks.setdefault(bank.get("bank", "unknown"), [])
+        for txn in bank.get("txns", []):
+            txn = list(txn)
+            txn[0] = _number(txn[0])
+            if len(txn) > 5:
+                txn[5] = _number(txn[5])
+            rows.append(txn)
+    return {"columns": BANK_TXN_COLUMNS, "types": BANK_TXN_TYPES, "banks": banks}
+
+def reduce_mf_transactions(payload: dict) -> dict:
+    schemes = [
+        {
+            "isin": scheme.get("isin"),
+            "name": scheme.get("schemeName"),
+            "folio": scheme.get("folioId"),
+            "txns": scheme.get("txns", []),
+        }
+        for scheme in payload["mfTransactions"]
+    ]
+    return {"columns": MF_TXN_COLUMNS, "orders": MF_ORDER_TYPES, "schemes": schemes}
+
+def reduce_stock_transactions(payload: dict) -> dict:
+    stocks = {}
+    for stock in payload["stockTransactions"]:
+        stocks.setdefault(stock.get("isin"), []).extend(stock.get("txns", []))
+    return {"columns": STOCK_TXN_COLUMNS, "types": STOCK_TXN_TYPES, "note": "nav may be missing", "stocks": stocks}
+
+def reduce_credit_report(payload: dict) -> dict:
+    reports = []
+    for report in payload["creditReports"]:
+        data = compact(report.get("creditReportData", {}))
+        accounts = data.get("creditAccount", {}).pop("creditAccountDetails", [])
+        reduced = {"vendor": report.get("vendor"), **data}
+        if accounts:
+            reduced["accounts"] = table(accounts)
+        reports.append(reduced)
+    return {"reports": reports}
+
+def reduce_epf_details(payload: dict) -> dict:
+    accounts = []
+    for account in payload["uanAccounts"]:
+        details = compact(account.get("rawDetails", {}))
+        establishments = details.pop("est_details", [])
+        if establishments:
+            details["establishments"] = table(establishments)
+        accounts.append(details)
+    return {"uan_accounts": accounts}
+
+DEFAULT_REDUCERS = {
+    "fetch_net_worth": reduce_net_worth,
+    "fetch_bank_transactions": reduce_bank_transactions,
+    "fetch_mf_transactions": reduce_mf_transactions,
+    "fetch_stock_transactions": reduce_stock_transactions,
+    "fetch_credit_report": reduce_credit_report,
+    "fetch_epf_details": reduce_epf_details,
+}
+
+class ToolResultReducer:
+    """
+    Rewrites MCP tool results into a compact canonical JSON form before they
+    are sent back to Gemini, and keeps per-tool byte and token savings.
+
+    Error strings, login prompts, non-JSON output and tools without a reducer
+    pass through unchanged. If a tool's reducer does not recognise a payload,
+    the generic `compact` reduction is used instead.
+    """
+    def __init__(self, reducers: dict | None = None, disabled=()):
+        """
+        Args:
+            reducers (dict | None): Tool name -> reducer, defaults to DEFAULT_REDUCERS.
+            disabled: Tool names whose results are passed through unreduced.
+        """
+        self.reducers = dict(DEFAULT_REDUCERS if reducers is None else reducers)
+        self.disabled = {name for name in disabled if name}
+        self._stats: dict = {}
+        self._lock = threading.Lock()
+
+    def enable(self, tool_name: str):
+        self.disabled.discard(tool_name)
+
+    def disable(self, tool_name: str):
+        self.disabled.add(tool_name)
+
+    def reduce(self, tool_name: str, result) -> str:
+        """
+        Return the compact form of a tool result, or the result text itself if it is not reducible.
+        Args:
+            tool_name (str): The tool that produced the result.
+            result (str | ToolResult): The raw tool output, or its decoded form
+                from `mcp_client`, which is not decoded again.
+        """
+        if isinstance(result, ToolResult):
+            result, payload = result.text, result.data
+        else:
+            payload = None
+        reducer = self.reducers.get(tool_name)
+        if reducer is None or tool_name in self.disabled:
+            return result
+        if not isinstance(result, str) or result.startswith(ERROR_PREFIXES):
+            return result
+        if payload is None:
+            try:
+                payload = json.loads(result)
+            except ValueError:
+                return result
+        if not isinstance(payload, dict) or payload.get("status") == "login_required":
+            return result
+
+        try:
+            reduced = reducer(payload)
+        except (KeyError, TypeError, AttributeError, IndexError):
+            reduced = compact(payload)
+        text = json.dumps(reduced, ensure_ascii=False, separators=(",", ":"))
+        if len(text) >= len(result):
+            return result
+        self._record(tool_name, result, text)
+        return text
+
+    def _record(self, tool_name: str, raw: str, reduced: str):
+        raw_bytes = len(raw.encode())
+        reduced_bytes = len(reduced.encode())
+        with self._lock:
+            stats = self._stats.setdefault(tool_name, {"calls": 0, "raw_bytes": 0, "reduced_bytes": 0})
+            stats["calls"] += 1
+            stats["raw_bytes"] += raw_bytes
+            stats["reduced_bytes"] += reduced_bytes
+        logger.debug("%s reduced %d -> %d bytes", tool_name, raw_bytes, reduced_bytes)
+
+    def stats(self) -> dict:
+        """
+        Per-tool savings. Tokens are estimated at ~4 bytes per token.
+        """
+        with self._lock:
+            out = {}
+            for tool_name, stats in self._stats.items():
+                saved = stats["raw_bytes"] - stats["reduced_bytes"]
+                out[tool_name] = {
+                    **stats,
+                    "saved_bytes": saved,
+                    "saved_tokens": saved // 4,
+                    "ratio": stats["reduced_bytes"] / stats["raw_bytes"] if stats["raw_bytes"] else 1.0,
+                }
+            return out
+
+tool_reducer = ToolResultReducer(disabled=os.getenv(RAW_TOOLS_ENV, "").split(","))
@@ -1,57 +1,89 @@
-from backend.mcp_client import list_tools, call_tool
-from google.generativeai.types import content_types
-from pathlib import Path
+from backend.tool_cache import tool_cache
+from backend.tool_reducers import tool_reducer
+from backend.response_cache import response_cache
+from backend.agent_config import agent_config
+from backend.genai_client import get_client
+from backend.mcp_client import call_tool_response, async_call_tool_response, call_tools_many
+from backend.mcp_responses import LoginRequired, ToolError
+import asyncio
 import json
-import os
-from google import genai
-from google.genai.types import Tool
+import logging
+import time
 from backend import firestore_client
+from backend.history_manager import HistoryManager
 
-with open("gemini_api.txt", "r") as fin:
-    api_key = fin.read().strip()
-
-client = genai.Client(api_key=api_key)
-    
-agent_behavior = open("backend/context_store/behavior.txt", "r").read()
+logger = logging.getLogger(__name__)
 
 class agent:
     def __init__(self, session_id: str):
         self.session_id = session_id
-        dummy_call = call_tool("whoami", self.session_id)
-        res_dict: dict = eval(dummy_call)
+        # A (re-)login may point the session at different data; drop its cached tool results.
+        tool_cache.invalidate(self.session_id)
+        whoami = call_tool_response("whoami", self.session_id)
+        if isinstance(whoami, ToolError):
+            raise RuntimeError(whoami.text)
         self.phone_number = 1414141414
-        if res_dict.get("status") == "login_required":
-            login_url = res_dict["login_url"]
+        if isinstance(whoami, LoginRequired):
+            login_url = whoami.login_url
             msg = {"text": f"Please open the following login URL in your browser: {login_url}"}
             print(msg["text"])
         else:
-            self.phone_number = res_dict.get("phoneNumber")
+            self.phone_number = whoami.phone_number
             msg = {"text": f"user: {self.phone_number} already logged in."}
             print(self.phone_number)
         self.fs_client = firestore_client.Client(self.phone_number)
-        self.chat = client.chats.create(
+        self.history = HistoryManager(self.fs_client.history, self.fs_client.load().get("chat_summary"))
+        history = self.history.build()
+        # The Gemini SDK is loaded with the first agent, not at import.
+        from google.genai import types
+        self.chat = get_client().aio.chats.create(
                     model="gemini-2.0-flash",
-                    config=genai.types.GenerateContentConfig(
+                    config=types.GenerateContentConfig(
                     temperature=0,
-                    tools=[Tool(function_declarations=list_tools(session_id)),],
-                    system_instruction=self.get_updated_behavior(self.fs_client),
+                    tools=[agent_config.tool(session_id)],
+                    system_instruction=self.get_updated_behavior(self.fs_client, self.history.summary_text),
                     ),
-                    history=self.fs_client.get_chat_history(),
+                    history=history,
                 )
         self.login_status = msg 
+        # Serializes this chat's turns; different sessions run concurrently.
+        self.lock = asyncio.Lock()
 
     @staticmethod
-    def get_updated_behavior(fs_client: firestore_client.Client) -> str:
-        with open("backend/context_store/behavior.txt", "r") as fin:
-            fifi_behavior =  fin.read().strip()
+    def get_updated_behavior(fs_client: firestore_client.Client, summary: str = "") -> str:
+        fifi_behavior = agent_config.behavior().strip()
         context = "This is the updated context about user: " + str(fs_client.get_chat_context())
+        if summary:
+            context += "\nSummary of the earlier conversation with the user:\n" + summary
         return fifi_behavior + "\n" + context
-    def call_gemini(self, prompt: str) -> str:
 
-        response = self.chat.send_message(prompt)
+    async def cached_reply(self, prompt: str) -> str | None:
+        """
+        Return the cached answer to `prompt` if the data it was computed from
+        is unchanged, recording the turn in the chat history.
+        """
+        entry = response_cache.match(self.phone_number, prompt)
+        if entry is not None:
+            # Refresh the entry's tool results so changed data invalidates it.
+            await call_tools_many(list(entry.tools), self.session_id)
+        reply = response_cache.resolve(self.phone_number, self.session_id, prompt, entry)
+        if reply is not None:
+            from google.genai import types
+            self.chat.record_history(types.UserContent(prompt), [types.ModelContent(reply)], True)
+            logger.info("turn served from response cache")
+        return reply
+
+    async def call_gemini(self, prompt: str) -> str:
+        cached = await self.cached_reply(prompt)
+        if cached is not None:
+            return cached
+
+        turn_start = time.perf_counter()
+        response = await self.chat.send_message(prompt)
+        llm_done = time.perf_counter()
 
         messages = response.candidates[0].content.parts
-        tool_outputs = []
+        tool_names = []
 
         for part in messages:
             if hasattr(part, "function_call") and part.function_call:
@@ -63,34 +95,114 @@ class agent:
 
                 print(f"Calling tool: {tool_name}")
 
-                result = call_tool(tool_name, self.session_id)
-                tool_outputs.append((tool_name, result))
+                tool_names.append(tool_name)
+
+        tool_outputs = list(zip(tool_names, await call_tools_many(tool_names, self.session_id)))
+        tools_done = time.perf_counter()
 
         if tool_outputs:
             followup = "\n\n".join(
-                f"Result of `{name}`:\n{output}" for name, output in tool_outputs
+                f"Result of `{name}`:\n{tool_reducer.reduce(name, output)}" for name, output in tool_outputs
             )
-            final_response = self.chat.send_message(followup)
-            return final_response.text
-                
-        return response.text
+            final_response = await self.chat.send_message(followup)
+            reply = final_response.text
+            response_cache.put(self.phone_number, self.session_id, prompt, tool_names, reply)
+        else:
+            reply = response.text
+
+        turn_done = time.perf_counter()
+        logger.info(
+            "turn timings: llm=%.3fs tools=%.3fs (%d calls) followup=%.3fs total=%.3fs",
+            llm_done - turn_start, tools_done - llm_done, len(tool_names),
+            turn_done - tools_done, turn_done - turn_start,
+        )
+        return reply
+
+    @staticmethod
+    def _stream_parts(chunk) -> list:
+        if not chunk.candidates or not chunk.candidates[0].content:
+            return []
+        return chunk.candidates[0].content.parts or []
+
+    async def stream_gemini(self, prompt: str):
+        """
+        Streaming counterpart of `call_gemini`.
+        Yields:
+            dict: {"type": "token", "text": ...} as Gemini produces text,
+            {"type": "tool", "name": ...} before MCP tools are called, and a
+            final {"type": "done", "text": <full reply>}.
+        """
+        cached = await self.cached_reply(prompt)
+        if cached is not None:
+            yield {"type": "token", "text": cached}
+            yield {"type": "done", "text": cached}
+            return
+
+        turn_start = time.perf_counter()
+        first_token = None
+        tool_names = []
+        text_parts = []
+
+        async for chunk in await self.chat.send_message_stream(prompt):
+            for part in self._stream_parts(chunk):
+                if part.function_call and part.function_call.name:
+                    tool_names.append(part.function_call.name)
+                elif part.text:
+                    first_token = first_token or time.perf_counter()
+                    text_parts.append(part.text)
+                    yield {"type": "token", "text": part.text}
+        llm_done = time.perf_counter()
+
+        if tool_names:
+            for tool_name in tool_names:
+                print(f"Calling tool: {tool_name}")
+                yield {"type": "tool", "name": tool_name}
+            tool_outputs = list(zip(tool_names, await call_tools_many(tool_names, self.session_id)))
+            tools_done = time.perf_counter()
+
+            followup = "\n\n".join(
+                f"Result of `{name}`:\n{tool_reducer.reduce(name, output)}" for name, output in tool_outputs
+            )
+            # The text before the tool call was already shown; the reply is
+            # both passes, as the user saw it.
+            async for chunk in await self.chat.send_message_stream(followup):
+                for part in self._stream_parts(chunk):
+                    if part.text:
+                        first_token = first_token or time.perf_counter()
+                        text_parts.append(part.text)
+                        yield {"type": "token", "text": part.text}
+            response_cache.put(self.phone_number, self.session_id, prompt, tool_names, "".join(text_parts))
+        else:
+            tools_done = llm_done
+
+        turn_done = time.perf_counter()
+        logger.info(
+            "turn timings: first_token=%.3fs llm=%.3fs tools=%.3fs (%d calls) followup=%.3fs total=%.3fs",
+            (first_token or turn_done) - turn_start, llm_done - turn_start, tools_done - llm_done,
+            len(tool_names), turn_done - tools_done, turn_done - turn_start,
+        )
+        yield {"type": "done", "text": "".join(text_parts)}
 
-    def call_gemini_for_dashboard(self, dashboard: str) -> str:
-        response = self.chat.send_message(f"Generate data to fetch {dashboard} information and display it in a format that can be used in a streamlit dashboard.")
+    async def call_gemini_for_dashboard(self, dashboard: str) -> str:
+        response = await self.chat.send_message(f"Generate data to fetch {dashboard} information and display it in a format that can be used in a streamlit dashboard.")
 
         if response.candidates[0].content.parts[0].function_call:
             tool_call = response.candidates[0].content.parts[0].function_call
             tool_name = tool_call.name
 
-            tool_response = call_tool(tool_name, self.session_id)
+            tool_response = await async_call_tool_response(tool_name, self.session_id)
 
             # Continue conversation with tool output
-            final = self.chat.send_message(f"Here is the result of {tool_name}:\n{tool_response}")
+            final = await self.chat.send_message(f"Here is the result of {tool_name}:\n{tool_reducer.reduce(tool_name, tool_response)}")
             return final.text
 
         return response.text
     def update_fs(self):
         history = self.chat.get_history()
-        self.fs_client.store_chat_history([item.to_json_dict() for item in history])
         context = json.load(open("tmp/mock_ctx.json"))
-        self.fs_client.store_chat_context(context)
+        # Only the turns this agent has not persisted yet are written.
+        new_turns = self.history.new_turns(history)
+        self.fs_client.store_chat_state(
+            [item.to_json_dict() for item in new_turns], context, summary=self.history.summary
+        )
+        self.history.mark_persisted(new_turns)
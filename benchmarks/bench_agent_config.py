@@ -0,0 +1,100 @@
+"""
+Agents created per second, with and without the process-wide AgentConfig.
+
+Times the configuration part of agent construction (tool declarations,
+behavior prompt, GenerateContentConfig) for the FastAPI agent and the
+contextual agent. "before" lists the MCP tools for every agent, reads
+behavior.txt twice and rebuilds every declaration; "after" goes through an
+AgentConfig. MCP tools are the fi-mcp-dev tool list, served by a stub
+that sleeps `--list-latency` seconds per call like an HTTP round trip; no
+Gemini, MCP server or Firestore is involved.
+
+Run from the root of the repo:
+    python -m benchmarks.bench_agent_config
+"""
+import argparse
+import re
+import time
+from pathlib import Path
+from google import genai
+from google.genai.types import Tool
+from backend.agent_config import BEHAVIOR_FILE, AgentConfig, create_function_declaration
+from backend.analytics_tools import AnalyticsTools
+
+TOOL_INFO = Path("utils/fi-mcp-dev/pkg/tool_info.go")
+
+def mcp_tool_list() -> list:
+    text = TOOL_INFO.read_text()
+    tools = [{"name": "whoami", "description": "Get current authenticated user information"}]
+    tools += [
+        {"name": name, "description": description}
+        for name, description in re.findall(r'Name:\s*"([^"]+)",\s*Description:\s*"([^"]+)"', text)
+    ]
+    return tools
+
+def send_notification(message: str):
+    """
+    Send a notification to the user.
+    """
+
+def update_context(user_id: str, updates: dict):
+    """
+    Update the context with new data.
+    """
+
+def make_config(tools: list, behavior: str) -> genai.types.GenerateContentConfig:
+    return genai.types.GenerateContentConfig(
+        temperature=0,
+        tools=tools,
+        system_instruction=behavior + "\nThis is the updated context about user: {}",
+    )
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--agents", type=int, default=500)
+    parser.add_argument("--list-latency", type=float, default=0.005)
+    args = parser.parse_args()
+    tool_list = mcp_tool_list()
+
+    def list_tools(session_id: str) -> list:
+        time.sleep(args.list_latency)
+        return [dict(tool) for tool in tool_list]
+
+    def before_fastapi(session_id: str):
+        open(BEHAVIOR_FILE, "r").read()
+        with open(BEHAVIOR_FILE, "r") as fin:
+            behavior = fin.read().strip()
+        return make_config([Tool(function_declarations=list_tools(session_id))], behavior)
+
+    def before_contextual(session_id: str):
+        open(BEHAVIOR_FILE, "r").read()
+        behavior = open(BEHAVIOR_FILE, "r").read()
+        analytics = AnalyticsTools(session_id)
+        local = [create_function_declaration(send_notification), create_function_declaration(update_context)]
+        local += [create_function_declaration(tool) for tool in analytics.declarations()]
+        return make_config([Tool(function_declarations=list_tools(session_id) + local)], behavior)
+
+    config = AgentConfig(fetch_tools=list_tools)
+
+    def after_fastapi(session_id: str):
+        return make_config([config.tool(session_id)], config.behavior().strip())
+
+    def after_contextual(session_id: str):
+        analytics = AnalyticsTools(session_id)
+        local = [send_notification, update_context] + analytics.declarations()
+        return make_config([config.tool(session_id, local)], config.behavior())
+
+    print(f"{len(tool_list)} MCP tools, list_tools latency {args.list_latency * 1000:.1f} ms")
+    print(f"{'agent':12s} {'before/s':>10s} {'after/s':>10s} {'speedup':>8s}")
+    for name, before, after in (("fastapi", before_fastapi, after_fastapi), ("contextual", before_contextual, after_contextual)):
+        rates = []
+        for setup in (before, after):
+            start = time.perf_counter()
+            for i in range(args.agents):
+                setup(f"mcp-session-{i}")
+            rates.append(args.agents / (time.perf_counter() - start))
+        print(f"{name:12s} {rates[0]:10.0f} {rates[1]:10.0f} {rates[1] / rates[0]:7.1f}x")
+    print(f"after: {config.stats()}")
+
+if __name__ == "__main__":
+    main()
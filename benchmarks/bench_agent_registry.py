@@ -0,0 +1,94 @@
+"""
+Load test for the multi-session AgentRegistry used by the FastAPI backend.
+
+Reports memory per live session and message throughput with many concurrent
+users, using stub agents so no Gemini, MCP or Firestore access is needed.
+
+Run from the root of the repo:
+    python -m benchmarks.bench_agent_registry
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from backend.agent_registry import AgentRegistry
+
+class StubAgent:
+    """
+    Stands in for `uncontextual_gemini_client.agent`: keeps a chat history in
+    the same JSON shape and sleeps instead of calling Gemini.
+    """
+    def __init__(self, session_id: str, history_turns: int = 20, latency: float = 0.0):
+        self.session_id = session_id
+        self.latency = latency
+        self.flushes = 0
+        self.history = []
+        for i in range(history_turns):
+            self._append(f"question {i} " * 20, f"answer {i} " * 80)
+        self.login_status = {"text": f"user: {session_id} already logged in."}
+
+    def _append(self, prompt: str, reply: str):
+        self.history.append({"role": "user", "parts": [{"text": prompt}]})
+        self.history.append({"role": "model", "parts": [{"text": reply}]})
+
+    def call_gemini(self, prompt: str) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        reply = f"reply to {prompt}"
+        self._append(prompt, reply)
+        return reply
+
+    def update_fs(self):
+        self.flushes += 1
+
+def measure_memory(sessions: int, history_turns: int) -> float:
+    registry = AgentRegistry(lambda sid: StubAgent(sid, history_turns), capacity=sessions)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for i in range(sessions):
+        registry.get_or_create(f"mcp-session-{i}")
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    per_session = total / sessions
+    print(f"memory: {sessions} sessions x {history_turns} turns -> {total / 1e6:.1f} MB total, {per_session / 1024:.1f} KiB/session")
+    return per_session
+
+def measure_throughput(users: int, capacity: int, workers: int, messages: int, latency: float) -> float:
+    registry = AgentRegistry(lambda sid: StubAgent(sid, 4, latency), capacity=capacity)
+    rng = random.Random(42)
+    session_ids = [f"mcp-session-{rng.randrange(users)}" for _ in range(messages)]
+
+    def send(session_id: str):
+        registry.get_or_create(session_id).call_gemini("What's my net worth?")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(send, session_ids))
+    elapsed = time.perf_counter() - start
+    rate = messages / elapsed
+    stats = registry.stats()
+    print(
+        f"throughput: users={users} capacity={capacity} workers={workers} latency={latency * 1000:.0f}ms "
+        f"-> {rate:8.1f} msg/s  created={stats['created']} evicted={stats['evicted']}"
+    )
+    return rate
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--history-turns", type=int, default=20)
+    parser.add_argument("--users", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--capacity", type=int, default=256)
+    parser.add_argument("--workers", type=int, default=64)
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--latency", type=float, default=0.002)
+    args = parser.parse_args()
+
+    measure_memory(args.sessions, args.history_turns)
+    for users in args.users:
+        measure_throughput(users, args.capacity, args.workers, args.messages, args.latency)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Follow-up prompt size and latency of the local analytics tools, against
+feeding the raw MCP payloads they are computed from back to Gemini.
+
+For each common question the "before" column is the size of the raw tool
+result(s) Gemini would otherwise read (and after the user-012 reducers);
+"after" is the analytics tool's JSON. Payloads are read from the fi-mcp-dev
+fixtures of one user; no MCP server or Gemini call is involved.
+
+Run from the root of the repo:
+    python -m benchmarks.bench_analytics_tools
+"""
+import argparse
+import time
+from pathlib import Path
+from backend.analytics_tools import AnalyticsTools
+from backend.tool_reducers import ToolResultReducer
+
+TEST_DATA_DIR = Path("utils/fi-mcp-dev/test_data_dir")
+QUESTIONS = [
+    ("spend_by_category", {"period": "last_month"}, "fetch_bank_transactions"),
+    ("top_merchants", {"n": 5}, "fetch_bank_transactions"),
+    ("emi_burden", {}, "fetch_bank_transactions"),
+    ("credit_utilization", {}, "fetch_credit_report"),
+    ("net_worth_breakdown", {}, "fetch_net_worth"),
+    ("mf_portfolio", {}, "fetch_mf_transactions"),
+]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--user", default="1313131313")
+    parser.add_argument("--repeat", type=int, default=1000)
+    parser.add_argument("--data-dir", default=str(TEST_DATA_DIR))
+    args = parser.parse_args()
+
+    def fetch(tool_name: str, session_id: str) -> str:
+        return (Path(args.data_dir) / args.user / f"{tool_name}.json").read_text()
+
+    reducer = ToolResultReducer()
+    payloads = {source: fetch(source, "bench") for _, _, source in QUESTIONS}
+    tools = AnalyticsTools("bench", fetch=lambda tool_name, session_id: payloads[tool_name])
+
+    print(f"{'tool':22s} {'raw B':>7s} {'reduced B':>9s} {'tool B':>7s} {'cold ms':>8s} {'warm us':>8s}")
+    for name, tool_args, source in QUESTIONS:
+        start = time.perf_counter()
+        result = tools.call(name, tool_args)
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            tools.call(name, tool_args)
+        warm = (time.perf_counter() - start) / args.repeat
+
+        raw = payloads[source]
+        print(
+            f"{name:22s} {len(raw):7d} {len(reducer.reduce(source, raw)):9d} {len(result):7d} "
+            f"{cold * 1000:8.2f} {warm * 1e6:8.1f}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+p50/p99 latency of /send_message/ at many concurrent sessions, using a local
+stub LLM and stub MCP so only the FastAPI layer is measured.
+
+`async` drives backend.fastapi_interface as shipped. `sync` drives an
+equivalent app with plain `def` handlers and blocking agents, which is how
+the endpoints used to run on Starlette's thread pool.
+
+Run from the root of the repo:
+    python -m benchmarks.bench_async_api
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import httpx
+from fastapi import FastAPI
+from pydantic import BaseModel
+from backend import fastapi_interface
+from backend.agent_registry import AgentRegistry
+
+class StubAsyncAgent:
+    """
+    Mirrors uncontextual_gemini_client.agent: one LLM round trip, a concurrent
+    MCP fan-out, then the follow-up LLM round trip.
+    """
+    llm_latency = 0.05
+    mcp_latency = 0.02
+    tools = 3
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.login_status = {"text": f"user: {session_id} already logged in."}
+        self.lock = asyncio.Lock()
+
+    async def call_gemini(self, prompt: str) -> str:
+        await asyncio.sleep(self.llm_latency)
+        await asyncio.gather(*(asyncio.sleep(self.mcp_latency) for _ in range(self.tools)))
+        await asyncio.sleep(self.llm_latency)
+        return f"reply to {prompt}"
+
+    def update_fs(self):
+        pass
+
+class StubSyncAgent(StubAsyncAgent):
+    """
+    The same turn with blocking calls, as the agent ran before the async API.
+    """
+    def call_gemini(self, prompt: str) -> str:
+        time.sleep(self.llm_latency)
+        for _ in range(self.tools):
+            time.sleep(self.mcp_latency)
+        time.sleep(self.llm_latency)
+        return f"reply to {prompt}"
+
+class UserMessage(BaseModel):
+    session_id: str
+    msg: str
+
+def build_sync_app() -> FastAPI:
+    agents = AgentRegistry(StubSyncAgent, capacity=100_000)
+    app = FastAPI()
+
+    @app.post("/send_message/")
+    def send_message(request: UserMessage):
+        agent = agents.get_or_create(request.session_id)
+        return {"text": agent.call_gemini(request.msg)}
+
+    return app
+
+def build_async_app() -> FastAPI:
+    fastapi_interface.agents = AgentRegistry(StubAsyncAgent, capacity=100_000)
+    return fastapi_interface.app
+
+async def run_sessions(app: FastAPI, sessions: int, messages: int) -> list:
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    limits = httpx.Limits(max_connections=None)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits) as http:
+        async def user(i: int):
+            for j in range(messages):
+                start = time.perf_counter()
+                response = await http.post(
+                    "/send_message/",
+                    json={"session_id": f"mcp-session-{i}", "msg": f"question {j}"},
+                )
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(user(i) for i in range(sessions)))
+    return latencies
+
+def report(label: str, sessions: int, latencies: list, elapsed: float):
+    latencies.sort()
+    p50 = statistics.median(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"{label:<6} sessions={sessions:<5} p50={p50 * 1000:7.1f}ms p99={p99 * 1000:7.1f}ms "
+        f"throughput={len(latencies) / elapsed:7.1f} msg/s"
+    )
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, nargs="+", default=[100, 250, 500])
+    parser.add_argument("--messages", type=int, default=3)
+    parser.add_argument("--modes", nargs="+", default=["sync", "async"])
+    args = parser.parse_args()
+
+    builders = {"sync": build_sync_app, "async": build_async_app}
+    for sessions in args.sessions:
+        for mode in args.modes:
+            app = builders[mode]()
+            start = time.perf_counter()
+            latencies = asyncio.run(run_sessions(app, sessions, args.messages))
+            report(mode, sessions, latencies, time.perf_counter() - start)
+
+if __name__ == "__main__":
+    main()
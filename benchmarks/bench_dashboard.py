@@ -0,0 +1,84 @@
+"""
+Cost of serving /dashboard/{session_id} from the fi-mcp-dev fixtures.
+
+For every fixture user: the time to build the dashboard from decoded tool
+results (cold), the time to serve it again while the data is unchanged
+(warm), and the size of the JSON sent to the frontend. Then a stream of
+`--requests` page loads over all users, where every `--change-every`
+loads one user's bank transactions change, reports the hit rate of the
+per-version cache. Tool results are served from a ToolResultCache, as
+`call_tools_parallel` does while they are fresh; no MCP server or Gemini
+is involved.
+
+Run from the root of the repo:
+    python -m benchmarks.bench_dashboard
+"""
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+# Imported up front so the first cold build does not pay for pandas.
+import backend.analytics_tools  # noqa: F401
+from backend.dashboard import SOURCES, DashboardCache
+from backend.mcp_responses import ToolError, parse_response
+from backend.tool_cache import ToolResultCache
+
+TEST_DATA_DIR = Path("utils/fi-mcp-dev/test_data_dir")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--change-every", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--data-dir", default=str(TEST_DATA_DIR))
+    args = parser.parse_args()
+    rng = random.Random(0)
+    data_dir = Path(args.data_dir)
+
+    users = sorted(path.name for path in data_dir.iterdir() if path.is_dir())
+    tool_results = ToolResultCache(ttls={tool: 10 ** 9 for tool in SOURCES})
+    for user in users:
+        for tool in SOURCES:
+            path = data_dir / user / f"{tool}.json"
+            if path.exists():
+                tool_results.put(user, tool, None, parse_response(tool, path.read_text()))
+
+    def fetch_many(names: list, session_id: str) -> list:
+        return [
+            tool_results.get_response(session_id, name) or ToolError(name, f"❌ Error contacting fi-mcp-dev: no {name}")
+            for name in names
+        ]
+
+    cache = DashboardCache(fetch_many, tool_results=tool_results)
+    print(f"{'user':12s} {'cold ms':>8s} {'warm us':>8s} {'JSON B':>7s}  sections with errors")
+    for user in users:
+        start = time.perf_counter()
+        dashboard = cache.get(user)
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            cache.get(user)
+        warm = (time.perf_counter() - start) / args.repeat
+        errors = [name for name, section in dashboard.items() if isinstance(section, dict) and "error" in section]
+        size = len(json.dumps(dashboard, separators=(",", ":")))
+        print(f"{user:12s} {cold * 1000:8.2f} {warm * 1e6:8.1f} {size:7d}  {', '.join(errors) or '-'}")
+
+    cache = DashboardCache(fetch_many, tool_results=tool_results)
+    changes = 0
+    start = time.perf_counter()
+    for step in range(args.requests):
+        cache.get(rng.choice(users))
+        if step % args.change_every == args.change_every - 1:
+            user = rng.choice(users)
+            response = tool_results.get_response(user, "fetch_bank_transactions")
+            if response is not None:
+                tool_results.put(user, "fetch_bank_transactions", None, parse_response(response.tool_name, response.text + " "))
+                changes += 1
+    elapsed = time.perf_counter() - start
+    stats = cache.stats()
+    print(f"{args.requests} page loads, {changes} data changes: hit rate {stats['hit_rate']:.1%}, "
+          f"{elapsed / args.requests * 1000:.2f} ms/load")
+
+if __name__ == "__main__":
+    main()
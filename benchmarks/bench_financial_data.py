@@ -0,0 +1,86 @@
+"""
+Parse and query cost of bank transactions, before and after the columnar
+engine in backend.financial_data.
+
+Rows are resampled from the fi-mcp-dev fixtures with random dates, so
+narrations repeat the way real statements do. "before" answers a question
+("how much did I spend on food in a month") by walking the raw rows in
+Python, as any code reading the payload as-is has to. "after" parses the
+payload into columns once and answers from the arrays.
+
+Run from the root of the repo:
+    python -m benchmarks.bench_financial_data
+"""
+import argparse
+import json
+import random
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from backend.financial_data import BankTransactions, SPEND_TYPES
+
+TEST_DATA_DIR = Path("utils/fi-mcp-dev/test_data_dir")
+PATTERN = "swiggy|zomato|food"
+
+def fixture_rows() -> list:
+    rows = []
+    for path in sorted(TEST_DATA_DIR.glob("*/fetch_bank_transactions.json")):
+        for bank in json.loads(path.read_text()).get("bankTransactions", []):
+            rows += bank.get("txns", [])
+    return rows
+
+def synthetic_payload(count: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    rows = fixture_rows()
+    first = date(2023, 1, 1)
+    txns = []
+    for _ in range(count):
+        row = list(rng.choice(rows))
+        row[2] = (first + timedelta(days=rng.randrange(730))).isoformat()
+        txns.append(row)
+    return {"bankTransactions": [{"bank": "Synthetic Bank", "txns": txns}]}
+
+def before(payload: dict, start: str, end: str) -> float:
+    keywords = PATTERN.split("|")
+    total = 0.0
+    for bank in payload["bankTransactions"]:
+        for amount, narration, day, txn_type, _, _ in bank["txns"]:
+            if txn_type in SPEND_TYPES and start <= day <= end and any(k in narration.lower() for k in keywords):
+                total += float(amount)
+    return total
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--transactions", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    for count in args.transactions:
+        payload = synthetic_payload(count)
+
+        start = time.perf_counter()
+        expected = before(payload, "2024-06-01", "2024-06-30")
+        naive = time.perf_counter() - start
+
+        start = time.perf_counter()
+        txns = BankTransactions.from_payload(payload)
+        parse = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(args.queries):
+            total = txns.spend("2024-06-01", "2024-06-30", PATTERN)
+        query = (time.perf_counter() - start) / args.queries
+        assert abs(total - expected) < 1e-6 * max(1.0, expected)
+
+        start = time.perf_counter()
+        txns.spend_by_month(), txns.spend_by_type(), txns.spend_by_mode(), txns.spend_by_merchant(10)
+        aggregates = time.perf_counter() - start
+
+        print(
+            f"{count:8d} txns  before: {naive * 1000:9.2f} ms/query  "
+            f"after: parse {parse * 1000:9.2f} ms, {query * 1e6:9.1f} us/query, "
+            f"all aggregates {aggregates * 1000:7.2f} ms ({len(txns.narrations)} distinct narrations)"
+        )
+
+if __name__ == "__main__":
+    main()
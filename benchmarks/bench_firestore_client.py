@@ -0,0 +1,82 @@
+"""
+Startup and per-login cost of firestore_client, before and after sharing one
+Firebase app and Firestore client across users.
+
+"before" repeats what Client.__init__ used to do on every login: initialize a
+Firebase app and build a new Firestore client. "after" initializes once via
+get_db() and then only creates lightweight Client handles. A throwaway
+service-account key is generated locally, so no network or real project is
+needed; no document is read or written.
+
+Run from the root of the repo:
+    python -m benchmarks.bench_firestore_client
+"""
+import argparse
+import time
+import firebase_admin
+from firebase_admin import credentials, firestore
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from backend import firestore_client
+
+def throwaway_service_account() -> dict:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    return {
+        "type": "service_account",
+        "project_id": "fifi-bench",
+        "private_key_id": "bench",
+        "private_key": pem,
+        "client_email": "bench@fifi-bench.iam.gserviceaccount.com",
+        "client_id": "0",
+        "token_uri": "https://oauth2.googleapis.com/token",
+    }
+
+def before(service_account: dict, logins: int):
+    """
+    Per-login credential, app and client setup, as Client.__init__ used to do.
+    Each app needs a unique name, otherwise the second login raises.
+    """
+    handles = []
+    start = time.perf_counter()
+    for i in range(logins):
+        cred = credentials.Certificate(service_account)
+        app = firebase_admin.initialize_app(cred, name=f"bench-login-{i}")
+        db = firestore.client(app=app, database_id=firestore_client.DATABASE_ID)
+        handles.append(db.collection("users").document(str(i)))
+    return time.perf_counter() - start, handles
+
+def after(service_account: dict, logins: int):
+    start = time.perf_counter()
+    firebase_admin.initialize_app(credentials.Certificate(service_account))
+    firestore_client.get_db()
+    startup = time.perf_counter() - start
+
+    handles = []
+    start = time.perf_counter()
+    for i in range(logins):
+        client = firestore_client.Client(i)
+        client.doc_ref
+        handles.append(client)
+    return startup, time.perf_counter() - start, handles
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--before-logins", type=int, default=50)
+    parser.add_argument("--after-logins", type=int, default=20000)
+    args = parser.parse_args()
+    service_account = throwaway_service_account()
+
+    elapsed, _ = before(service_account, args.before_logins)
+    print(f"before: per login {elapsed / args.before_logins * 1000:8.3f} ms")
+
+    startup, elapsed, _ = after(service_account, args.after_logins)
+    print(f"after:  startup   {startup * 1000:8.3f} ms (once per process)")
+    print(f"after:  per login {elapsed / args.after_logins * 1000:8.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Script run time of frontend/main.py as the chat history grows, measured
+with Streamlit's AppTest harness.
+
+The backend is a stub HTTP server on localhost serving a dashboard built
+from one fi-mcp-dev fixture user (through backend.dashboard, so it has the
+real shape and size). The app is logged in with `--messages` chat messages
+in its session state. The first run builds every chart; the following
+`--runs` reruns are what each widget interaction costs.
+
+Run from the root of the repo:
+    python -m benchmarks.bench_frontend_rerun
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from streamlit.testing.v1 import AppTest
+from backend.dashboard import SOURCES, Dashboard
+from backend.mcp_responses import parse_response
+
+TEST_DATA_DIR = Path("utils/fi-mcp-dev/test_data_dir")
+
+def stub_backend(dashboard: dict) -> ThreadingHTTPServer:
+    body = json.dumps(dashboard).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, payload: bytes):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            self._reply(body)
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            self._reply(json.dumps({"text": "user already logged in."}).encode())
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def chat_history(count: int) -> list:
+    history = []
+    for i in range(count):
+        role = "user" if i % 2 == 0 else "bot"
+        message = f"Question {i} about my spending?" if role == "user" else f"Answer {i}: " + "you spent ₹1,200 on food. " * 8
+        css_class = "my-user" if role == "user" else "my-bot"
+        history.append({"role": role, "message": message, "html": f'<div class="{css_class}">{message}</div>'})
+    return history
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--script", default="frontend/main.py")
+    parser.add_argument("--user", default="1313131313")
+    parser.add_argument("--messages", type=int, nargs="+", default=[0, 100, 1000, 5000])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--data-dir", default=str(TEST_DATA_DIR))
+    args = parser.parse_args()
+    # Keep Streamlit's deprecation warnings out of the report.
+    logging.disable(logging.WARNING)
+
+    responses = {tool: parse_response(tool, (Path(args.data_dir) / args.user / f"{tool}.json").read_text()) for tool in SOURCES}
+    dashboard = {"version": args.user, **Dashboard(args.user, responses).build()}
+    server = stub_backend(dashboard)
+    os.environ["FIFI_API_URL"] = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    print(f"{args.script}: first run and median rerun time")
+    print(f"{'messages':>8s} {'first ms':>9s} {'rerun ms':>9s}")
+    for count in args.messages:
+        app = AppTest.from_file(str(Path(args.script).resolve()), default_timeout=60)
+        app.session_state["logged_in"] = True
+        app.session_state["AuthDone"] = True
+        app.session_state["chat_history"] = chat_history(count)
+        start = time.perf_counter()
+        app.run()
+        first = time.perf_counter() - start
+        if app.exception:
+            raise RuntimeError(app.exception[0].message)
+        reruns = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            app.run()
+            reruns.append(time.perf_counter() - start)
+        print(f"{count:8d} {first * 1000:9.1f} {statistics.median(reruns) * 1000:9.1f}")
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Prompt size and agent start-up cost of chat history, before and after
+windowing it under a token budget with a rolling summary.
+
+"before" loads every stored turn and sends it all to Gemini, as the agents
+used to. "after" builds the window with HistoryManager: the last turns
+verbatim plus a summary of the rest, extending the previous summary with
+only the turns that left the window since the last session. Turns are
+synthetic (questions, tool calls, tool results and answers) and live in the
+in-memory Firestore stand-in, so reads are counted but nothing hits the network.
+
+Run from the root of the repo:
+    python -m benchmarks.bench_history_window
+"""
+import argparse
+import time
+from backend.firestore_client import Client
+from backend.firestore_memory import MemoryFirestore
+from backend.history_manager import HistoryManager, estimate_tokens
+
+TOOL_RESULT_CHARS = 3000
+
+def exchange(i: int) -> list:
+    """
+    One question answered with a tool call, as stored by the agents.
+    """
+    return [
+        {"role": "user", "parts": [{"text": f"How did my spending change in month {i}? " * 3}]},
+        {"role": "model", "parts": [{"function_call": {"name": "fetch_bank_transactions", "args": {}}}]},
+        {"role": "user", "parts": [{"text": "Result of `fetch_bank_transactions`:\n" + "x" * TOOL_RESULT_CHARS}]},
+        {"role": "model", "parts": [{"text": f"In month {i} you spent a little more on dining out. " * 4}]},
+    ]
+
+def seeded_client(exchanges: int) -> Client:
+    client = Client(1, db=MemoryFirestore())
+    turns = [turn for i in range(exchanges) for turn in exchange(i)]
+    client.store_chat_state(turns, {})
+    return Client(1, db=client.db)
+
+def before(client: Client):
+    start = time.perf_counter()
+    history = client.get_chat_history()
+    return time.perf_counter() - start, sum(map(estimate_tokens, history))
+
+def after(client: Client, summary: dict | None):
+    start = time.perf_counter()
+    manager = HistoryManager(client.history, summary)
+    window = manager.build()
+    elapsed = time.perf_counter() - start
+    tokens = sum(map(estimate_tokens, window)) + len(manager.summary_text) // 4
+    return elapsed, tokens, manager
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--exchanges", type=int, nargs="+", default=[10, 100, 1000])
+    args = parser.parse_args()
+
+    for exchanges in args.exchanges:
+        client = seeded_client(exchanges)
+        reads = client.db.reads
+        elapsed, tokens = before(client)
+        print(f"{exchanges:5d} exchanges  before: {tokens:8d} tokens {elapsed * 1000:8.2f} ms {client.db.reads - reads:6d} reads")
+
+        client = Client(1, db=client.db)
+        reads = client.db.reads
+        elapsed, tokens, manager = after(client, client.load().get("chat_summary"))
+        print(f"{exchanges:5d} exchanges  after:  {tokens:8d} tokens {elapsed * 1000:8.2f} ms {client.db.reads - reads:6d} reads (first summary)")
+
+        # The next session adds one exchange; only the turns that left the window are summarized.
+        client.store_chat_state(exchange(exchanges), {}, summary=manager.summary)
+        client = Client(1, db=client.db)
+        reads = client.db.reads
+        elapsed, tokens, _ = after(client, client.load().get("chat_summary"))
+        print(f"{exchanges:5d} exchanges  after:  {tokens:8d} tokens {elapsed * 1000:8.2f} ms {client.db.reads - reads:6d} reads (next session)")
+
+if __name__ == "__main__":
+    main()
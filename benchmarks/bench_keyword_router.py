@@ -0,0 +1,77 @@
+"""
+Throughput of the mock-flow tool router on a large synthetic query set, as
+the number of configured keyword phrases grows.
+
+"before" is the old detect_tool: a substring scan over every keyword,
+returning the first hit, so its cost grows with the number of keywords (and
+it ignores word boundaries and returns a single tool). "after" is
+KeywordRouter.match, which returns every matched tool with a score. Extra
+phrases are random made-up words routed to a dummy tool, on top of
+tool_keywords.json.
+
+Run from the root of the repo:
+    python -m benchmarks.bench_keyword_router
+"""
+import argparse
+import json
+import random
+import string
+import time
+from backend.mock_flow.gemini_mock import TOOL_KEYWORDS_FILE, KeywordRouter
+
+FILLER = (
+    "what is my how much did i can you show tell me about the last month year please compare with "
+    "average trend doing this were are and my for on in food rent travel plan goal save should"
+).split()
+
+def legacy_detect_tool(user_input: str, mapping: dict) -> str | None:
+    user_input = user_input.lower()
+    for keyword, tool in mapping.items():
+        if keyword in user_input:
+            return tool
+    return None
+
+def build_router(extra_phrases: int, seed: int = 0) -> KeywordRouter:
+    with open(TOOL_KEYWORDS_FILE, "r") as fin:
+        config = json.load(fin)
+    rng = random.Random(seed)
+    config["tools"]["dummy_tool"] = {
+        " ".join("".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))) for _ in range(rng.randint(1, 2))): 1
+        for _ in range(extra_phrases)
+    }
+    return KeywordRouter(config["tools"], config.get("synonyms"))
+
+def synthetic_queries(count: int, phrases: list, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        words = rng.choices(FILLER, k=rng.randint(4, 16))
+        for _ in range(rng.choice((0, 1, 1, 2))):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(phrases))
+        queries.append(" ".join(words).capitalize() + "?")
+    return queries
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=200_000)
+    parser.add_argument("--extra-phrases", type=int, nargs="+", default=[0, 500, 5000])
+    args = parser.parse_args()
+
+    print(f"{'phrases':>8s} {'before us/q':>12s} {'after us/q':>11s} {'matched':>8s}")
+    for extra in args.extra_phrases:
+        router = build_router(extra)
+        # Queries mention the real tools' phrases, so hit rates are comparable across rows.
+        queries = synthetic_queries(args.queries, [p for p, tool in router.mapping.items() if tool != "dummy_tool"])
+
+        start = time.perf_counter()
+        for query in queries:
+            legacy_detect_tool(query, router.mapping)
+        before = (time.perf_counter() - start) / len(queries)
+
+        start = time.perf_counter()
+        matched = sum(1 for query in queries if router.match(query))
+        after = (time.perf_counter() - start) / len(queries)
+        print(f"{len(router.mapping):8d} {before * 1e6:12.2f} {after * 1e6:11.2f} {matched:8d}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Cost of serving tools/call from utils.local_mcp, against a store that
+reads the fixture from disk on every call as fi-mcp-dev's AuthMiddleware
+does (list test_data_dir for the allowed numbers, read the file, encode it).
+
+First the server-side cost per call of each store for every tool of one
+fixture user, then calls/s through the pooled MCPTransport over HTTP for
+both stores, then calls/s with `--workers` threads under each latency and
+error profile of the pre-indexed server.
+
+Run from the root of the repo:
+    python -m benchmarks.bench_local_mcp
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from backend.mcp_client import MCPTransport
+from utils.local_mcp import PROFILES, TEST_DATA_DIR, FixtureStore, LocalMCPServer, encode_result
+
+class DiskStore(FixtureStore):
+    """
+    Reads the fixture for every call, like the Go middleware.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._results = {}
+
+    def result(self, phone: str, tool_name: str) -> bytes:
+        if phone not in [path.name for path in self.data_dir.iterdir() if path.is_dir()]:
+            return self.not_allowed
+        try:
+            return encode_result((self.data_dir / phone / f"{tool_name}.json").read_text())
+        except OSError:
+            return self.missing
+
+def per_call(fn, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls
+
+def rate(transport: MCPTransport, session_id: str, tool_name: str, calls: int, workers: int) -> tuple:
+    def call(_):
+        data = transport.request("tools/call", session_id, params={"name": tool_name, "arguments": {}})
+        return data["result"]["isError"]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        errors = sum(pool.map(call, range(calls)))
+    return calls / (time.perf_counter() - start), errors / calls
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--user", default="1313131313")
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--tool", default="fetch_bank_transactions")
+    parser.add_argument("--data-dir", default=str(TEST_DATA_DIR))
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    memory = FixtureStore(args.data_dir)
+    print(f"loaded {len(memory)} fixtures of {len(memory.phones)} users in {(time.perf_counter() - start) * 1000:.1f} ms\n")
+    disk = DiskStore(args.data_dir)
+
+    print(f"{'tool':28s} {'disk us':>9s} {'memory us':>10s} {'speedup':>8s}")
+    for name in [tool["name"] for tool in memory.tools if tool["name"] != "whoami"]:
+        disk_time = per_call(lambda: disk.result(args.user, name), args.calls)
+        memory_time = per_call(lambda: memory.result(args.user, name), args.calls)
+        print(f"{name:28s} {disk_time * 1e6:9.1f} {memory_time * 1e6:10.2f} {disk_time / memory_time:7.0f}x")
+
+    print(f"\n{args.tool} over HTTP, MCPTransport, workers={args.workers}")
+    for label, store in (("disk per call", disk), ("pre-indexed", memory)):
+        server = LocalMCPServer(store=store, auto_login=args.user).start()
+        transport = MCPTransport(base_url=server.url)
+        calls_per_second, _ = rate(transport, "mcp-session-bench", args.tool, args.calls, args.workers)
+        print(f"{label:28s} {calls_per_second:8.1f} calls/s")
+        transport.close()
+        server.shutdown()
+
+    print(f"\n{'profile':28s} {'calls/s':>8s} {'errors':>7s}")
+    for name, profile in PROFILES.items():
+        server = LocalMCPServer(store=memory, profile=profile, auto_login=args.user).start()
+        transport = MCPTransport(base_url=server.url)
+        calls = args.calls if not profile.latency else min(args.calls, 200)
+        calls_per_second, errors = rate(transport, "mcp-session-bench", args.tool, calls, args.workers)
+        print(f"{name:28s} {calls_per_second:8.1f} {errors:7.1%}")
+        transport.close()
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
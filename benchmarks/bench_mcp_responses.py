@@ -0,0 +1,70 @@
+"""
+Cost of decoding MCP tool results, before and after backend.mcp_responses,
+over every fixture in the fi-mcp-dev test_data_dir.
+
+"before" is what a turn used to do with one tool result: `eval()` it to
+look for a login prompt, then `json.loads` it again in every consumer
+(reducer, analytics tools, financial data parsers). "after" decodes it once
+with `parse_response` and every consumer reads the shared `data`. Also
+counts the fixtures `eval()` cannot read at all (JSON `true`, `false`,
+`null` are not Python).
+
+Run from the root of the repo:
+    python -m benchmarks.bench_mcp_responses
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+from backend import mcp_responses
+from backend.mcp_responses import parse_response
+
+TEST_DATA_DIR = Path("utils/fi-mcp-dev/test_data_dir")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data-dir", default=str(TEST_DATA_DIR))
+    parser.add_argument("--consumers", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payloads = [(path.stem, path.read_text()) for path in sorted(Path(args.data_dir).glob("*/*.json"))]
+    total_kb = sum(len(text) for _, text in payloads) / 1024
+
+    eval_failures = 0
+    for _, text in payloads:
+        try:
+            eval(text)
+        except Exception:
+            eval_failures += 1
+
+    def before(tool_name: str, text: str):
+        try:
+            eval(text)
+        except Exception:
+            pass
+        for _ in range(args.consumers):
+            json.loads(text)
+
+    def after(tool_name: str, text: str):
+        response = parse_response(tool_name, text)
+        for _ in range(args.consumers):
+            response.data
+
+    decoder = "orjson" if mcp_responses.orjson is not None else "json"
+    print(f"{len(payloads)} fixtures, {total_kb:.0f} KB, {args.consumers} consumers per result, decoder: {decoder}")
+    print(f"eval() fails on {eval_failures} of {len(payloads)} fixtures")
+    timings = []
+    for run in (before, after):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for tool_name, text in payloads:
+                run(tool_name, text)
+        timings.append((time.perf_counter() - start) / (args.repeat * len(payloads)))
+    print(f"{'':8s} {'us/result':>10s} {'MB/s':>8s}")
+    for name, seconds in zip(("before", "after"), timings):
+        print(f"{name:8s} {seconds * 1e6:10.1f} {total_kb / 1024 / len(payloads) / seconds:8.1f}")
+    print(f"speedup: {timings[0] / timings[1]:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Compare calls per second of the pooled MCPTransport against a bare
+per-call `requests.post`, against the in-memory utils.local_mcp server.
+
+Run from the root of the repo:
+    python -m benchmarks.bench_mcp_transport
+"""
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from backend.mcp_client import MCPTransport
+from utils.local_mcp import start_local_mcp
+
+def legacy_call(url: str, session_id: str, tool_name: str) -> str:
+    payload = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "tools/call",
+        "params": {"name": tool_name, "arguments": {}}
+    }
+    headers = {"Content-Type": "application/json", "Mcp-Session-Id": session_id}
+    response = requests.post(url, headers=headers, data=json.dumps(payload))
+    response.raise_for_status()
+    return response.json()["result"]["content"][0]["text"]
+
+def pooled_call(transport: MCPTransport, session_id: str, tool_name: str) -> str:
+    data = transport.request("tools/call", session_id, params={"name": tool_name, "arguments": {}})
+    return data["result"]["content"][0]["text"]
+
+def run(label: str, fn, calls: int, workers: int) -> float:
+    start = time.perf_counter()
+    if workers == 1:
+        for _ in range(calls):
+            fn()
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(lambda _: fn(), range(calls)))
+    elapsed = time.perf_counter() - start
+    rate = calls / elapsed
+    print(f"{label:<28} workers={workers:<3} {calls} calls in {elapsed:6.2f}s  {rate:8.1f} calls/s")
+    return rate
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--tool", default="fetch_net_worth")
+    parser.add_argument("--profile", default="none")
+    args = parser.parse_args()
+
+    server = start_local_mcp(phone="1313131313", profile=args.profile)
+    url = server.url
+    session_id = "mcp-session-bench"
+    transport = MCPTransport(base_url=url)
+
+    try:
+        for workers in args.workers:
+            legacy = run("requests.post per call", lambda: legacy_call(url, session_id, args.tool), args.calls, workers)
+            pooled = run("MCPTransport (pooled)", lambda: pooled_call(transport, session_id, args.tool), args.calls, workers)
+            print(f"{'speedup':<28} workers={workers:<3} {pooled / legacy:.2f}x\n")
+    finally:
+        transport.close()
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
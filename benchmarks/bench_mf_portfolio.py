@@ -0,0 +1,134 @@
+"""
+Holdings, P&L and XIRR of synthetic mutual fund portfolios, before and
+after the vectorized engine in backend.mf_portfolio.
+
+Portfolios are `--months` of monthly SIPs per scheme, with occasional lump
+sums and redemptions, over ISINs and starting NAVs taken from the fi-mcp-dev
+fixtures; NAVs follow a random walk. Larger portfolios have more schemes.
+"before" walks each scheme's orders in Python and solves its XIRR with a
+scalar Newton/bisection loop, one scheme after another. "after" parses the
+payload into per-ISIN arrays once and solves every scheme's XIRR in one
+batched iteration. Both are checked to agree.
+
+Run from the root of the repo:
+    python -m benchmarks.bench_mf_portfolio
+"""
+import argparse
+import json
+import math
+import random
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from backend.mf_portfolio import MfPortfolio
+
+TEST_DATA_DIR = Path("utils/fi-mcp-dev/test_data_dir")
+
+def fixture_schemes() -> list:
+    schemes = {}
+    for path in sorted(TEST_DATA_DIR.glob("*/fetch_mf_transactions.json")):
+        for scheme in json.loads(path.read_text()).get("mfTransactions", []):
+            if scheme.get("txns"):
+                schemes.setdefault(scheme["isin"], (scheme["schemeName"], scheme["txns"][0][2]))
+    return [(isin, name, nav) for isin, (name, nav) in sorted(schemes.items())]
+
+def synthetic_payload(count: int, months: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    base = fixture_schemes()
+    per_scheme = max(1, min(count, months))
+    schemes = []
+    for i in range(max(1, count // per_scheme)):
+        isin, name, nav = base[i % len(base)]
+        units, txns = 0.0, []
+        day = date(2024, 1, 1) - timedelta(days=31 * per_scheme + rng.randrange(365))
+        for _ in range(per_scheme):
+            nav *= math.exp(rng.gauss(0.008, 0.05))
+            if units and rng.random() < 0.05:
+                sold = round(units * rng.uniform(0.05, 0.3), 3)
+                units -= sold
+                txns.append([2, day.isoformat(), round(nav, 4), sold, round(sold * nav, 2)])
+            else:
+                amount = 5000 if rng.random() < 0.9 else rng.randrange(10_000, 200_000, 1000)
+                bought = round(amount / nav, 3)
+                units += bought
+                txns.append([1, day.isoformat(), round(nav, 4), bought, amount])
+            day += timedelta(days=rng.randrange(28, 32))
+        schemes.append({"isin": f"{isin}-{i}", "schemeName": name, "folioId": f"F{i}", "txns": txns})
+    return {"mfTransactions": schemes}
+
+def scalar_xirr(flows: list, low: float = -0.9999, high: float = 100.0, tol: float = 1e-9) -> float:
+    def npv(rate):
+        return sum(amount / (1 + rate) ** years for amount, years in flows)
+
+    npv_low = npv(low)
+    if npv_low * npv(high) >= 0:
+        return math.nan
+    rate = 0.1
+    for _ in range(100):
+        value = npv(rate)
+        slope = sum(-years * amount / (1 + rate) ** (years + 1) for amount, years in flows)
+        if (value > 0) == (npv_low > 0):
+            low, npv_low = rate, value
+        else:
+            high = rate
+        step = rate - value / slope if slope else math.nan
+        if not low < step < high:
+            step = (low + high) / 2
+        if abs(step - rate) <= tol * (1 + abs(rate)):
+            return step
+        rate = step
+    return rate
+
+def before(payload: dict) -> dict:
+    as_of = max(date.fromisoformat(txn[1]) for scheme in payload["mfTransactions"] for txn in scheme["txns"])
+    out = {}
+    for scheme in payload["mfTransactions"]:
+        txns = sorted(scheme["txns"], key=lambda txn: txn[1])
+        first = date.fromisoformat(txns[0][1])
+        units = invested = redeemed = 0.0
+        flows = []
+        for order, day, _, txn_units, amount in txns:
+            sign = -1 if order == 2 else 1
+            units += sign * txn_units
+            invested += amount if sign > 0 else 0
+            redeemed += amount if sign < 0 else 0
+            flows.append((-sign * amount, (date.fromisoformat(day) - first).days / 365.0))
+        value = units * txns[-1][2]
+        flows.append((value, (as_of - first).days / 365.0))
+        out[scheme["isin"]] = (value + redeemed - invested, scalar_xirr(flows))
+    return out
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--months", type=int, default=240)
+    args = parser.parse_args()
+
+    for count in args.sizes:
+        payload = synthetic_payload(count, args.months)
+        start = time.perf_counter()
+        expected = before(payload)
+        before_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        portfolio = MfPortfolio.from_payload(payload)
+        parse_time = time.perf_counter() - start
+        start = time.perf_counter()
+        # Without NAVs the schemes are valued at their last order price, so as of the last order.
+        summary = portfolio.summary(as_of=portfolio.dates.max())
+        summary_time = time.perf_counter() - start
+
+        worst = 0.0
+        for scheme in summary["schemes"]:
+            gain, rate = expected[scheme["isin"]]
+            worst = max(worst, abs(scheme["absolute_return"] - gain) / max(1.0, abs(gain)))
+            if scheme["xirr_pct"] is not None:
+                worst = max(worst, abs(scheme["xirr_pct"] - round(rate * 100, 2)) / 100)
+        print(
+            f"{len(portfolio):7d} txns {len(portfolio.isins):4d} schemes  before: {before_time * 1000:8.1f} ms  "
+            f"after: parse {parse_time * 1000:6.1f} ms, summary {summary_time * 1000:6.1f} ms  "
+            f"speedup {before_time / (parse_time + summary_time):5.1f}x  max rel. diff {worst:.1e}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Throughput of the narration classifier on a synthetic 1M-transaction column.
+
+Narrations are resampled from the fi-mcp-dev fixtures and their digit runs
+(UPI references, dates, account numbers) are re-randomized, so most rows
+are distinct strings, as in real statements. "before" classifies row by row
+with one regex per category, tried in priority order. "after" is
+NarrationClassifier.classify_codes: one combined regex, one pass per
+distinct normalized narration, memoized across batches ("warm"). "before"
+is timed on a sample and extrapolated to the full column.
+
+Run from the root of the repo:
+    python -m benchmarks.bench_narration_classifier
+"""
+import argparse
+import json
+import random
+import re
+import time
+from pathlib import Path
+import numpy as np
+from backend.narration_classifier import CATEGORY_KEYWORDS, NarrationClassifier, normalize
+
+TEST_DATA_DIR = Path("utils/fi-mcp-dev/test_data_dir")
+
+def fixture_narrations() -> list:
+    narrations = []
+    for path in sorted(TEST_DATA_DIR.glob("*/fetch_bank_transactions.json")):
+        for bank in json.loads(path.read_text()).get("bankTransactions", []):
+            narrations += [txn[1] for txn in bank.get("txns", [])]
+    return narrations
+
+def synthetic_narrations(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    narrations = fixture_narrations()
+    digits = re.compile(r"\d+")
+    return [
+        digits.sub(lambda m: str(rng.randrange(10 ** len(m.group()))).zfill(len(m.group())), rng.choice(narrations))
+        for _ in range(count)
+    ]
+
+def before(narrations: list, classifier: NarrationClassifier) -> np.ndarray:
+    patterns = [
+        re.compile(rf"(?<![A-Z#])(?:{'|'.join(re.escape(normalize(k)) for k in CATEGORY_KEYWORDS[category])})(?![A-Z#])")
+        for category in classifier.categories
+    ]
+    codes = np.empty(len(narrations), dtype=np.int8)
+    for i, narration in enumerate(narrations):
+        text = normalize(narration)
+        codes[i] = next((code for code, pattern in enumerate(patterns) if pattern.search(text)), classifier.other_code)
+    return codes
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--transactions", type=int, default=1_000_000)
+    parser.add_argument("--before-sample", type=int, default=20_000, help="rows timed for \"before\"; it is too slow for the full column")
+    args = parser.parse_args()
+    narrations = synthetic_narrations(args.transactions)
+    print(f"{len(narrations)} narrations, {len(set(narrations))} distinct, "
+          f"{len(set(map(normalize, narrations)))} distinct after normalization")
+
+    classifier = NarrationClassifier()
+    sample = narrations[:args.before_sample]
+    start = time.perf_counter()
+    expected = before(sample, classifier)
+    elapsed = time.perf_counter() - start
+    print(f"before:      {elapsed * len(narrations) / len(sample):7.2f} s  {len(sample) / elapsed / 1e6:6.2f} M narrations/s "
+          f"(timed on {len(sample)} rows)")
+
+    for label in ("after cold", "after warm"):
+        start = time.perf_counter()
+        codes = classifier.classify_codes(narrations)
+        elapsed = time.perf_counter() - start
+        print(f"{label}:  {elapsed:7.2f} s  {len(narrations) / elapsed / 1e6:6.2f} M narrations/s")
+    print(f"agreement with before: {(codes[:len(sample)] == expected).mean():.4%}  {classifier.cache_info()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Hit rate and lookup cost of the per-user response cache on a synthetic
+stream of chat prompts.
+
+Users ask the frontend's canned prompts, paraphrases of common questions
+and one-off questions. Tool results come from the fi-mcp-dev fixtures and
+are put straight into a ToolResultCache; every `--change-every` prompts one
+user's bank transactions change, which must invalidate that user's answers
+built on them. Gemini is not called: a "model call" is counted whenever the
+cache misses, and every served answer is checked against the data version
+it was computed from and the question it answers, so stale answers and
+wrong near-duplicate matches would show up as "wrong".
+
+Run from the root of the repo:
+    python -m benchmarks.bench_response_cache
+"""
+import argparse
+import random
+import time
+from pathlib import Path
+from backend.response_cache import ResponseCache
+from backend.tool_cache import ToolResultCache
+
+TEST_DATA_DIR = Path("utils/fi-mcp-dev/test_data_dir")
+# (tools the answer needs, phrasings users ask it with)
+QUESTIONS = [
+    (("fetch_bank_transactions",), ["How did I spend this weekend?", "how did i spend this weekend", "How much did I spend this weekend?"]),
+    (("fetch_bank_transactions",), ["Show me top expenses", "show my top expenses", "Show top expenses please"]),
+    (("fetch_bank_transactions", "fetch_net_worth"), ["Suggest a saving goal", "suggest a savings goal"]),
+    (("fetch_net_worth",), ["What's my net worth?", "what is my net worth", "whats my networth", "Tell me my net worth"]),
+    (("fetch_credit_report",), ["What's my credit score?", "what is my credit score"]),
+    (("fetch_mf_transactions",), ["How are my mutual funds doing?", "how is my mutual fund doing"]),
+    (("fetch_epf_details",), ["What is my EPF balance?", "what's my epf balance now"]),
+]
+ONE_OFF = ["Can I afford a {} lakh car?", "Should I prepay my loan by {} percent?", "Plan a trip for {} days"]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--prompts", type=int, default=50_000)
+    parser.add_argument("--one-off-rate", type=float, default=0.2)
+    parser.add_argument("--change-every", type=int, default=100)
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    users = sorted(path.name for path in TEST_DATA_DIR.iterdir() if path.is_dir())
+    tools = sorted({tool for needs, _ in QUESTIONS for tool in needs})
+    payloads = {
+        (user, tool): (TEST_DATA_DIR / user / f"{tool}.json").read_text()
+        for user in users for tool in tools if (TEST_DATA_DIR / user / f"{tool}.json").exists()
+    }
+    tool_results = ToolResultCache(ttls={tool: 10 ** 9 for tool in tools})
+    cache = ResponseCache(tool_results=tool_results)
+    sessions = [f"session-{i}" for i in range(args.users)]
+    data = {}
+    for i, session in enumerate(sessions):
+        user = users[i % len(users)]
+        for tool in tools:
+            data[session, tool] = payloads.get((user, tool), "{}")
+            tool_results.put(session, tool, None, data[session, tool])
+
+    def answer(session: str, question: str, needs: tuple) -> str:
+        return question + "|" + "|".join(tool_results.version(session, tool) for tool in needs)
+
+    model_calls = wrong = changes = 0
+    lookup_time = 0.0
+    for step in range(args.prompts):
+        session = rng.choice(sessions)
+        if rng.random() < args.one_off_rate:
+            prompt, needs = rng.choice(ONE_OFF).format(rng.randrange(1, 1000)), ("fetch_bank_transactions",)
+            question = prompt
+        else:
+            index = rng.randrange(len(QUESTIONS))
+            needs, phrasings = QUESTIONS[index]
+            prompt, question = rng.choice(phrasings), str(index)
+
+        start = time.perf_counter()
+        reply = cache.get(session, session, prompt)
+        lookup_time += time.perf_counter() - start
+        if reply is None:
+            model_calls += 1
+            cache.put(session, session, prompt, needs, answer(session, question, needs))
+        elif reply != answer(session, question, needs):
+            wrong += 1
+
+        if step % args.change_every == args.change_every - 1:
+            changed = rng.choice(sessions)
+            data[changed, "fetch_bank_transactions"] += " "
+            tool_results.put(changed, "fetch_bank_transactions", None, data[changed, "fetch_bank_transactions"])
+            changes += 1
+
+    stats = cache.stats()
+    print(f"{args.prompts} prompts, {args.users} users, {changes} data changes")
+    print(f"model calls: {model_calls} (before: {args.prompts})  hit rate: {stats['hit_rate']:.1%} "
+          f"(exact {stats['exact_hits']}, similar {stats['similar_hits']})")
+    print(f"invalidations: {stats['invalidations']}  wrong answers served: {wrong}  "
+          f"lookup: {lookup_time / args.prompts * 1e6:.1f} us/prompt")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Cold import time of the backend entry points, measured with
+`python -X importtime` in a fresh interpreter per run.
+
+For each module the median total import time over `--runs` runs is
+reported, with the packages that contributed most to it (self time summed
+per top-level package, `google.*` split by subpackage). Nothing is called
+after import, so this is the cost a FastAPI worker or CLI pays before it
+can serve its first request.
+
+Run from the root of the repo:
+    python -m benchmarks.bench_startup
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from collections import Counter
+
+MODULES = [
+    "backend.fastapi_interface",
+    "backend.uncontextual_gemini_client",
+    "backend.gemini_client",
+    "backend.contextual_gemini_client",
+    "backend.cli_gemini",
+]
+
+def package_of(name: str) -> str:
+    parts = name.strip().split(".")
+    return ".".join(parts[:2]) if parts[0] == "google" else parts[0]
+
+def import_profile(module: str) -> tuple:
+    """
+    Import `module` in a fresh interpreter.
+    Returns:
+        tuple: (total import time in ms, Counter of self time in ms per package).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-W", "ignore", "-c", f"import {module}"],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr[-2000:]}")
+    packages = Counter()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        packages[package_of(name)] += int(self_us) / 1000
+    return sum(packages.values()), packages
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    args = parser.parse_args()
+
+    for module in args.modules:
+        profiles = [import_profile(module) for _ in range(args.runs)]
+        total = statistics.median(total for total, _ in profiles)
+        packages = Counter()
+        for _, profile in profiles:
+            packages.update(profile)
+        top = ", ".join(f"{name} {ms / args.runs:.0f}" for name, ms in packages.most_common(args.top))
+        print(f"{module:36s} {total:7.0f} ms   top (ms): {top}")
+
+if __name__ == "__main__":
+    main()
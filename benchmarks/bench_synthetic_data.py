@@ -0,0 +1,107 @@
+"""
+The backend at the scale of utils.synthetic_data users, far beyond the 16
+fi-mcp-dev fixtures.
+
+For each size in `--sizes`: how fast one user is generated, the peak memory
+of streaming it to disk against materializing every payload as a string,
+then the cost of decoding its payloads into typed responses, of building
+its dashboard, and of reducing its bank statement for Gemini. Finally
+`--users` users are written to a temporary test_data_dir and served by
+utils.local_mcp, and random users are fetched through MCPTransport.
+
+Every benchmark that takes `--data-dir` can be pointed at such a directory:
+    python -m utils.synthetic_data /tmp/synthetic --users 1000 --size medium
+    python -m benchmarks.bench_dashboard --data-dir /tmp/synthetic
+
+Run from the root of the repo:
+    python -m benchmarks.bench_synthetic_data
+"""
+import argparse
+import random
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+# Imported up front so the first dashboard does not pay for pandas.
+import backend.analytics_tools  # noqa: F401
+from backend.dashboard import SOURCES, Dashboard
+from backend.mcp_client import MCPTransport
+from backend.mcp_responses import parse_response
+from backend.tool_reducers import ToolResultReducer
+from utils.local_mcp import FixtureStore, LocalMCPServer
+from utils.synthetic_data import SIZES, TOOLS, SyntheticUser, default_shapes, phone_numbers, write_users
+
+def peak_mb(fn) -> float:
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1e6
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", nargs="+", default=list(SIZES), choices=list(SIZES))
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+    default_shapes()
+    reducer = ToolResultReducer()
+
+    print(f"{'size':8s} {'MB':>6s} {'gen s':>6s} {'MB/s':>5s} {'stream peak MB':>14s} {'in-memory peak MB':>17s}")
+    payloads = {}
+    with tempfile.TemporaryDirectory() as out_dir:
+        for size in args.sizes:
+            user = SyntheticUser(f"{size}-user", SIZES[size])
+            start = time.perf_counter()
+            payloads[size] = {tool: user.payload(tool) for tool in TOOLS}
+            elapsed = time.perf_counter() - start
+            total = sum(len(text) for text in payloads[size].values()) / 1e6
+            streamed = peak_mb(lambda: SyntheticUser(f"{size}-user", SIZES[size]).write(out_dir))
+            materialized = peak_mb(lambda: [SyntheticUser(f"{size}-user", SIZES[size]).payload(tool) for tool in TOOLS])
+            print(f"{size:8s} {total:6.2f} {elapsed:6.2f} {total / elapsed:5.1f} {streamed:14.1f} {materialized:17.1f}")
+
+    print(f"\n{'size':8s} {'bank txns':>9s} {'decode ms':>9s} {'dashboard ms':>12s} {'reduce bank ms':>14s}")
+    for size in args.sizes:
+        start = time.perf_counter()
+        responses = {tool: parse_response(tool, payloads[size][tool]) for tool in SOURCES}
+        decode = time.perf_counter() - start
+        start = time.perf_counter()
+        Dashboard(f"{size}-user", responses).build()
+        dashboard = time.perf_counter() - start
+        start = time.perf_counter()
+        reducer.reduce("fetch_bank_transactions", payloads[size]["fetch_bank_transactions"])
+        reduce = time.perf_counter() - start
+        print(f"{size:8s} {SIZES[size].bank_txns:9d} {decode * 1000:9.1f} {dashboard * 1000:12.1f} {reduce * 1000:14.1f}")
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        start = time.perf_counter()
+        written = write_users(data_dir, args.users)
+        generate = time.perf_counter() - start
+        start = time.perf_counter()
+        store = FixtureStore(data_dir)
+        load = time.perf_counter() - start
+        print(f"\n{args.users} fixture-size users: generated {written / 1e6:.1f} MB in {generate:.1f}s, loaded by local_mcp in {load:.2f}s")
+
+        server = LocalMCPServer(store=store).start()
+        phones = phone_numbers(args.users)
+        for phone in phones:
+            server.login(f"session-{phone}", phone)
+        transport = MCPTransport(base_url=server.url)
+        rng = random.Random(0)
+        calls = [(f"session-{rng.choice(phones)}", rng.choice(TOOLS)) for _ in range(args.calls)]
+
+        def call(request):
+            session_id, tool_name = request
+            return transport.request("tools/call", session_id, params={"name": tool_name, "arguments": {}})["result"]["isError"]
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            errors = sum(pool.map(call, calls))
+        elapsed = time.perf_counter() - start
+        print(f"{args.calls} tools/call over {args.users} users, workers={args.workers}: {args.calls / elapsed:.1f} calls/s, {errors} errors")
+        transport.close()
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
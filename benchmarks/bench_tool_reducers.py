@@ -0,0 +1,45 @@
+"""
+Size of the tool results sent back to Gemini, before and after the per-tool
+reducers in backend.tool_reducers, over every fixture in the fi-mcp-dev
+test_data_dir. Also reports the time spent reducing.
+
+Run from the root of the repo:
+    python -m benchmarks.bench_tool_reducers
+"""
+import argparse
+import time
+from pathlib import Path
+from backend.tool_reducers import ToolResultReducer
+
+TEST_DATA_DIR = Path("utils/fi-mcp-dev/test_data_dir")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data-dir", default=str(TEST_DATA_DIR))
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payloads = [
+        (path.stem, path.read_text())
+        for path in sorted(Path(args.data_dir).glob("*/*.json"))
+    ]
+    reducer = ToolResultReducer()
+    for tool_name, text in payloads:
+        reducer.reduce(tool_name, text)
+
+    print(f"{'tool':26s} {'calls':>5s} {'raw KB':>8s} {'reduced KB':>10s} {'ratio':>6s} {'tokens saved':>12s}")
+    for tool_name, stats in sorted(reducer.stats().items()):
+        print(
+            f"{tool_name:26s} {stats['calls']:5d} {stats['raw_bytes'] / 1024:8.1f} "
+            f"{stats['reduced_bytes'] / 1024:10.1f} {stats['ratio']:6.2f} {stats['saved_tokens']:12d}"
+        )
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for tool_name, text in payloads:
+            reducer.reduce(tool_name, text)
+    elapsed = time.perf_counter() - start
+    print(f"reduce time: {elapsed / (args.repeat * len(payloads)) * 1e6:.1f} us per result")
+
+if __name__ == "__main__":
+    main()
@@ -5,10 +5,19 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import urllib.parse
+import json
+import os
 import requests
+from requests.adapters import HTTPAdapter
 from tools import create_uuid_from_string
 
-FAST_API_URL = "http://127.0.0.1:8000/"
+FAST_API_URL = os.getenv("FIFI_API_URL", "http://127.0.0.1:8000/")
+# (connect, read) timeouts in seconds for backend calls; replies stream for longer.
+REQUEST_TIMEOUT = (3.05, 60)
+STREAM_TIMEOUT = (3.05, 300)
+# Seconds before the dashboard is fetched again; the backend only rebuilds it when the data changed.
+DASHBOARD_TTL = 60
+MCP_SESSION_ID = "mcp-session-f6f79a50-86f1-f092-3b1d-fc3c603b6e36"
 global session_id
 
 st.set_page_config(
@@ -30,7 +39,12 @@ banknote_svg = """
   <text x="582" y="175" fill="#7cf7e6" fill-opacity="0.03" font-size="120" font-family="monospace" font-weight="bold">₹</text>
 </svg>
 """
-svg_url = f"data:image/svg+xml;utf8,{urllib.parse.quote(banknote_svg)}"
+
+@st.cache_data(show_spinner=False)
+def svg_data_url(svg: str) -> str:
+    return f"data:image/svg+xml;utf8,{urllib.parse.quote(svg)}"
+
+svg_url = svg_data_url(banknote_svg)
 st.markdown(f"""
 <style>
 body, .stApp {{
@@ -287,40 +301,171 @@ if "chat_history" not in st.session_state:
     st.session_state.chat_history = []
 if "chat_input" not in st.session_state:
     st.session_state.chat_input = ""
+if "pending_message" not in st.session_state:
+    st.session_state.pending_message = None
 if "immersive_chart" in st.session_state:
     del st.session_state["immersive_chart"]
 
-# ---------- Mock Data ----------\
-    
-def get_financial_data():
-    return {
-        "net_worth": 45320,
-        "monthly_spends": {
-            "Jan": {"Shopping": 4500, "Food": 3000, "Bills": 2000, "Entertainment": 1200},
-            "Feb": {"Shopping": 4000, "Food": 2800, "Bills": 2100, "Entertainment": 1300},
-            "Mar": {"Shopping": 4800, "Food": 2900, "Bills": 1900, "Entertainment": 1500},
-            "Apr": {"Shopping": 5000, "Food": 3100, "Bills": 1800, "Entertainment": 1350},
-            "May": {"Shopping": 4700, "Food": 3000, "Bills": 2200, "Entertainment": 1600},
-            "Jun": {"Shopping": 5200, "Food": 3200, "Bills": 2100, "Entertainment": 1400},
-        }
-    }
-    
-def classify_behavior(last_month_spends):
-    total = sum(last_month_spends.values()) if last_month_spends else 1
-    shopping_pct = last_month_spends.get("Shopping", 0) / total
-    food_pct = last_month_spends.get("Food", 0) / total
-    if shopping_pct > 0.4: return "Shopaholic"
-    elif food_pct > 0.35: return "Foodie"
-    elif total < 9000: return "Saver"
-    else: return "Balanced"
-    
-def get_investment_data():
-    best = [("S&P 500 ETF", 17.5), ("Gold", 12.2), ("Corporate Bonds", 8.9)]
-    worst = [("Crypto Fund", -11.0), ("Emerging Markets", -4.5), ("Startups Fund", -1.2)]
-    return best, worst
-
-def get_credit_usage():
-    return [("Jan", 8200), ("Feb", 7300), ("Mar", 9500), ("Apr", 9100), ("May", 8650), ("Jun", 9900)]
+def add_message(role: str, message: str):
+    """
+    Append a chat message with its HTML, rendered once instead of on every rerun.
+    """
+    css_class = "my-user" if role == "user" else "my-bot"
+    st.session_state.chat_history.append(
+        {"role": role, "message": message, "html": f'<div class="{css_class}">{message}</div>'}
+    )
+
+# ---------- Backend ----------
+
+@st.cache_resource
+def http_session() -> requests.Session:
+    """
+    One pooled HTTP session to the backend for the whole Streamlit server.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+@st.cache_data(ttl=DASHBOARD_TTL, show_spinner=False)
+def fetch_dashboard(session_id: str) -> dict:
+    # Raises on failure, so errors are not cached.
+    resp = http_session().get(FAST_API_URL+f"dashboard/{session_id}", timeout=REQUEST_TIMEOUT)
+    resp.raise_for_status()
+    return resp.json()
+
+def get_dashboard(session_id: str) -> dict:
+    """
+    Dashboard data computed by the backend from the user's MCP data.
+    """
+    try:
+        return fetch_dashboard(session_id)
+    except requests.RequestException as e:
+        return {"error": str(e)}
+
+# ---------- Dashboard Figures ----------
+
+RADAR_CATEGORIES = [
+    "Essentials",
+    "Upskill/Education",
+    "Impulse",
+    "Savings",
+    "Lifestyle & Leisure",
+    "Debt Repayment"
+]
+
+RADAR_HOVER_TEXTS = [
+    "Everyday necessities like rent, groceries, utilities, transport, healthcare",
+    "Expenses for self-improvement, courses, books, certifications, workshops",
+    "Unplanned, spur-of-the-moment purchases influenced by emotions or promotions",
+    "Money set aside for future needs, emergencies, or financial growth",
+    "Entertainment, hobbies, travel, dining out, streaming services",
+    "Payments towards loans, credit cards, mortgages, or borrowed funds"
+]
+
+def _return_range(values) -> list:
+    values = list(values)
+    return [min(min(values, default=0) * 1.15, 0), max(max(values, default=0) * 1.15, 0)]
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def build_figures(version: str, _dashboard: dict) -> dict:
+    """
+    Every dashboard chart, built once per dashboard data version.
+    """
+    pie_colors = px.colors.sequential.Blues_r[:-2]
+    line_palette = px.colors.sequential.Blues_r + px.colors.sequential.Greens_r
+    spends = _dashboard.get("spends", {})
+    df_spends = pd.DataFrame(spends.get("values", []), index=spends.get("months", []), columns=spends.get("categories"))
+    df_spends.index.name = "Month"
+    last_month_spends = pd.Series(spends.get("latest", {}).get("categories", {}), dtype=float)
+    credit = _dashboard.get("credit", {})
+    investments = _dashboard.get("investments", {})
+    figures = {}
+
+    pie_data = last_month_spends[last_month_spends > 0]
+    fig_pie = px.pie(
+        values=pie_data.values,
+        names=pie_data.index,
+        color_discrete_sequence=pie_colors,
+        height=270,
+        width=350,
+        template="plotly_dark"
+    )
+    fig_pie.update_traces(textinfo="label+percent", pull=[0.07]*len(pie_data), textfont_size=14)
+    fig_pie.update_layout(margin=dict(l=0, r=0, t=10, b=0))
+    figures["pie"] = fig_pie
+
+    spend_values = last_month_spends.reindex(RADAR_CATEGORIES, fill_value=0).to_numpy()
+    categories_closed = RADAR_CATEGORIES + [RADAR_CATEGORIES[0]]
+    values_closed = np.append(spend_values, spend_values[0])
+    hover_texts_closed = RADAR_HOVER_TEXTS + [RADAR_HOVER_TEXTS[0]]
+    fig_radar = go.Figure()
+    fig_radar.add_trace(go.Scatterpolar(
+        r=values_closed,
+        theta=categories_closed,
+        fill='toself',
+        hoverinfo='text',
+        text=hover_texts_closed,
+        name='Spending Behavior'
+    ))
+    fig_radar.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, max(max(values_closed) * 1.2, 1)]
+            )
+        ),
+        showlegend=False,
+        template="plotly_dark",
+        height=270,
+        width=350,
+        margin=dict(l=10, r=10, t=10, b=10)
+    )
+    figures["radar"] = fig_radar
+
+    fig_line = go.Figure()
+    for i, col in enumerate(df_spends.columns):
+        fig_line.add_trace(go.Scatter(
+            x=df_spends.index, y=df_spends[col], mode='lines+markers',
+            name=col,
+            line=dict(color=line_palette[i % len(line_palette)], width=3),
+            marker=dict(color=line_palette[i % len(line_palette)], size=9)
+        ))
+    fig_line.update_layout(
+        template="plotly_dark",
+        height=220, width=350, xaxis_title="Month", yaxis_title="Spend (₹)",
+        legend_title_text='Category',
+        margin=dict(l=0, r=0, t=30, b=0)
+    )
+    figures["trend"] = fig_line
+
+    df_credit = pd.DataFrame({"Month": credit.get("months", []), "Credit Usage (₹)": credit.get("payments", [])})
+    fig_credit = px.bar(
+        df_credit, x="Month", y="Credit Usage (₹)",
+        height=220, width=350,
+        color="Credit Usage (₹)", color_continuous_scale="Blues",
+        template="plotly_dark"
+    )
+    fig_credit.update_traces(marker_line_color='#eef6fa', marker_line_width=1.2)
+    fig_credit.update_layout(
+        margin=dict(l=30, r=10, t=10, b=0), showlegend=False
+    )
+    figures["credit"] = fig_credit
+
+    for name, rows, scale in (("worst", investments.get("worst", []), "reds"), ("best", investments.get("best", []), "greens")):
+        df_returns = pd.DataFrame(rows, columns=["Investment", "Return (%)"]).sort_values("Return (%)")
+        fig_returns = px.bar(
+            df_returns, x="Return (%)", y="Investment", orientation='h',
+            color="Return (%)", color_continuous_scale=scale,
+            height=130, width=220, range_x=_return_range(df_returns["Return (%)"]),
+            template="plotly_dark"
+        )
+        fig_returns.update_layout(
+            margin=dict(l=10, r=10, t=20, b=20), coloraxis_showscale=False
+        )
+        figures[name] = fig_returns
+    return figures
 
 col_settings, col_insights, col_chat = st.columns([0.5, 6, 3], gap="large")
 
@@ -339,192 +484,135 @@ with col_settings:
 
     st.markdown('</div>', unsafe_allow_html=True)
 
-data = get_financial_data()
-net_worth = data["net_worth"]
-monthly_spends = data["monthly_spends"]
-df_spends = pd.DataFrame(monthly_spends).T
-df_spends.index.name = "Month"
-df_spends.fillna(0, inplace=True)
-last_month = df_spends.index[-1]
-behavior = classify_behavior(df_spends.loc[last_month].to_dict())
-
-pie_colors = px.colors.sequential.Blues_r[:-2]
-line_palette = px.colors.sequential.Blues_r + px.colors.sequential.Greens_r
+dashboard = get_dashboard(MCP_SESSION_ID)
+net_worth = dashboard.get("net_worth", {}).get("total")
+behavior = dashboard.get("behavior", "Unknown")
+credit = dashboard.get("credit", {})
+figures = build_figures(dashboard.get("version", ""), dashboard)
 
 with col_insights:
-    st.markdown(f"<h2>💰 Net Worth: ₹{net_worth:,}</h2>", unsafe_allow_html=True)
+    if "error" in dashboard:
+        st.warning(f"Could not load your dashboard: {dashboard['error']}")
+    net_worth_text = f"₹{net_worth:,.0f}" if net_worth is not None else "unavailable"
+    st.markdown(f"<h2>💰 Net Worth: {net_worth_text}</h2>", unsafe_allow_html=True)
     st.markdown(f"<h4 style='color: #82b1ff;'>📝 Your Behavior Summary: <em>{behavior}</em></h4>", unsafe_allow_html=True)
     st.markdown("---")
 
     col1, col2 = st.columns(2)
     with col1:
         st.markdown("##### 📊 Monthly Spend by Category")
-        pie_data = df_spends.loc[last_month]
-        fig_pie = px.pie(
-            values=pie_data.values,
-            names=pie_data.index,
-            color_discrete_sequence=pie_colors,
-            height=270,
-            width=350,
-            template="plotly_dark"
-        )
-        fig_pie.update_traces(textinfo="label+percent", pull=[0.07]*len(pie_data), textfont_size=14)
-        fig_pie.update_layout(margin=dict(l=0, r=0, t=10, b=0))
-        st.plotly_chart(fig_pie, use_container_width=True)
-    
-    with col2:
-        categories = [
-            "Essentials",
-            "Upskill/Education",
-            "Impulse",
-            "Savings",
-            "Lifestyle & Leisure",
-            "Debt Repayment"
-        ]
-
-        hover_texts = [
-            "Everyday necessities like rent, groceries, utilities, transport, healthcare",
-            "Expenses for self-improvement, courses, books, certifications, workshops",
-            "Unplanned, spur-of-the-moment purchases influenced by emotions or promotions",
-            "Money set aside for future needs, emergencies, or financial growth",
-            "Entertainment, hobbies, travel, dining out, streaming services",
-            "Payments towards loans, credit cards, mortgages, or borrowed funds"
-        ]
-
-        np.random.seed(42)
-        spend_values = np.random.randint(1_000, 10_000, size=len(categories))
-
-        categories_closed = categories + [categories[0]]
-        values_closed = np.append(spend_values, spend_values[0])
-        hover_texts_closed = hover_texts + [hover_texts[0]]
-
-        fig = go.Figure()
-
-        fig.add_trace(go.Scatterpolar(
-            r=values_closed,
-            theta=categories_closed,
-            fill='toself',
-            hoverinfo='text',
-            text=hover_texts_closed,
-            name='Spending Behavior'
-        ))
-
-        fig.update_layout(
-            polar=dict(
-                radialaxis=dict(
-                    visible=True,
-                    range=[0, max(values_closed) * 1.2]
-                )
-            ),
-            showlegend=False,
-            template="plotly_dark",
-            height=270,
-            width=350,
-            margin=dict(l=10, r=10, t=10, b=10)
-        )
+        st.plotly_chart(figures["pie"], use_container_width=True)
 
+    with col2:
         st.markdown("##### 🕸️ Spending Behavior Classification")
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(figures["radar"], use_container_width=True)
 
 
     col3, col4 = st.columns(2)
 
     with col3:
         st.markdown("##### 📈 Monthly Spending Trends")
-        fig_line = go.Figure()
-        for i, col in enumerate(df_spends.columns):
-            fig_line.add_trace(go.Scatter(
-                x=df_spends.index, y=df_spends[col], mode='lines+markers',
-                name=col,
-                line=dict(color=line_palette[i % len(line_palette)], width=3),
-                marker=dict(color=line_palette[i % len(line_palette)], size=9)
-            ))
-        fig_line.update_layout(
-            template="plotly_dark",
-            height=220, width=350, xaxis_title="Month", yaxis_title="Spend (₹)",
-            legend_title_text='Category',
-            margin=dict(l=0, r=0, t=30, b=0)
-        )
-        st.plotly_chart(fig_line, use_container_width=True)
+        st.plotly_chart(figures["trend"], use_container_width=True)
 
 
     with col4:
         st.markdown("##### 💳 Credit Usage Till Date")
-        months, usage = zip(*get_credit_usage())
-        df_credit = pd.DataFrame({"Month": months, "Credit Usage (₹)": usage})
-        fig_credit = px.bar(
-            df_credit, x="Month", y="Credit Usage (₹)",
-            height=220, width=350,
-            color="Credit Usage (₹)", color_continuous_scale="Blues",
-            template="plotly_dark"
-        )
-        fig_credit.update_traces(marker_line_color='#eef6fa', marker_line_width=1.2)
-        fig_credit.update_layout(
-            margin=dict(l=30, r=10, t=10, b=0), showlegend=False
-        )
-        st.plotly_chart(fig_credit, use_container_width=True)
+        st.plotly_chart(figures["credit"], use_container_width=True)
+        if credit.get("utilization") is not None:
+            st.caption(f"Card utilization: {credit['utilization']:.1%} of ₹{credit['limit']:,.0f}")
 
 
     col5, col6 = st.columns(2)
-    best, worst = get_investment_data()
     with col5:
         st.markdown("##### 📉 Top 3 Worst Investments")
-        df_worst = pd.DataFrame(worst, columns=["Investment", "Return (%)"]).sort_values("Return (%)")
-        fig_worst = px.bar(
-            df_worst, x="Return (%)", y="Investment", orientation='h',
-            color="Return (%)", color_continuous_scale="reds",
-            height=130, width=220, range_x=[min(df_worst["Return (%)"]) * 1.15, 0],
-            template="plotly_dark"
-        )
-        fig_worst.update_layout(
-            margin=dict(l=10, r=10, t=20, b=20), coloraxis_showscale=False
-        )
-        st.plotly_chart(fig_worst, use_container_width=True)
+        st.plotly_chart(figures["worst"], use_container_width=True)
     with col6:
         st.markdown("##### 📈 Top 3 Best Investments")
-        df_best = pd.DataFrame(best, columns=["Investment", "Return (%)"]).sort_values("Return (%)")
-        fig_best = px.bar(
-            df_best, x="Return (%)", y="Investment", orientation='h',
-            color="Return (%)", color_continuous_scale="greens",
-            height=130, width=220, range_x=[0, max(df_best["Return (%)"]) * 1.15],
-            template="plotly_dark"
-        )
-        fig_best.update_layout(
-            margin=dict(l=10, r=10, t=20, b=20), coloraxis_showscale=False
-        )
-        st.plotly_chart(fig_best, use_container_width=True)
+        st.plotly_chart(figures["best"], use_container_width=True)
 
-with col_chat:
-    st.markdown('<div class="column-gap-left">', unsafe_allow_html=True)
-    st.markdown('<div style="text-align:center;"><h2>💬 Chat with FiFi</h2></div>', unsafe_allow_html=True)
-    if not st.session_state.AuthDone:
-        resp = requests.post(FAST_API_URL+"init_gemini/", json={"session_id": "mcp-session-f6f79a50-86f1-f092-3b1d-fc3c603b6e36"}).json()
-        st.session_state.chat_history.append({"role": "bot", "message": resp["text"]})
+def init_chat():
+    try:
+        resp = http_session().post(FAST_API_URL+"init_gemini/", json={"session_id": MCP_SESSION_ID}, timeout=REQUEST_TIMEOUT)
+        resp.raise_for_status()
+        add_message("bot", resp.json()["text"])
         st.session_state.AuthDone = True
+    except (requests.RequestException, KeyError, ValueError) as e:
+        add_message("bot", f"Error: could not reach FiFi ({e})")
+
+def stream_reply(text: str, placeholder) -> str:
+    """
+    Stream the reply from the backend's SSE endpoint into `placeholder`.
+    """
+    reply = ""
+    event = None
+    try:
+        with http_session().post(
+            FAST_API_URL+"send_message_stream/",
+            json={"session_id": MCP_SESSION_ID, "msg": text},
+            stream=True,
+            timeout=STREAM_TIMEOUT,
+        ) as resp:
+            resp.raise_for_status()
+            for line in resp.iter_lines(decode_unicode=True):
+                if line.startswith("event: "):
+                    event = line[len("event: "):]
+                    continue
+                if not line.startswith("data: "):
+                    continue
+                data = json.loads(line[len("data: "):])
+                if event == "token":
+                    reply += data["text"]
+                    placeholder.markdown(f'<div class="my-bot">{reply}</div>', unsafe_allow_html=True)
+                elif event == "tool":
+                    placeholder.markdown(
+                        f'<div class="my-bot">{reply}<br><em>calling {data["name"]}…</em></div>',
+                        unsafe_allow_html=True
+                    )
+                elif event == "error":
+                    reply = with_error(reply, data["detail"])
+    except (requests.RequestException, ValueError) as e:
+        reply = with_error(reply, e)
+    return reply
+
+def with_error(reply: str, error) -> str:
+    """
+    Append an error to the part of the reply already shown, so a reply cut
+    short does not look complete.
+    """
+    return f"{reply}<br><br>Error: {error}" if reply else f"Error: {error}"
+
+def handle_enter():
+    text = st.session_state.chat_input.strip()
+    if text:
+        add_message("user", text)
+        st.session_state.pending_message = text
+    st.session_state.chat_input = ""
+
+@st.fragment
+def chat_pane():
+    """
+    The chat column. Chat interactions rerun only this fragment, not the dashboard.
+    """
+    if not st.session_state.AuthDone:
+        init_chat()
     # st.stop()
     prompts = ["How did I spend this weekend?", "Show me top expenses", "Suggest a saving goal"]
     prompt_cols = st.columns(len(prompts))
     for i, prompt in enumerate(prompts):
         with prompt_cols[i]:
             if st.button(prompt, key=f"prompt_{i}"):
-                st.session_state.chat_history.append({"role": "user", "message": prompt})
-                resp = requests.post(FAST_API_URL+"send_message/", json={"msg": prompt}).json()
-                st.session_state.chat_history.append({"role": "bot", "message": resp["text"]})
-    chat_html = '<div class="scrollbox">'
-    for msg in st.session_state.chat_history:
-        if msg["role"] == "user":
-            chat_html += f'<div class="my-user">{msg["message"]}</div>'
-        else:
-            chat_html += f'<div class="my-bot">{msg["message"]}</div>'
-    chat_html += "</div>"
-    st.markdown(chat_html, unsafe_allow_html=True)
-    def handle_enter():
-        text = st.session_state.chat_input.strip()
-        if text:
-            st.session_state.chat_history.append({"role": "user", "message": text})
-            resp = requests.post(FAST_API_URL+"send_message/", json={"msg": text}).json()
-            st.session_state.chat_history.append({"role": "bot", "message": resp["text"]})
-        st.session_state.chat_input = ""
+                add_message("user", prompt)
+                st.session_state.pending_message = prompt
+    # Each message's HTML was rendered when it was added.
+    chat_html = "".join(msg["html"] for msg in st.session_state.chat_history)
+    st.markdown(f'<div class="scrollbox">{chat_html}</div>', unsafe_allow_html=True)
+
+    if st.session_state.pending_message:
+        text = st.session_state.pending_message
+        st.session_state.pending_message = None
+        reply = stream_reply(text, st.empty())
+        add_message("bot", reply)
+
     st.text_input(
         "Type your message:",
         key="chat_input",
@@ -532,5 +620,9 @@ with col_chat:
         label_visibility="collapsed",
         on_change=handle_enter
     )
-    
+
+with col_chat:
+    st.markdown('<div class="column-gap-left">', unsafe_allow_html=True)
+    st.markdown('<div style="text-align:center;"><h2>💬 Chat with FiFi</h2></div>', unsafe_allow_html=True)
+    chat_pane()
     st.markdown('</div>', unsafe_allow_html=True)
@@ -6,6 +6,7 @@ import os
 from google.genai import types
 import json
 from pathlib import Path
+from backend.mcp_responses import LoginRequired, parse_response
 
 
 API_KEY = os.getenv("GOOGLE_AI_STUDIO_API_KEY")
@@ -43,9 +44,9 @@ async def main():
                     tools = await session.list_tools()
                     # Check if login is required
                     res = await session.call_tool("fetch_bank_transactions", {})
-                    res_dict: dict = eval(res.content[0].text)
-                    if res_dict.get("status") == "login_required":
-                        login_url = res_dict["login_url"]
+                    res = parse_response("fetch_bank_transactions", res.content[0].text, res.isError)
+                    if isinstance(res, LoginRequired):
+                        login_url = res.login_url
                         print("Please open the following login URL in your browser:")
                         print(login_url)
 
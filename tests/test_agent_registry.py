@@ -0,0 +1,102 @@
+import asyncio
+import threading
+from backend.agent_registry import AgentRegistry
+
+class FakeAgent:
+    """
+    Stands in for `uncontextual_gemini_client.agent`: a turn holds `lock`
+    and appends to `history`; `update_fs` persists what is there.
+    """
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.lock = threading.Lock()
+        self.history = []
+        self.persisted = []
+
+    def update_fs(self):
+        self.persisted = list(self.history)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def test_lru_eviction_skips_agent_mid_turn():
+    released = []
+    agents = AgentRegistry(FakeAgent, capacity=2, on_evict=released.append)
+    busy = agents.get_or_create("a")
+    agents.get_or_create("b")
+    with busy.lock:
+        busy.history.append("question")
+        # "a" is least recently used, but mid-turn: "b" goes instead.
+        agents.get_or_create("c")
+        assert "a" in agents and "b" not in agents
+        busy.history.append("answer")
+    assert released == ["b"]
+    agents.get_or_create("d")
+    assert "a" not in agents
+    assert busy.persisted == ["question", "answer"]
+    assert released == ["b", "a"]
+
+def test_registry_exceeds_capacity_while_every_agent_is_busy():
+    agents = AgentRegistry(FakeAgent, capacity=1)
+    busy = agents.get_or_create("a")
+    with busy.lock:
+        agents.get_or_create("b")
+        assert len(agents) == 2
+    agents.get_or_create("c")
+    assert len(agents) == 1 and "c" in agents
+
+def test_idle_eviction_waits_for_turn_to_finish():
+    clock = FakeClock()
+    released = []
+    agents = AgentRegistry(FakeAgent, idle_timeout=10, clock=clock, on_evict=released.append)
+    busy = agents.get_or_create("a")
+    agents.get_or_create("b")
+    with busy.lock:
+        clock.now = 60
+        busy.history.append("slow answer")
+        assert agents.sweep() == 1
+        assert "a" in agents and released == ["b"]
+    assert agents.sweep() == 1
+    assert busy.persisted == ["slow answer"]
+    assert released == ["b", "a"]
+
+def test_async_lock_held_by_event_loop_counts_as_busy():
+    agents = AgentRegistry(FakeAgent, capacity=1)
+
+    async def turn():
+        agent = agents.get_or_create("a")
+        agent.lock = asyncio.Lock()
+        async with agent.lock:
+            # As in the FastAPI handlers, the registry runs in a worker thread.
+            await asyncio.to_thread(agents.get_or_create, "b")
+            assert "a" in agents
+
+    asyncio.run(turn())
+
+def test_explicit_evict_waits_for_turn_to_finish():
+    released = []
+    agents = AgentRegistry(FakeAgent, on_evict=released.append)
+    busy = agents.get_or_create("a")
+    with busy.lock:
+        assert not agents.evict("a")
+    assert released == []
+    assert agents.evict("a")
+    assert released == ["a"]
+
+def test_session_recreated_during_flush_is_not_released():
+    released = []
+    agents = AgentRegistry(FakeAgent, capacity=1, on_evict=released.append)
+    old = agents.get_or_create("a")
+
+    def update_fs():
+        # A request for "a" arrives while its evicted agent is being flushed.
+        agents.get_or_create("a")
+
+    old.update_fs = update_fs
+    agents.get_or_create("b")
+    assert "a" in agents and agents.get("a") is not old
+    assert released == ["b"]
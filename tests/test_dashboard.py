@@ -0,0 +1,37 @@
+import json
+from datetime import date
+from pathlib import Path
+from backend.dashboard import SOURCES, Dashboard
+from backend.mcp_responses import parse_response
+from backend.mf_portfolio import MfPortfolio, navs_from_net_worth
+
+TEST_DATA_DIR = Path("utils/fi-mcp-dev/test_data_dir")
+
+def fixture_responses(phone: str) -> dict:
+    return {tool: parse_response(tool, (TEST_DATA_DIR / phone / f"{tool}.json").read_text()) for tool in SOURCES}
+
+def ranked_today(phone: str, as_of: date) -> list:
+    """
+    Every scheme with its XIRR valued on `as_of`, best first.
+    """
+    data = TEST_DATA_DIR / phone
+    portfolio = MfPortfolio.from_payload((data / "fetch_mf_transactions.json").read_text())
+    navs = navs_from_net_worth(json.loads((data / "fetch_net_worth.json").read_text()))
+    schemes = portfolio.summary(navs, as_of=as_of.isoformat())["schemes"]
+    return [[scheme["scheme"], scheme["xirr_pct"]] for scheme in sorted(schemes, key=lambda s: s["xirr_pct"], reverse=True)]
+
+def test_investments_ranked_on_xirr_valued_today():
+    investments = Dashboard("session", fixture_responses("2222222222")).investments()
+    expected = ranked_today("2222222222", date.today())
+    assert investments["best"] == expected[:3]
+    assert investments["worst"] == expected[::-1][:3]
+
+def test_investments_valued_on_given_date():
+    investments = Dashboard("session", fixture_responses("2020202020"), as_of=date(2025, 7, 20)).investments()
+    assert investments["best"] == ranked_today("2020202020", date(2025, 7, 20))[:3]
+    assert investments["total"]["xirr_pct"] == 11.36
+
+def test_single_order_scheme_is_ranked():
+    investments = Dashboard("session", fixture_responses("3333333333")).investments()
+    assert investments["best"] == investments["worst"] == ranked_today("3333333333", date.today())
+    assert investments["best"][0][1] is not None
@@ -0,0 +1,78 @@
+import threading
+import pytest
+from backend.firestore_client import Client
+from backend.firestore_memory import MemoryFirestore
+from backend.history_store import MAX_BATCH_TURNS
+
+def turn(text: str, role: str = "user") -> dict:
+    return {"role": role, "parts": [{"text": text}]}
+
+@pytest.fixture
+def db():
+    return MemoryFirestore()
+
+def test_load_reads_user_document_once(db):
+    db.collection("users").document("1").set({"chat_context": {"goal": "car"}, "history_watermark": 0})
+    client = Client(1, db=db)
+    reads = db.reads
+    assert client.get_chat_context() == {"goal": "car"}
+    assert client.history.watermark == 0
+    assert client.get_chat_history() == []
+    assert db.reads - reads == 1
+
+def test_store_chat_state_writes_in_one_commit(db):
+    client = Client(1, db=db)
+    client.load()
+    round_trips, writes = db.round_trips, db.writes
+    client.store_chat_state([turn("hi"), turn("hello", "model")], {"goal": "car"}, summary={"text": "s", "through": 0})
+    # The transaction's watermark read, then a single commit.
+    assert db.round_trips - round_trips == 2
+    assert db.writes - writes == 3
+    doc = db.collection("users").document("1").get().to_dict()
+    assert doc == {"chat_context": {"goal": "car"}, "chat_summary": {"text": "s", "through": 0}, "history_watermark": 2}
+
+def test_append_advances_watermark(db):
+    client = Client(1, db=db)
+    assert client.history.append([turn("one"), turn("two", "model")]) == 2
+    writes = db.writes
+    assert client.history.append([turn("three")]) == 3
+    # Only the new turn and the user document are written.
+    assert db.writes - writes == 2
+    assert client.history.watermark == 3
+    assert Client(1, db=db).get_chat_history() == [turn("one"), turn("two", "model"), turn("three")]
+    assert Client(1, db=db).history.recent(1) == [turn("three")]
+
+def test_legacy_history_is_migrated_on_first_append(db):
+    db.collection("users").document("1").set({"chat_history": [turn("old")]})
+    client = Client(1, db=db)
+    assert client.get_chat_history() == [turn("old")]
+    assert client.history.append([turn("new")]) == 2
+    assert "chat_history" not in client.load()
+    assert "chat_history" not in db.collection("users").document("1").get().to_dict()
+    # The user document, then the turn documents.
+    reads = db.reads
+    assert Client(1, db=db).get_chat_history() == [turn("old"), turn("new")]
+    assert db.reads - reads == 3
+
+def test_concurrent_agents_do_not_overwrite_turns(db):
+    # Every client loaded the user document before any appended, so
+    # their cached watermarks are equally stale.
+    clients = [Client(1, db=db) for _ in range(8)]
+    for client in clients:
+        client.load()
+    threads = [
+        threading.Thread(target=client.history.append, args=([turn(f"agent {i}")],))
+        for i, client in enumerate(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    history = Client(1, db=db).get_chat_history()
+    assert sorted(item["parts"][0]["text"] for item in history) == sorted(f"agent {i}" for i in range(8))
+
+def test_long_append_is_split_across_transactions(db):
+    client = Client(1, db=db)
+    turns = [turn(str(i)) for i in range(MAX_BATCH_TURNS + 2)]
+    assert client.history.append(turns, fields={"chat_context": {}}) == len(turns)
+    assert Client(1, db=db).get_chat_history() == turns
@@ -0,0 +1,21 @@
+import json
+from backend import history_store
+from backend.history_manager import HistoryManager
+
+def turn(text: str, role: str = "user") -> dict:
+    return {"role": role, "parts": [{"text": text}]}
+
+def test_local_history_is_kept_per_user(tmp_path, monkeypatch):
+    monkeypatch.setattr(history_store, "LOCAL_USER_DIR", tmp_path)
+    history_store.local_history_store("1111111111").append([turn("mine")])
+    history_store.local_history_store("2222222222").append([turn("theirs")])
+    assert history_store.local_history_store("1111111111").load() == [turn("mine")]
+    assert (tmp_path / "2222222222" / "chat_history.jsonl").exists()
+
+def test_user_history_reads_legacy_json(tmp_path, monkeypatch):
+    monkeypatch.setattr(history_store, "LOCAL_USER_DIR", tmp_path)
+    (tmp_path / "1111111111").mkdir()
+    (tmp_path / "1111111111" / "chat_history.json").write_text(json.dumps([turn(str(i)) for i in range(30)]))
+    manager = HistoryManager(history_store.local_history_store("1111111111"), max_turns=4)
+    assert manager.build() == [turn(str(i)) for i in range(26, 30)]
+    assert manager.summary["through"] == 26
@@ -0,0 +1,85 @@
+import json
+import math
+from pathlib import Path
+import numpy as np
+import pytest
+from backend.mf_portfolio import XIRR_BOUNDS, MfPortfolio, navs_from_net_worth, xirr
+
+TEST_DATA_DIR = Path("utils/fi-mcp-dev/test_data_dir")
+
+def reference_xirr(amounts: list, years: list) -> float:
+    """
+    Plain bisection on one cash flow series, NaN without a sign change in XIRR_BOUNDS.
+    """
+    def npv(rate):
+        return sum(amount / (1 + rate) ** year for amount, year in zip(amounts, years))
+
+    low, high = XIRR_BOUNDS
+    if npv(low) * npv(high) >= 0:
+        return math.nan
+    for _ in range(200):
+        mid = (low + high) / 2
+        if (npv(mid) > 0) == (npv(low) > 0):
+            low = mid
+        else:
+            high = mid
+    return (low + high) / 2
+
+def random_series(rng: np.random.Generator) -> tuple:
+    """
+    Investments followed by redemptions, so the series has at most one root.
+    """
+    kind = rng.integers(4)
+    if kind == 0:
+        # A single flow has no rate.
+        return [-float(rng.uniform(1e3, 1e5))], [0.0]
+    n = int(rng.integers(2, 30))
+    years = np.sort(np.concatenate(([0.0], rng.uniform(0, 10, n - 1))))
+    amounts = -rng.uniform(1e3, 1e5, n)
+    if kind != 1:
+        # kind 1 stays all-negative: money in, nothing back.
+        inflows = int(rng.integers(1, min(3, n - 1) + 1))
+        amounts[-inflows:] = -amounts[-inflows:] * rng.uniform(0.3, 3.0, inflows)
+    return list(amounts), list(years)
+
+def test_batch_matches_scalar_reference():
+    rng = np.random.default_rng(0)
+    series = [random_series(rng) for _ in range(300)]
+    groups = np.concatenate([np.full(len(amounts), i) for i, (amounts, _) in enumerate(series)])
+    rates = xirr(groups, np.concatenate([s[0] for s in series]), np.concatenate([s[1] for s in series]))
+    for rate, (amounts, years) in zip(rates, series):
+        expected = reference_xirr(amounts, years)
+        if math.isnan(expected):
+            assert math.isnan(rate)
+        else:
+            assert rate == pytest.approx(expected, rel=1e-6, abs=1e-9)
+
+def test_single_and_all_negative_series_have_no_rate():
+    rates = xirr(np.array([0, 1, 1, 2, 2]), np.array([-100.0, -100.0, -50.0, -100.0, 110.0]), np.array([0, 0, 1, 0, 1.0]))
+    assert math.isnan(rates[0]) and math.isnan(rates[1])
+    assert rates[2] == pytest.approx(0.1)
+
+def test_exact_initial_guess_is_kept():
+    # Two flows: the starting rate is already the root, so the first NPV is exactly 0.
+    years = 4.6136986301369864
+    rate = xirr(np.array([0, 0]), np.array([-10027.0, 16159.32678155]), np.array([0.0, years]))[0]
+    assert rate == pytest.approx(reference_xirr([-10027.0, 16159.32678155], [0.0, years]), rel=1e-6)
+
+def fixture_portfolio(phone: str) -> tuple:
+    data = TEST_DATA_DIR / phone
+    portfolio = MfPortfolio.from_payload((data / "fetch_mf_transactions.json").read_text())
+    return portfolio, navs_from_net_worth(json.loads((data / "fetch_net_worth.json").read_text()))
+
+def test_single_order_scheme_is_valued_today():
+    portfolio, navs = fixture_portfolio("3333333333")
+    summary = portfolio.summary(navs)
+    assert summary["as_of"] == str(np.datetime64("today", "D"))
+    scheme = summary["schemes"][0]
+    assert scheme["orders"] == 1
+    years = (np.datetime64(summary["as_of"]) - portfolio.dates[0]).astype(float) / 365.0
+    expected = reference_xirr([-scheme["invested"], float(portfolio.current_units()[0] * portfolio.current_navs(navs)[0])], [0.0, years])
+    assert scheme["xirr_pct"] == pytest.approx(expected * 100, abs=0.01)
+
+def test_explicit_valuation_date():
+    portfolio, navs = fixture_portfolio("2020202020")
+    assert portfolio.summary(navs, as_of="2025-07-20")["total"]["xirr_pct"] == pytest.approx(11.36)
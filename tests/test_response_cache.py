@@ -0,0 +1,49 @@
+import pytest
+from backend.response_cache import ResponseCache
+
+class FakeToolResults:
+    """
+    Stands in for tool_cache: every tool has a cached result at `versions[tool]`.
+    """
+    def __init__(self):
+        self.versions = {}
+
+    def version(self, session_id: str, tool_name: str):
+        return self.versions.get(tool_name, "v1")
+
+@pytest.fixture
+def tool_results():
+    return FakeToolResults()
+
+@pytest.fixture
+def cache(tool_results):
+    return ResponseCache(tool_results=tool_results)
+
+def test_near_duplicate_shares_answer(cache):
+    assert cache.put("u1", "s1", "What's my net worth?", ["fetch_net_worth"], "₹10,00,000")
+    assert cache.get("u1", "s1", "what is my net worth") == "₹10,00,000"
+    assert cache.get("u1", "s1", "Tell me my net worth") == "₹10,00,000"
+
+def test_back_reference_is_not_replayed(cache):
+    cache.put("u1", "s1", "Show me top expenses", ["fetch_bank_transactions"], "Rent, groceries")
+    assert not cache.put("u1", "s1", "why", ["fetch_bank_transactions"], "Because rent is due")
+    assert cache.get("u1", "s1", "why") is None
+    assert cache.get("u1", "s1", "show me more of those") is None
+
+def test_too_few_content_words(cache):
+    assert not cache.put("u1", "s1", "ok", ["fetch_net_worth"], "Anything else?")
+    assert cache.get("u1", "s1", "and now?") is None
+
+def test_future_tense_does_not_match_present(cache):
+    cache.put("u1", "s1", "What's my net worth?", ["fetch_net_worth"], "₹10,00,000")
+    assert cache.get("u1", "s1", "what will my net worth be") is None
+
+def test_different_intent_does_not_match(cache):
+    cache.put("u1", "s1", "How are my mutual funds doing?", ["fetch_mf_transactions"], "Up 12% overall")
+    assert cache.get("u1", "s1", "which mutual funds are doing badly") is None
+
+def test_changed_tool_result_invalidates(cache, tool_results):
+    cache.put("u1", "s1", "What is my EPF balance?", ["fetch_epf_details"], "₹2,00,000")
+    tool_results.versions["fetch_epf_details"] = "v2"
+    assert cache.get("u1", "s1", "What is my EPF balance?") is None
+    assert cache.stats()["invalidations"] == 1
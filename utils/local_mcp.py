@@ -0,0 +1,325 @@
+"""
+In-memory Python stand-in for the fi-mcp-dev server.
+
+Serves the same tools, fixtures and login flow as `utils/fi-mcp-dev`
+(AuthMiddleware's session -> phone number map, login_required until the
+session logs in, "phone number is not allowed" for unknown numbers), but
+reads test_data_dir once at start-up and answers every tools/call from
+pre-encoded JSON, so nothing touches the disk while serving. Latency and
+error profiles can be injected to exercise the client under slower or
+flaky servers.
+
+Start it on the port the backend expects:
+    python -m utils.local_mcp --profile lan
+"""
+import argparse
+import html
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+FI_MCP_DIR = Path(__file__).resolve().parent / "fi-mcp-dev"
+TEST_DATA_DIR = FI_MCP_DIR / "test_data_dir"
+TOOL_INFO = FI_MCP_DIR / "pkg" / "tool_info.go"
+STATIC_DIR = FI_MCP_DIR / "static"
+ENDPOINT = "/mcp/stream"
+PROTOCOL_VERSION = "2025-03-26"
+SERVER_INFO = {"name": "Hackathon MCP", "version": "0.1.0"}
+WHOAMI = {"name": "whoami", "description": "Get current authenticated user information"}
+LOGIN_REQUIRED = (
+    '{"status": "login_required","login_url": "%s","message": "Needs to login first by going to the login url.'
+    '\\nShow the login url as clickable link if client supports it. Otherwise display the URL for users to copy '
+    'and paste into a browser. \\nAsk users to come back and let you know once they are done with login in their browser"}'
+)
+
+def load_tools(tool_info: Path = TOOL_INFO) -> list:
+    """
+    The tools fi-mcp-dev registers: whoami and everything in pkg.ToolList.
+    Args:
+        tool_info (Path): Path of fi-mcp-dev's pkg/tool_info.go.
+    Returns:
+        list: {"name", "description", "inputSchema"} for every tool.
+    """
+    found = re.findall(r'Name:\s*"([^"]+)",\s*Description:\s*"([^"]+)"', tool_info.read_text())
+    tools = [WHOAMI] + [{"name": name, "description": description} for name, description in found]
+    return [{**tool, "inputSchema": {"type": "object", "properties": {}}} for tool in tools]
+
+def encode_result(text: str, is_error: bool = False) -> bytes:
+    """
+    A CallToolResult with one text content, encoded once as JSON.
+    """
+    return json.dumps({"content": [{"type": "text", "text": text}], "isError": is_error}).encode()
+
+class FixtureStore:
+    """
+    Every fixture in test_data_dir, read once and kept as the encoded
+    tools/call result it is served as.
+    """
+    def __init__(self, data_dir: Path = TEST_DATA_DIR, tools: list | None = None):
+        """
+        Args:
+            data_dir (Path): Directory with one folder of <tool>.json files per phone number.
+            tools (list): Tools to serve, defaults to `load_tools()`.
+        """
+        self.data_dir = Path(data_dir)
+        self.tools = tools if tools is not None else load_tools()
+        self.phones = sorted(path.name for path in self.data_dir.iterdir() if path.is_dir())
+        self.allowed = frozenset(self.phones)
+        self._results = {}
+        for phone in self.phones:
+            for tool in self.tools:
+                path = self.data_dir / phone / f"{tool['name']}.json"
+                if path.is_file():
+                    self._results[phone, tool["name"]] = encode_result(path.read_text())
+        self.missing = encode_result("error reading test data file", is_error=True)
+        self.not_allowed = encode_result("phone number is not allowed", is_error=True)
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def result(self, phone: str, tool_name: str) -> bytes:
+        """
+        The encoded tools/call result of a tool for a phone number.
+        """
+        if phone not in self.allowed:
+            return self.not_allowed
+        return self._results.get((phone, tool_name), self.missing)
+
+@dataclass(frozen=True)
+class Profile:
+    """
+    Delay and failures injected into every tools/call.
+
+    latency: seconds added to every call, plus up to `jitter` more at random.
+    tool_latency: per-tool seconds added on top of `latency`.
+    error_rate: share of calls answered with an isError result instead of data.
+    """
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    tool_latency: dict = field(default_factory=dict)
+
+    def delay(self, tool_name: str, rng: random.Random) -> float:
+        return self.latency + self.tool_latency.get(tool_name, 0.0) + (rng.uniform(0, self.jitter) if self.jitter else 0.0)
+
+PROFILES = {
+    "none": Profile(),
+    "lan": Profile(latency=0.002, jitter=0.001),
+    "wan": Profile(latency=0.05, jitter=0.02),
+    "slow_bank": Profile(latency=0.005, tool_latency={"fetch_bank_transactions": 0.25}),
+    "flaky": Profile(latency=0.01, jitter=0.01, error_rate=0.05),
+}
+
+class LocalMCPServer(ThreadingHTTPServer):
+    """
+    JSON-RPC over streamable HTTP on `ENDPOINT`, with the fi-mcp-dev login
+    pages on /mockWebPage and /login. Responses are always plain JSON, which
+    both MCPTransport and the MCP SDK client accept.
+    """
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, store: FixtureStore | None = None,
+                 profile: Profile = PROFILES["none"], seed: int = 0, auto_login: str | None = None):
+        """
+        Args:
+            host (str): Interface to bind.
+            port (int): Port to bind, 0 picks a free one.
+            store (FixtureStore): Fixtures to serve, defaults to the fi-mcp-dev test_data_dir.
+            profile (Profile): Latency and errors injected into tools/call.
+            seed (int): Seed of the jitter and error injection.
+            auto_login (str): Phone number every unknown session is logged in as, None to require login.
+        """
+        super().__init__((host, port), _Handler)
+        self.store = store or FixtureStore()
+        self.profile = profile
+        self.auto_login = auto_login
+        self.sessions = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.tools_list = json.dumps({"tools": self.store.tools}).encode()
+        self.calls = 0
+        self.errors_injected = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{ENDPOINT}"
+
+    def login_url(self, session_id: str) -> str:
+        return f"http://localhost:{self.server_address[1]}/mockWebPage?sessionId={session_id}"
+
+    def login(self, session_id: str, phone: str):
+        """
+        Map a session to a phone number, as POST /login does.
+        """
+        with self._lock:
+            self.sessions[session_id] = phone
+
+    def call_tool(self, session_id: str, tool_name: str) -> bytes:
+        """
+        The encoded result of a tools/call, after the profile's delay.
+        Args:
+            session_id (str): The Mcp-Session-Id of the request.
+            tool_name (str): The tool called.
+        """
+        with self._lock:
+            phone = self.sessions.get(session_id)
+            if phone is None and self.auto_login:
+                phone = self.sessions[session_id] = self.auto_login
+            self.calls += 1
+            delay = self.profile.delay(tool_name, self._rng)
+            failed = self.profile.error_rate and self._rng.random() < self.profile.error_rate
+            self.errors_injected += bool(failed)
+        if delay:
+            time.sleep(delay)
+        if phone is None:
+            return encode_result(LOGIN_REQUIRED % self.login_url(session_id))
+        if failed:
+            return encode_result(f"injected error calling {tool_name}", is_error=True)
+        if tool_name == "whoami" and phone in self.store.allowed:
+            return encode_result(json.dumps({"phoneNumber": phone, "sessionId": session_id}, separators=(",", ":")))
+        return self.store.result(phone, tool_name)
+
+    def start(self) -> "LocalMCPServer":
+        """
+        Serve on a background daemon thread; call shutdown() when done.
+        """
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+def start_local_mcp(phone: str | None = None, port: int = 0, profile: Profile | str = "none", **kwargs) -> LocalMCPServer:
+    """
+    Start a LocalMCPServer on a background thread.
+    Args:
+        phone (str): Phone number unknown sessions are logged in as, None to require login.
+        port (int): Port to bind, 0 picks a free one.
+        profile (Profile | str): A Profile or the name of one in PROFILES.
+    Returns:
+        LocalMCPServer: The running server; its `url` is the MCP endpoint.
+    """
+    profile = PROFILES[profile] if isinstance(profile, str) else profile
+    return LocalMCPServer(port=port, profile=profile, auto_login=phone, **kwargs).start()
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, body: bytes = b"", content_type: str = "application/json", headers: dict | None = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path.startswith("/mcp/"):
+            # No server-initiated messages: tell streamable HTTP clients not to listen.
+            self._reply(405, content_type="text/plain")
+        elif url.path == "/mockWebPage":
+            session_id = parse_qs(url.query).get("sessionId", [""])[0]
+            if not session_id:
+                self._reply(400, b"sessionId is required\n", "text/plain")
+                return
+            self._reply(200, self._login_page(session_id).encode(), "text/html; charset=utf-8")
+        else:
+            self._reply(404, b"404 page not found\n", "text/plain")
+
+    def do_DELETE(self):
+        self._reply(200 if self.path.startswith("/mcp/") else 404)
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        body = self._body()
+        if url.path == "/login":
+            form = parse_qs(body.decode())
+            session_id, phone = form.get("sessionId", [""])[0], form.get("phoneNumber", [""])[0]
+            if not session_id or not phone:
+                self._reply(400, b"sessionId and phoneNumber are required\n", "text/plain")
+                return
+            self.server.login(session_id, phone)
+            self._reply(200, (STATIC_DIR / "login_successful.html").read_bytes(), "text/html; charset=utf-8")
+        elif url.path.startswith("/mcp/"):
+            self._rpc(body)
+        else:
+            self._reply(404, b"404 page not found\n", "text/plain")
+
+    def _rpc(self, body: bytes):
+        try:
+            request = json.loads(body)
+        except ValueError:
+            self._reply(400, b'{"jsonrpc":"2.0","id":null,"error":{"code":-32700,"message":"Parse error"}}')
+            return
+        if "id" not in request:
+            # Notifications, e.g. notifications/initialized.
+            self._reply(202)
+            return
+        session_id = self.headers.get("Mcp-Session-Id")
+        method, params = request.get("method"), request.get("params") or {}
+        headers = {}
+        if method == "initialize":
+            # Like mcp-go, initialize always starts a new session, whatever id the client sent.
+            session_id = f"mcp-session-{uuid.uuid4()}"
+            headers["Mcp-Session-Id"] = session_id
+            result = json.dumps({
+                "protocolVersion": params.get("protocolVersion", PROTOCOL_VERSION),
+                "capabilities": {"tools": {"listChanged": True}},
+                "serverInfo": SERVER_INFO,
+            }).encode()
+        elif method == "tools/list":
+            result = self.server.tools_list
+        elif method == "tools/call":
+            result = self.server.call_tool(session_id or "", params.get("name", ""))
+        elif method == "ping":
+            result = b"{}"
+        else:
+            error = {"code": -32601, "message": f"Method not found: {method}"}
+            self._reply(200, json.dumps({"jsonrpc": "2.0", "id": request["id"], "error": error}).encode())
+            return
+        request_id = json.dumps(request["id"]).encode()
+        self._reply(200, b'{"jsonrpc":"2.0","id":' + request_id + b',"result":' + result + b"}", headers=headers)
+
+    def _login_page(self, session_id: str) -> str:
+        page = (STATIC_DIR / "login.html").read_text()
+        numbers = ",".join(f'"{phone}"' for phone in self.server.store.phones)
+        page = re.sub(r"\{\{-? range .*?\{\{- end -\}\}", lambda _: numbers, page, flags=re.S)
+        return page.replace("{{.SessionId}}", html.escape(session_id))
+
+def main():
+    parser = argparse.ArgumentParser(description="In-memory stand-in for the fi-mcp-dev server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.getenv("FI_MCP_PORT", "8080")))
+    parser.add_argument("--data-dir", type=Path, default=TEST_DATA_DIR)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="none")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--auto-login", metavar="PHONE", help="log every new session in as this phone number")
+    args = parser.parse_args()
+
+    store = FixtureStore(args.data_dir)
+    server = LocalMCPServer(args.host, args.port, store, PROFILES[args.profile], args.seed, args.auto_login)
+    print(f"serving {len(store)} fixtures of {len(store.phones)} phone numbers on {server.url} (profile: {args.profile})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,512 @@
+"""
+Seeded synthetic fi-mcp-dev users at configurable sizes.
+
+Every payload has the schema of the fixtures in test_data_dir, and its
+vocabulary is learned from them: bank names, narrations with their types,
+modes and amounts, mutual fund schemes and NAVs, stocks and prices, credit
+accounts and EPF establishments. Numbers are then rescaled per user, and
+balances, holdings and net worth are kept consistent across the tools of a
+user. Output is streamed as JSON text chunks, so a user with a million bank
+transactions never has to be held in memory.
+
+The same seed, phone number and size always give the same bytes. Write a
+data directory that utils.local_mcp and the benchmarks' --data-dir serve:
+    python -m utils.synthetic_data /tmp/synthetic --users 1000 --size heavy
+"""
+import argparse
+import copy
+import json
+import math
+import random
+import re
+import statistics
+import string
+import time
+from dataclasses import dataclass, fields, replace
+from datetime import date, timedelta
+from pathlib import Path
+from utils.local_mcp import TEST_DATA_DIR
+
+# In the order they are generated: fetch_net_worth sums up the others.
+TOOLS = (
+    "fetch_bank_transactions",
+    "fetch_mf_transactions",
+    "fetch_stock_transactions",
+    "fetch_epf_details",
+    "fetch_credit_report",
+    "fetch_net_worth",
+)
+# Rows per streamed chunk.
+CHUNK_ROWS = 1000
+FIRST_PHONE = 7_000_000_000
+CREDIT_TYPES = {1, 4}
+# Opening and closing balance rows, left out of the generated statements.
+BALANCE_TYPES = {3, 7}
+SALARY_PATTERN = re.compile(r"SALARY", re.I)
+# Reference numbers in narrations, replaced with fresh digits.
+REFERENCE_PATTERN = re.compile(r"\d{5,}")
+
+@dataclass(frozen=True)
+class UserSize:
+    """
+    How much data one synthetic user has.
+    """
+    bank_txns: int = 60
+    banks: int = 1
+    mf_txns: int = 60
+    folios: int = 5
+    stock_txns: int = 24
+    stocks: int = 4
+    credit_accounts: int = 3
+    establishments: int = 2
+
+SIZES = {
+    "fixture": UserSize(),
+    "medium": UserSize(bank_txns=5_000, banks=2, mf_txns=2_000, folios=40, stock_txns=500, stocks=20, credit_accounts=8, establishments=4),
+    "heavy": UserSize(bank_txns=100_000, banks=3, mf_txns=50_000, folios=500, stock_txns=10_000, stocks=100, credit_accounts=20, establishments=8),
+}
+
+def _money(value: float) -> str:
+    return str(int(round(value)))
+
+def _inr(value: float) -> dict:
+    return {"currencyCode": "INR", "units": _money(value)}
+
+def _decimal(value: float) -> str:
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+def _share(total: int, parts: int, index: int) -> int:
+    return total // parts + (index < total % parts)
+
+def _json_array(rows):
+    """
+    Yield a JSON array of rows in chunks of CHUNK_ROWS rows.
+    """
+    batch, separator = [], "["
+    for row in rows:
+        batch.append(json.dumps(row))
+        if len(batch) == CHUNK_ROWS:
+            yield separator + ", ".join(batch)
+            batch, separator = [], ", "
+    if batch or separator == "[":
+        yield separator + ", ".join(batch)
+    yield "]"
+
+class FixtureShapes:
+    """
+    What the synthetic users are made of, read once from a test_data_dir.
+    """
+    def __init__(self, data_dir: Path = TEST_DATA_DIR):
+        """
+        Args:
+            data_dir (Path): Directory with one folder of <tool>.json files per phone number.
+        """
+        self.data_dir = Path(data_dir)
+        self.descriptions = {}
+        self.banks = set()
+        self.credits, self.debits, self.salaries = [], [], []
+        self.schemes, self.scheme_details = {}, {}
+        self.stocks = {}
+        self.credit_accounts, self.credit_reports = [], []
+        self.establishments = []
+        self.end_date = date.min
+        for path in sorted(self.data_dir.glob("*/*.json")):
+            try:
+                payload = json.loads(path.read_text())
+            except ValueError:
+                continue
+            if isinstance(payload, dict):
+                self._learn(payload)
+        if not (self.debits and self.salaries and self.schemes and self.stocks and self.credit_reports and self.establishments):
+            raise ValueError(f"{self.data_dir} lacks fixtures of some tool to learn from")
+        self.banks = sorted(self.banks)
+        self.isins = sorted(self.schemes)
+        self.stock_isins = sorted(self.stocks)
+
+    def _learn(self, payload: dict):
+        for key in payload:
+            if key != "schemaDescription" and "schemaDescription" in payload:
+                self.descriptions[key] = payload["schemaDescription"]
+        for bank in payload.get("bankTransactions", []):
+            self.banks.add(bank["bank"])
+            for amount, narration, day, txn_type, mode, *_ in bank.get("txns", []):
+                if txn_type in BALANCE_TYPES:
+                    continue
+                row = (narration, txn_type, mode, float(amount))
+                if SALARY_PATTERN.search(narration):
+                    self.salaries.append(row)
+                (self.credits if txn_type in CREDIT_TYPES else self.debits).append(row)
+                self.end_date = max(self.end_date, date.fromisoformat(day))
+        for scheme in payload.get("mfTransactions", []):
+            if scheme.get("txns"):
+                self.schemes.setdefault(scheme["isin"], (scheme["schemeName"], float(scheme["txns"][0][2])))
+        for scheme in payload.get("mfSchemeAnalytics", {}).get("schemeAnalytics", []):
+            detail = scheme.get("schemeDetail", {})
+            if detail.get("isinNumber"):
+                self.scheme_details.setdefault(detail["isinNumber"], detail)
+        for stock in payload.get("stockTransactions", []):
+            prices = [txn[3] for txn in stock.get("txns", []) if len(txn) > 3 and txn[3] > 1]
+            if prices:
+                self.stocks.setdefault(stock["isin"], statistics.median(prices))
+        for report in payload.get("creditReports", []):
+            data = report.get("creditReportData", {})
+            accounts = data.get("creditAccount", {}).get("creditAccountDetails", [])
+            self.credit_accounts += accounts
+            if accounts:
+                self.credit_reports.append(report)
+        for account in payload.get("uanAccounts", []):
+            self.establishments += account.get("rawDetails", {}).get("est_details", [])
+
+class SyntheticUser:
+    """
+    One user's payloads, generated on demand from a seed.
+
+    Each tool has its own random stream seeded by (seed, phone, tool), so a
+    payload does not depend on which others were generated before it. The
+    totals fetch_net_worth reports are collected while the other tools are
+    streamed; asking for it first generates them without keeping the text.
+    """
+    def __init__(self, phone: str, size: UserSize = SIZES["fixture"], shapes: FixtureShapes | None = None, seed: int = 0):
+        """
+        Args:
+            phone (str): The user's phone number, i.e. their test_data_dir folder.
+            size (UserSize): How much data to generate.
+            shapes (FixtureShapes): What to generate it from, defaults to the fi-mcp-dev fixtures.
+            seed (int): Seed of the whole synthetic data set.
+        """
+        self.phone = phone
+        self.size = size
+        self.shapes = shapes or default_shapes()
+        self.seed = seed
+        self.totals = {}
+        profile = self._rng("profile")
+        # Income scale of the user relative to the fixtures.
+        self.scale = math.exp(profile.gauss(0, 0.5))
+
+    def _rng(self, name: str) -> random.Random:
+        return random.Random(f"{self.seed}:{self.phone}:{name}")
+
+    def chunks(self, tool_name: str):
+        """
+        Yield the JSON text of a tool's payload in chunks.
+        Args:
+            tool_name (str): One of TOOLS.
+        """
+        if tool_name not in TOOLS:
+            raise KeyError(f"no synthetic data for {tool_name}")
+        if tool_name == "fetch_net_worth":
+            for missing in TOOLS[:-1]:
+                if missing not in self.totals:
+                    for _ in self.chunks(missing):
+                        pass
+        yield from getattr(self, f"_{tool_name[len('fetch_'):]}")(self._rng(tool_name))
+
+    def payload(self, tool_name: str) -> str:
+        return "".join(self.chunks(tool_name))
+
+    def write(self, out_dir: Path) -> int:
+        """
+        Write every tool's payload to out_dir/<phone>/<tool>.json.
+        Returns:
+            int: Bytes written.
+        """
+        folder = Path(out_dir) / self.phone
+        folder.mkdir(parents=True, exist_ok=True)
+        written = 0
+        for tool_name in TOOLS:
+            with open(folder / f"{tool_name}.json", "w", encoding="utf-8") as file:
+                for chunk in self.chunks(tool_name):
+                    written += file.write(chunk)
+        return written
+
+    def _dates(self, rng: random.Random, count: int, days: int):
+        """
+        `count` ascending dates over the `days` days up to the fixtures' last date.
+        """
+        start = self.shapes.end_date - timedelta(days=days)
+        step = days / max(count, 1)
+        for i in range(count):
+            yield start + timedelta(days=int(i * step + rng.random() * step))
+
+    def _narration(self, rng: random.Random, narration: str) -> str:
+        return REFERENCE_PATTERN.sub(lambda match: str(rng.randrange(10 ** len(match.group()))).zfill(len(match.group())), narration)
+
+    def _bank_transactions(self, rng: random.Random):
+        shapes, size = self.shapes, self.size
+        banks = rng.sample(shapes.banks, min(size.banks, len(shapes.banks)))
+        salary = rng.choice(shapes.salaries)
+        salary_amount = salary[3] * self.scale
+        balances = []
+
+        def txns(count: int, pay_salary: bool):
+            # About one transaction a day for small users, more a day for large ones, over at most 5 years.
+            balance, month = salary_amount * rng.uniform(0.5, 3), None
+            for day in self._dates(rng, count, min(5 * 365, max(60, count))):
+                if pay_salary and (day.year, day.month) != month:
+                    month = (day.year, day.month)
+                    narration, txn_type, mode, _ = salary
+                    amount = round(salary_amount * rng.uniform(0.98, 1.02))
+                elif rng.random() < 0.15:
+                    narration, txn_type, mode, amount = rng.choice(shapes.credits)
+                    amount = round(amount * self.scale * math.exp(rng.gauss(0, 0.4)), 2)
+                else:
+                    narration, txn_type, mode, amount = rng.choice(shapes.debits)
+                    amount = round(min(amount * self.scale * math.exp(rng.gauss(0, 0.4)), balance * 0.5), 2)
+                balance += amount if txn_type in CREDIT_TYPES else -amount
+                yield [_decimal(amount), self._narration(rng, narration), day.isoformat(), txn_type, mode, _decimal(balance)]
+            balances.append(balance)
+
+        yield json.dumps({"schemaDescription": shapes.descriptions.get("bankTransactions", "")})[:-1] + ', "bankTransactions": ['
+        for index, bank in enumerate(banks):
+            yield ("," if index else "") + json.dumps({"bank": bank})[:-1] + ', "txns": '
+            yield from _json_array(txns(_share(size.bank_txns, len(banks), index), index == 0))
+            yield "}"
+        yield "]}"
+        self.totals["fetch_bank_transactions"] = {"banks": banks, "balances": balances}
+
+    def _mf_transactions(self, rng: random.Random):
+        shapes, size = self.shapes, self.size
+        holdings = []
+
+        def txns(holding: dict, count: int, nav: float):
+            sip = int(round(rng.choice((1000, 2000, 2500, 5000, 10000)) * self.scale, -2)) or 500
+            # Monthly SIPs, closer together when there are more orders than 20 years of months.
+            days = min(20 * 365, count * 30)
+            months = days / 30 / max(count, 1)
+            nav *= math.exp(-0.01 * days / 30)
+            units = invested = redeemed = 0.0
+            for day in self._dates(rng, count, days):
+                nav *= math.exp(rng.gauss(0.01 * months, 0.04 * math.sqrt(months)))
+                if units and rng.random() < 0.05:
+                    sold = round(units * rng.uniform(0.05, 0.3), 3)
+                    amount = round(sold * nav)
+                    units -= sold
+                    redeemed += amount
+                    yield [2, day.isoformat(), round(nav, 4), sold, amount]
+                else:
+                    amount = sip if rng.random() < 0.9 else int(round(sip * rng.uniform(5, 40), -3))
+                    bought = round(amount / nav, 3)
+                    units += bought
+                    invested += amount
+                    yield [1, day.isoformat(), round(nav, 4), bought, amount]
+            holding.update(units=units, nav=nav, invested=invested, redeemed=redeemed, days=days)
+
+        yield '{"mfTransactions": ['
+        for index in range(size.folios):
+            pool_isin = shapes.isins[index % len(shapes.isins)]
+            name, nav = shapes.schemes[pool_isin]
+            isin = pool_isin if index < len(shapes.isins) else "INF" + "".join(rng.choices(string.digits + string.ascii_uppercase, k=9))
+            holding = {"isin": isin, "pool_isin": pool_isin, "name": name, "folio": f"{rng.randrange(10 ** 7, 10 ** 8)}/{index + 1}"}
+            yield ("," if index else "") + json.dumps({"isin": isin, "schemeName": name, "folioId": holding["folio"]})[:-1] + ', "txns": '
+            yield from _json_array(txns(holding, _share(size.mf_txns, size.folios, index), nav))
+            yield "}"
+            holdings.append(holding)
+        yield "], " + json.dumps({"schemaDescription": shapes.descriptions.get("mfTransactions", "")})[1:]
+        self.totals["fetch_mf_transactions"] = holdings
+
+    def _stock_transactions(self, rng: random.Random):
+        shapes, size = self.shapes, self.size
+        isins = rng.sample(shapes.stock_isins, min(size.stocks, len(shapes.stock_isins)))
+        isins += ["INE" + "".join(rng.choices(string.digits + string.ascii_uppercase, k=9)) for _ in range(size.stocks - len(isins))]
+        holdings = []
+
+        def txns(holding: dict, count: int, price: float):
+            quantity = 0
+            for day in self._dates(rng, count, min(10 * 365, max(180, count * 7))):
+                price *= math.exp(rng.gauss(0.0005, 0.02))
+                roll = rng.random()
+                if quantity and roll < 0.02:
+                    # Bonus and split rows carry no price.
+                    added = max(1, quantity // rng.choice((1, 2, 4)))
+                    quantity += added
+                    yield [rng.choice((3, 4)), day.isoformat(), added]
+                elif quantity and roll < 0.2:
+                    sold = max(1, quantity // rng.randrange(2, 6))
+                    quantity -= sold
+                    yield [2, day.isoformat(), sold, round(price, 2)]
+                else:
+                    bought = max(1, round(rng.uniform(1, 10) * self.scale * 5000 / price))
+                    quantity += bought
+                    yield [1, day.isoformat(), bought, round(price, 2)]
+            holding.update(units=quantity, price=price)
+
+        yield json.dumps({"schemaDescription": shapes.descriptions.get("stockTransactions", "")})[:-1] + ', "stockTransactions": ['
+        for index, isin in enumerate(isins):
+            price = shapes.stocks.get(isin) or shapes.stocks[rng.choice(shapes.stock_isins)]
+            holding = {"isin": isin}
+            yield ("," if index else "") + json.dumps({"isin": isin})[:-1] + ', "txns": '
+            yield from _json_array(txns(holding, _share(size.stock_txns, len(isins), index), price))
+            yield "}"
+            holdings.append(holding)
+        yield "]}"
+        self.totals["fetch_stock_transactions"] = holdings
+
+    def _epf_details(self, rng: random.Random):
+        establishments = []
+        employee = employer = pension = 0
+        for template in rng.sample(self.shapes.establishments, min(self.size.establishments, len(self.shapes.establishments))) + [
+            rng.choice(self.shapes.establishments) for _ in range(self.size.establishments - len(self.shapes.establishments))
+        ]:
+            share = float(template.get("pf_balance", {}).get("employee_share", {}).get("balance") or 100000) * self.scale * math.exp(rng.gauss(0, 0.3))
+            establishment = copy.deepcopy(template)
+            establishment["pf_balance"] = {
+                "net_balance": _money(2 * share),
+                "employee_share": {"credit": _money(share), "balance": _money(share)},
+                "employer_share": {"credit": _money(share), "balance": _money(share)},
+            }
+            establishments.append(establishment)
+            employee += share
+            employer += share
+            pension += share * 0.3
+        overall = {
+            "pension_balance": _money(pension),
+            "current_pf_balance": _money(employee + employer),
+            "employee_share_total": {"credit": _money(employee), "balance": _money(employee)},
+            "employer_share_total": {"credit": _money(employer), "balance": _money(employer)},
+        }
+        yield json.dumps({"uanAccounts": [{"phoneNumber": {}, "rawDetails": {"est_details": establishments, "overall_pf_balance": overall}}]})
+        self.totals["fetch_epf_details"] = employee + employer
+
+    def _credit_report(self, rng: random.Random):
+        report = copy.deepcopy(rng.choice(self.shapes.credit_reports))
+        data = report["creditReportData"]
+        accounts = []
+        for _ in range(self.size.credit_accounts):
+            account = dict(rng.choice(self.shapes.credit_accounts))
+            factor = self.scale * math.exp(rng.gauss(0, 0.3))
+            for key in ("creditLimitAmount", "highestCreditOrOriginalLoanAmount", "currentBalance", "amountPastDue"):
+                if account.get(key):
+                    account[key] = _money(float(account[key]) * factor)
+            accounts.append(account)
+        cards = sum(float(a.get("currentBalance") or 0) for a in accounts if a.get("portfolioType") == "R")
+        loans = sum(float(a.get("currentBalance") or 0) for a in accounts if a.get("portfolioType") != "R")
+        closed = sum(a.get("accountStatus") == "13" for a in accounts)
+        data.setdefault("creditAccount", {})["creditAccountDetails"] = accounts
+        data["creditAccount"]["creditAccountSummary"] = {
+            "account": {
+                "creditAccountTotal": str(len(accounts)),
+                "creditAccountActive": str(len(accounts) - closed),
+                "creditAccountDefault": "0",
+                "creditAccountClosed": str(closed),
+                "cadSuitFiledCurrentBalance": "0",
+            },
+            "totalOutstandingBalance": {
+                "outstandingBalanceSecured": _money(loans),
+                "outstandingBalanceSecuredPercentage": _money(100 * loans / (cards + loans)) if cards + loans else "0",
+                "outstandingBalanceUnSecured": _money(cards),
+                "outstandingBalanceUnSecuredPercentage": _money(100 * cards / (cards + loans)) if cards + loans else "0",
+                "outstandingBalanceAll": _money(cards + loans),
+            },
+        }
+        data.setdefault("score", {})["bureauScore"] = str(rng.randrange(600, 880))
+        yield json.dumps({"creditReports": [report]})
+        self.totals["fetch_credit_report"] = {"cards": cards, "loans": loans}
+
+    def _net_worth(self, rng: random.Random):
+        shapes, totals = self.shapes, self.totals
+        funds = totals["fetch_mf_transactions"]
+        stocks = totals["fetch_stock_transactions"]
+        bank = totals["fetch_bank_transactions"]
+        credit = totals["fetch_credit_report"]
+        mf_value = sum(fund["units"] * fund["nav"] for fund in funds)
+        stock_value = sum(stock["units"] * stock["price"] for stock in stocks)
+        savings = sum(max(balance, 0) for balance in bank["balances"])
+        assets = [
+            ("ASSET_TYPE_MUTUAL_FUND", mf_value),
+            ("ASSET_TYPE_EPF", totals["fetch_epf_details"]),
+            ("ASSET_TYPE_INDIAN_SECURITIES", stock_value),
+            ("ASSET_TYPE_SAVINGS_ACCOUNTS", savings),
+            ("LIABILITY_TYPE_CREDIT_CARD", -credit["cards"]),
+            ("LIABILITY_TYPE_LOAN", -credit["loans"]),
+        ]
+        analytics = []
+        for fund in funds:
+            detail = dict(shapes.scheme_details.get(fund["pool_isin"]) or next(iter(shapes.scheme_details.values())))
+            detail.update({"nameData": {"longName": fund["name"]}, "nav": _inr(fund["nav"]), "isinNumber": fund["isin"]})
+            current = fund["units"] * fund["nav"]
+            cost = fund["invested"] - fund["redeemed"]
+            years = max(fund["days"] / 365, 0.1)
+            xirr = ((current / cost) ** (1 / years) - 1) * 100 if cost > 0 and current > 0 else 0.0
+            analytics.append({"schemeDetail": detail, "enrichedAnalytics": {"analytics": {"schemeDetails": {
+                "currentValue": _inr(current),
+                "investedValue": _inr(cost),
+                "XIRR": round(xirr, 2),
+                "unrealisedReturns": _inr(current - cost),
+                "units": round(fund["units"], 3),
+            }}}})
+        accounts = {"uuid-mf-1": {
+            "accountDetails": {"fipId": "fip@cams", "maskedAccountNumber": "XXXXXX-00001", "accInstrumentType": "ACC_INSTRUMENT_TYPE_MUTUAL_FUNDS"},
+            "mutualFundSummary": {"currentValue": _inr(mf_value), "holdingsInfo": [{"isin": fund["isin"], "folioNumber": fund["folio"]} for fund in funds]},
+        }, "uuid-epf-1": {
+            "accountDetails": {"fipId": "fip@epfo", "maskedAccountNumber": "XXXXX-XXXX-XXXX", "accInstrumentType": "ACC_INSTRUMENT_TYPE_EPF"},
+            "epfSummary": {"currentBalance": _inr(totals["fetch_epf_details"])},
+        }, "uuid-stocks-ind-1": {
+            "accountDetails": {"fipId": "fip@nsdl", "maskedAccountNumber": "XXXXXX1001", "accInstrumentType": "ACC_INSTRUMENT_TYPE_EQUITIES"},
+            "equitySummary": {"currentValue": _inr(stock_value), "holdingsInfo": [
+                {"isin": stock["isin"], "units": stock["units"], "lastTradedPrice": {"units": _money(stock["price"])}} for stock in stocks
+            ]},
+        }}
+        for index, (name, balance) in enumerate(zip(bank["banks"], bank["balances"]), 1):
+            accounts[f"uuid-savings-{index}"] = {
+                "accountDetails": {"fipId": f"{name.split()[0].upper()}-FIP", "maskedAccountNumber": f"XXXXXX{rng.randrange(10 ** 4):04d}",
+                                   "accInstrumentType": "ACC_INSTRUMENT_TYPE_DEPOSIT"},
+                "depositSummary": {"currentBalance": _inr(balance), "depositAccountType": "DEPOSIT_ACCOUNT_TYPE_SAVINGS"},
+            }
+        yield json.dumps({
+            "netWorthResponse": {
+                "assetValues": [{"netWorthAttribute": name, "value": _inr(value)} for name, value in assets if value],
+                "totalNetWorthValue": _inr(sum(value for _, value in assets)),
+            },
+            "mfSchemeAnalytics": {"schemeAnalytics": analytics},
+            "accountDetailsBulkResponse": {"accountDetailsMap": accounts},
+        })
+
+_shapes = None
+
+def default_shapes() -> FixtureShapes:
+    """
+    FixtureShapes of the fi-mcp-dev test_data_dir, read on first use.
+    """
+    global _shapes
+    if _shapes is None:
+        _shapes = FixtureShapes()
+    return _shapes
+
+def phone_numbers(count: int, first: int = FIRST_PHONE) -> list:
+    return [str(first + i) for i in range(count)]
+
+def users(count: int, size: UserSize = SIZES["fixture"], seed: int = 0, shapes: FixtureShapes | None = None):
+    """
+    Yield `count` SyntheticUsers with consecutive phone numbers.
+    """
+    shapes = shapes or default_shapes()
+    for phone in phone_numbers(count):
+        yield SyntheticUser(phone, size, shapes, seed)
+
+def write_users(out_dir: Path, count: int, size: UserSize = SIZES["fixture"], seed: int = 0) -> int:
+    """
+    Write `count` synthetic users as a test_data_dir under out_dir, one user at a time.
+    Returns:
+        int: Bytes written.
+    """
+    return sum(user.write(out_dir) for user in users(count, size, seed))
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a test_data_dir of seeded synthetic fi-mcp-dev users.")
+    parser.add_argument("out_dir", type=Path)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--size", choices=sorted(SIZES), default="fixture")
+    parser.add_argument("--seed", type=int, default=0)
+    for size_field in fields(UserSize):
+        parser.add_argument(f"--{size_field.name.replace('_', '-')}", type=int, help=f"override {size_field.name} of --size")
+    args = parser.parse_args()
+
+    overrides = {f.name: getattr(args, f.name) for f in fields(UserSize) if getattr(args, f.name) is not None}
+    size = replace(SIZES[args.size], **overrides)
+    start = time.perf_counter()
+    written = write_users(args.out_dir, args.users, size, args.seed)
+    elapsed = time.perf_counter() - start
+    print(f"wrote {args.users} users ({written / 1e6:.1f} MB) to {args.out_dir} in {elapsed:.1f}s, {size}")
+
+if __name__ == "__main__":
+    main()